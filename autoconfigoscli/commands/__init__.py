@@ -0,0 +1,39 @@
+"""
+Subcommand handlers, one module per command, each exposing run(args, console).
+Modules are imported only when their command runs, so `--version` or `history`
+never pay for the installer, the providers or the catalog.
+"""
+import importlib
+
+# Command name -> handler module in this package
+COMMANDS = {
+    "audit": "audit",
+    "whoami": "whoami",
+    "machine": "machine",
+    "history": "history",
+    "explain": "explain",
+    "recommend": "recommend",
+    "ai": "ai",
+    "remote": "remote",
+    "profiles": "profiles",
+    "install": "install",
+    "bundle": "bundle",
+    "catalog": "catalog",
+    "state": "state",
+    "status": "status",
+    "manual": "manual",
+    "doctor": "doctor",
+    "update": "update",
+    "downgrade": "downgrade",
+    "export": "export_state",
+    "import": "import_state",
+    "serve": "serve",
+}
+
+def run_command(name: str, args, console) -> bool:
+    """Imports the handler for `name` and runs it. Returns False for unknown commands."""
+    module = COMMANDS.get(name)
+    if not module:
+        return False
+    importlib.import_module(f"{__name__}.{module}").run(args, console)
+    return True
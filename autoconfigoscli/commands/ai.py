@@ -0,0 +1,92 @@
+from ..core.context.explain import Explainer
+from ..ai.manager import AIManager
+from ..core.recommendations.engine import RecommendationEngine
+from rich.panel import Panel
+from rich.markdown import Markdown
+from rich.prompt import Confirm
+
+def run(args, console):
+    manager = AIManager()
+
+    if args.ai_command == "config":
+         if args.ai_config_action == "provider":
+             if args.action == "set":
+                 if manager.set_provider(args.name):
+                     console.print(f"[green]AI Provider set to: {args.name}[/green]")
+                 else:
+                     console.print(f"[red]Failed to set provider {args.name}[/red]")
+             elif args.action == "show":
+                 console.print(f"Current AI Provider: [bold]{manager.get_active_provider_name()}[/bold]")
+
+    elif args.ai_command == "setup":
+         console.print(Panel("[bold]AutoConfigOS Hybrid Setup[/bold]", style="cyan"))
+
+         # 1. Local Analysis
+         with console.status("Running Local Analysis..."):
+             explainer = Explainer()
+             ctx = explainer.explain_system()
+             engine = RecommendationEngine()
+             recs = engine.recommend_profiles(ctx['audit'], ctx['identity'], ctx['machine'])
+
+         top_rec = recs[0] if recs else None
+
+         # Check for clear winner
+         clear_winner = False
+         if top_rec:
+             score_gap = 0
+             if len(recs) > 1:
+                 score_gap = top_rec['score'] - recs[1]['score']
+             else:
+                 score_gap = 100 # ample gap if only one
+
+             if top_rec['score'] >= 60 and score_gap >= 15:
+                 clear_winner = True
+
+         if clear_winner:
+             console.print(f"[green]Local Recommendation Engine found a clear match:[/green] [bold]{top_rec['profile']}[/bold]")
+             if top_rec['reasons']:
+                 console.print("Reaons:")
+                 for r in top_rec['reasons']:
+                     console.print(f" - {r}")
+
+             if not Confirm.ask("Do you want to double-check this with AI?", default=False):
+                 console.print(f"\n[bold]Selected:[/bold] {top_rec['profile']}")
+                 console.print(f"Run [cyan]autoconfigoscli install {top_rec['profile']}[/cyan] to proceed.")
+                 return
+
+         # 2. AI Fallback
+         console.print("\n[yellow]Engaging AI for disambiguation/verification...[/yellow]")
+         if manager.get_active_provider_name() == "none":
+             console.print("[red]No AI Provider configured. Please set GEMINI_API_KEY or OPENAI_API_KEY.[/red]")
+             console.print("Recommended action based on local engine:")
+             if top_rec:
+                  console.print(f" -> {top_rec['profile']} (Score: {top_rec['score']})")
+             return
+
+         with console.status(f"Consulting {manager.get_active_provider_name()}..."):
+             # Inject available profiles into context for AI to choose from
+             ctx['profiles'] = [r['profile'] for r in recs[:5]] # Send top 5 candidates
+             response = manager.recommend(ctx)
+
+         if "error" in response:
+             console.print(f"[red]AI Error: {response['error']}[/red]")
+         else:
+             console.print(Panel(
+                 f"[bold]AI Recommendation:[/bold] {response.get('recommended_profile')}\n\n"
+                 f"[white]{response.get('reasoning')}[/white]\n\n"
+                 f"[yellow]Risks:[/yellow] {', '.join(response.get('risks', []))}",
+                 title="Hybrid Analysis Result",
+                 border_style="green"
+             ))
+             if response.get('alternatives'):
+                 console.print(f"Alternatives: {', '.join(response.get('alternatives'))}")
+
+    elif args.ai_command == "ask":
+         explainer = Explainer()
+         ctx = explainer.explain_system()
+         request_query = args.query
+
+         with console.status("Thinking..."):
+             answer = manager.explain(ctx, request_query)
+
+         console.print(Panel(Markdown(answer), title=f"AI Answer ({manager.get_active_provider_name()})"))
@@ -0,0 +1,27 @@
+import json
+from rich.table import Table
+from ..core.audit import SystemAuditor
+
+def run(args, console):
+    auditor = SystemAuditor()
+    data = auditor.run_audit()
+
+    if args.json:
+        console.print_json(json.dumps(data))
+    else:
+        table = Table(title="System Audit Report")
+        table.add_column("Property", style="cyan")
+        table.add_column("Value", style="green")
+
+        table.add_row("OS System", data["os_system"])
+        table.add_row("Distro", f"{data['distro_id']} {data['os_release']}")
+        table.add_row("CPU", data["cpu_info"])
+        table.add_row("RAM", f"{data['ram_total_gb']} GB")
+        table.add_row("Disk Free", f"{data['disk_free_gb']} GB")
+        table.add_row("Shell", data["shell"])
+        table.add_row("Tools Detected", f"{len(data['detected_tools'])} found")
+
+        console.print(table)
+
+        if data['detected_tools']:
+            console.print(f"[dim]Tools: {', '.join(data['detected_tools'])}[/dim]")
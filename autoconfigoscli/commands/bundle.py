@@ -0,0 +1,5 @@
+from ..core.bundle import BundleManager
+
+def run(args, console):
+    if args.bundle_command == "create":
+        BundleManager().create(args.profile, args.output)
@@ -0,0 +1,10 @@
+from ..core.catalog.loader import CatalogLoader
+
+def run(args, console):
+    if args.catalog_command == "compile":
+        loader = CatalogLoader()
+        path = loader.compile()
+        if path:
+            console.print(f"[green]Compiled {len(loader.packages)} packages to {path}[/green]")
+        else:
+            console.print("[red]Could not write the compiled catalog.[/red]")
@@ -0,0 +1,5 @@
+from ..core.doctor import Doctor
+
+def run(args, console):
+    doc = Doctor()
+    doc.run_full_checks()
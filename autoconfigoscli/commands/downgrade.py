@@ -0,0 +1,4 @@
+from ..core.downgrader import Downgrader
+
+def run(args, console):
+    Downgrader().downgrade(args.backup)
@@ -0,0 +1,182 @@
+import json
+from ..core.context.explain import Explainer
+from rich.panel import Panel
+from rich.table import Table
+
+def run(args, console):
+    ex = Explainer()
+
+    target = args.explain_target
+    if target is None:
+        target = "system" # Default
+
+    if target == "system":
+        data = ex.explain_system()
+        console.print("[bold underline]System Context[/bold underline]")
+
+        # Audit
+        audit = data['audit']
+        console.print(f"\n[cyan]Audit[/cyan]: {audit['os_system']} {audit['distro_id']} ({audit['cpu_info']})")
+        console.print(f"RAM: {audit['ram_total_gb']}GB | Disk Free: {audit['disk_free_gb']}GB")
+
+        # Identity
+        ident = data['identity']
+        console.print(f"\n[blue]Identity[/blue]: {ident['role']} ({ident['level']})")
+
+        # Machine
+        mach = data['machine']
+        console.print(f"\n[magenta]Machine[/magenta]: {mach['type']} ({mach['power']} power)")
+
+    elif target == "profile":
+        names = ex.profile_loader.list_profiles() if args.all else args.names
+        if not names:
+            console.print("[red]Error: Give one or more profile names, or --all.[/red]")
+            return
+
+        if args.distro:
+            matrix = ex.compatibility_matrix(names, _distros(ex, args.distro))
+            if args.json:
+                console.print_json(json.dumps(matrix))
+            else:
+                _print_matrix(console, matrix)
+            return
+
+        analyses = ex.explain_profiles(names)
+        if args.json:
+            console.print_json(json.dumps(analyses))
+        elif len(analyses) == 1:
+            _print_profile(console, analyses[0])
+        else:
+            _print_profile_summaries(console, analyses)
+
+    elif target == "package":
+        ids = None if args.all else args.ids
+        if not ids and not args.all:
+            console.print("[red]Error: Give one or more package IDs, or --all.[/red]")
+            return
+
+        if args.distro:
+            distros = _distros(ex, args.distro)
+            by_distro = {distro: ex.explain_packages(ids, distro) for distro in distros}
+            if args.json:
+                console.print_json(json.dumps(by_distro))
+            else:
+                _print_package_matrix(console, distros, by_distro)
+            return
+
+        packages = ex.explain_packages(ids)
+        if args.json:
+            console.print_json(json.dumps(packages))
+        elif len(packages) == 1 and not args.all:
+            _print_package(console, packages[0])
+        else:
+            table = Table(title="Packages")
+            table.add_column("Package")
+            table.add_column("Support")
+            table.add_column("Risk")
+            table.add_column("Provider")
+            for pkg in packages:
+                table.add_row(pkg['id'], _support(pkg), _risk(pkg), _provider(pkg))
+            console.print(table)
+
+def _distros(ex, requested):
+    """--distro values, with 'all' expanded to every distro the catalog targets."""
+    if "all" in requested:
+        return ex.resolver.known_distros()
+    return [d.lower() for d in requested]
+
+def _support(pkg):
+    if not pkg['found']:
+        return "[red]Unknown[/red]"
+    return "[green]Yes[/green]" if pkg['supported'] else "[red]No[/red]"
+
+def _risk(pkg):
+    risk = pkg['risk_level'] or "-"
+    return f"[red]{risk}[/red]" if risk == 'high' else risk
+
+def _provider(pkg):
+    if not pkg['provider']:
+        return "-"
+    return f"{pkg['provider']}:{pkg['package_name']}"
+
+def _print_package(console, data):
+    if not data['found']:
+        console.print(f"[red]Package {data['id']} not found in catalog[/red]")
+        return
+    console.print(Panel(
+        f"ID: {data['id']}\n"
+        f"Name: {data['display_name']}\n"
+        f"Supported: {'Yes' if data['supported'] else 'No'}\n"
+        f"Risk: {data['risk_level']}\n"
+        f"Provider: {data['provider']}\n"
+        f"Check: {data['check'] or '-'}",
+        title="Package Detail"
+    ))
+
+def _print_profile(console, data):
+    if "error" in data:
+        console.print(f"[red]{data['error']}[/red]")
+        return
+    s = data['summary']
+    console.print(Panel(
+        f"Profile: {data['profile']['name']} ({data['profile']['tier']})\n"
+        f"Total Packages: {s['total']}\n"
+        f"Supported: [green]{s['supported']}[/green] | Unsupported: [red]{s['unsupported']}[/red]\n"
+        f"Risky Items: [yellow]{s['risky']}[/yellow]",
+        title="Profile Analysis"
+    ))
+
+    table = Table()
+    table.add_column("Package")
+    table.add_column("Support")
+    table.add_column("Risk")
+    table.add_column("Provider")
+
+    for pkg in data['packages_analysis']:
+         table.add_row(pkg['id'], _support(pkg), _risk(pkg), pkg['provider'] or "-")
+    console.print(table)
+
+def _print_profile_summaries(console, analyses):
+    table = Table(title="Profile Analysis")
+    table.add_column("Profile", style="cyan")
+    table.add_column("Tier", style="magenta")
+    table.add_column("Total", justify="right")
+    table.add_column("Supported", justify="right", style="green")
+    table.add_column("Unsupported", justify="right", style="red")
+    table.add_column("Risky", justify="right", style="yellow")
+    for data in analyses:
+        if "error" in data:
+            table.add_row(data['profile']['name'], "[red]not found[/red]", "", "", "", "")
+            continue
+        s = data['summary']
+        table.add_row(data['profile']['name'], data['profile']['tier'], str(s['total']),
+                      str(s['supported']), str(s['unsupported']), str(s['risky']))
+    console.print(table)
+
+def _print_matrix(console, matrix):
+    distros = list(next(iter(matrix.values()), {}))
+    table = Table(title="Compatibility Matrix (supported/total)")
+    table.add_column("Profile", style="cyan")
+    for distro in distros:
+        table.add_column(distro, justify="right")
+    for name, row in matrix.items():
+        cells = []
+        for distro in distros:
+            s = row[distro]
+            if s is None:
+                cells.append("[red]not found[/red]")
+            else:
+                color = "green" if s['unsupported'] == 0 else "yellow"
+                cells.append(f"[{color}]{s['supported']}/{s['total']}[/{color}]")
+        table.add_row(name, *cells)
+    console.print(table)
+
+def _print_package_matrix(console, distros, by_distro):
+    table = Table(title="Package Support by Distro")
+    table.add_column("Package")
+    for distro in distros:
+        table.add_column(distro)
+    rows = zip(*(by_distro[distro] for distro in distros))
+    for per_distro in rows:
+        table.add_row(per_distro[0]['id'], *(_provider(pkg) if pkg['supported'] else "[red]-[/red]" for pkg in per_distro))
+    console.print(table)
@@ -0,0 +1,7 @@
+from ..core.exporter import Exporter
+
+def run(args, console):
+    export_id = Exporter().export_data(args.output, since=args.since)
+    if export_id:
+        console.print(f"[green]State exported to {args.output}[/green]")
+        console.print(f"[dim]Export ID: {export_id} (next delta: export --since {export_id})[/dim]")
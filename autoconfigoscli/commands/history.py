@@ -0,0 +1,43 @@
+import json
+from rich.panel import Panel
+from rich.table import Table
+from ..core.context.history import HistoryManager
+
+def run(args, console):
+    hm = HistoryManager()
+
+    if args.action == "show" and args.id:
+        entry = hm.get_details(args.id)
+        if not entry:
+            console.print(f"[red]Entry {args.id} not found[/red]")
+        else:
+            console.print(Panel(
+                f"Action: {entry['action_type']}\nResult: {entry['result']}\nTimestamp: {entry['timestamp']}\n\nDetails:\n{json.dumps(entry.get('details',{}), indent=2)}", 
+                title=f"History #{entry['id']}"
+            ))
+    else:
+        entries = hm.iter_entries(
+            action_type=args.action_type, target=args.target, result=args.result,
+            since=args.since, before=args.before, limit=args.limit
+        )
+        table = Table(title="Decision History")
+        table.add_column("ID", justify="right")
+        table.add_column("Time")
+        table.add_column("Action")
+        table.add_column("Target")
+        table.add_column("Result")
+
+        shown, last_id = 0, None
+        for r in entries:
+            result_color = "green" if r['result'] == "success" else "red"
+            table.add_row(
+                str(r['id']), 
+                str(r['timestamp']), 
+                r['action_type'], 
+                r['target'], 
+                f"[{result_color}]{r['result']}[/{result_color}]"
+            )
+            shown, last_id = shown + 1, r['id']
+        console.print(table)
+        if shown == args.limit:
+            console.print(f"[dim]More entries: repeat with --before {last_id}[/dim]")
@@ -0,0 +1,4 @@
+from ..core.importer import Importer
+
+def run(args, console):
+    Importer().import_data(args.file)
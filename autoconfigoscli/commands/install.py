@@ -0,0 +1,15 @@
+from ..core.installer import Installer
+
+def run(args, console):
+    installer = Installer(max_workers=args.jobs)
+    if args.from_bundle:
+        installer.install_from_bundle(args.from_bundle, dry_run=args.dry_run, auto_yes=args.yes)
+    elif args.resume:
+        installer.resume_run(args.resume, auto_yes=args.yes, prefetch=not args.no_prefetch)
+    elif args.profile:
+        installer.install_profile(
+            args.profile, dry_run=args.dry_run, auto_yes=args.yes,
+            prefetch=not args.no_prefetch, prefetch_only=args.prefetch_only
+        )
+    else:
+        args.subparser.error("a profile name, --resume RUN_ID or --from-bundle PATH is required")
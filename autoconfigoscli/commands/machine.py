@@ -0,0 +1,37 @@
+from rich.prompt import Prompt, Confirm
+from rich.panel import Panel
+from ..core.context.machine import MachineManager
+
+def run(args, console):
+    mm = MachineManager()
+    
+    if args.action == "edit":
+        curr = mm.get_profile()
+        new_type = Prompt.ask("Type", choices=["laptop", "desktop", "server"], default=curr["type"])
+        new_usage = Prompt.ask("Usage", choices=["personal", "work", "lab"], default=curr["usage"])
+        new_power = Prompt.ask("Power", choices=["low", "mid", "high"], default=curr["power"])
+        new_gui = Confirm.ask("Has GUI?", default=curr["gui"])
+        new_notes = Prompt.ask("Notes", default=curr["notes"])
+        
+        if Confirm.ask("Save Machine Profile?"):
+            mm.update_profile({
+                "type": new_type, "usage": new_usage, "power": new_power,
+                "gui": new_gui, "notes": new_notes
+            })
+            console.print("[green]Saved.[/green]")
+    
+    elif args.action == "reset":
+        if Confirm.ask("Reset to detected defaults?"):
+            mm.reset_profile()
+            console.print("[yellow]Reset to defaults.[/yellow]")
+    
+    else:
+        p = mm.get_profile()
+        content = f"""
+[bold]Type:[/bold] {p['type']}
+[bold]Usage:[/bold] {p['usage']}
+[bold]Power:[/bold] {p['power']}
+[bold]GUI:[/bold] {"Yes" if p['gui'] else "No"}
+[bold]Notes:[/bold] {p['notes']}
+"""
+        console.print(Panel(content.strip(), title="Machine Profile", border_style="magenta"))
@@ -0,0 +1,5 @@
+from ..core.manual import ManualMode
+
+def run(args, console):
+    manual = ManualMode()
+    manual.run()
@@ -0,0 +1,144 @@
+import json
+import time
+from rich.prompt import Prompt, Confirm
+from rich.table import Table
+from ..core.profiles.loader import ProfileLoader
+from ..core.profiles.user_manager import UserProfileManager
+
+def run(args, console):
+    loader = ProfileLoader()
+
+    if args.subcommand == "list":
+        profiles = []
+        for name in loader.list_profiles():
+            p = loader.load_profile(name)
+            if p:
+                if args.tier and p.tier != args.tier:
+                    continue
+                profiles.append(p)
+
+        table = Table(title="Available Profiles")
+        table.add_column("Name", style="cyan")
+        table.add_column("Tier", style="magenta")
+        table.add_column("Tags", style="green")
+        table.add_column("Description")
+
+        for p in profiles:
+            table.add_row(p.name, p.tier, ", ".join(p.tags), p.description)
+        console.print(table)
+
+    elif args.subcommand == "show":
+        p = loader.load_profile(args.name)
+        if not p:
+            console.print(f"[red]Profile {args.name} not found[/red]")
+        else:
+            console.print(f"[bold cyan]Profile: {p.name}[/bold cyan]")
+            console.print(f"Tier: {p.tier}")
+            console.print(f"Description: {p.description}")
+            console.print(f"Packages: {', '.join(p.packages)}")
+
+    elif args.subcommand == "user":
+        manager = UserProfileManager()
+
+        if args.user_command == "list":
+            profiles = []
+            for name in loader.list_profiles():
+                if manager.is_user_profile(name):
+                     p = loader.load_profile(name)
+                     if p: profiles.append(p)
+
+            if not profiles:
+                console.print("No user profiles found.")
+            else:
+                table = Table(title="User Profiles")
+                table.add_column("Name", style="cyan")
+                table.add_column("Tier")
+                table.add_column("Packages")
+                table.add_column("Description")
+                for p in profiles:
+                    table.add_row(p.name, p.tier, str(p.package_count), p.description)
+                console.print(table)
+
+        elif args.user_command == "create":
+            name = args.name
+            if manager.is_builtin(name):
+                 console.print(f"[red]Cannot create '{name}': Conflicts with built-in profile[/red]")
+                 return
+
+            desc = Prompt.ask("Description")
+            tier = Prompt.ask("Tier", choices=["lite", "mid", "full"], default="mid")
+
+            # Only `user create` needs the catalog; list/show stay light
+            from ..core.manual import ManualMode
+
+            console.print("[green]Select packages using FZF (TAB to multi-select, ENTER to confirm)[/green]")
+            manual = ManualMode()
+            if not manual._check_fzf():
+                console.print("[red]FZF required for interactive selection.[/red]")
+                return
+
+            candidates = manual._get_candidates()
+            selected_ids = manual._fzf_select(candidates)
+
+            if not selected_ids:
+                if not Confirm.ask("No packages selected. Create empty profile?"):
+                    return
+
+            data = {
+                "description": desc,
+                "tier": tier,
+                "tags": ["user"],
+                "packages": selected_ids
+            }
+
+            if manager.create(name, data):
+                 console.print(f"[bold green]Profile '{name}' created successfully![/bold green]")
+
+        elif args.user_command == "delete":
+            if args.yes or Confirm.ask(f"Delete profile '{args.name}'?"):
+                if manager.delete(args.name):
+                    console.print(f"[green]Deleted {args.name}[/green]")
+
+        elif args.user_command == "export":
+            # Use manager to load raw then dump to json
+            data = manager.load_raw(args.name)
+            if not data:
+                console.print(f"[red]Profile {args.name} not found[/red]")
+                return
+
+            export_data = {
+                "meta": {"version": "1.0", "exported_at": time.time(), "type": "user_profile"},
+                "profile": {
+                    "name": args.name,
+                    "data": data
+                }
+            }
+            with open(args.output, 'w') as f:
+                json.dump(export_data, f, indent=2)
+            console.print(f"[green]Exported to {args.output}[/green]")
+
+        elif args.user_command == "import":
+            try:
+                with open(args.file, 'r') as f:
+                    imported = json.load(f)
+
+                if "profile" not in imported:
+                    console.print("[red]Invalid profile JSON format[/red]")
+                    return
+
+                # Ask for name or use imported name?
+                name = imported['profile']['name']
+                # Suggest rename if exists?
+
+                if manager.create(name, imported['profile']['data'], overwrite=False):
+                     console.print(f"[green]Imported profile '{name}'[/green]")
+                else:
+                     if Confirm.ask(f"Profile '{name}' exists. Overwrite?"):
+                         manager.create(name, imported['profile']['data'], overwrite=True)
+                         console.print(f"[green]Overwritten profile '{name}'[/green]")
+
+            except Exception as e:
+                console.print(f"[red]Import failed: {e}[/red]")
+
+    else:
+        args.subparser.print_help()
@@ -0,0 +1,48 @@
+import json
+from rich.table import Table
+from ..core.context.explain import Explainer
+from ..core.recommendations.engine import RecommendationEngine
+
+def run(args, console):
+    # We reuse Explainer to get context easily
+    explainer = Explainer()
+    ctx = explainer.explain_system()
+
+    engine = RecommendationEngine()
+    recs = engine.recommend_profiles(ctx['audit'], ctx['identity'], ctx['machine'])
+
+    # Filter by tier if requested
+    if args.tier:
+        recs = [r for r in recs if r['tier'] == args.tier]
+
+    if args.json:
+        console.print_json(json.dumps(recs))
+    else:
+        if not recs:
+            console.print("[yellow]No relevant recommendations found.[/yellow]")
+        else:
+            table = Table(title="Recommended Profiles")
+            table.add_column("Score", justify="right", style="bold")
+            table.add_column("Profile", style="cyan")
+            table.add_column("Tier", style="magenta")
+            table.add_column("Reasons / Warnings")
+
+            for r in recs:
+                score_color = "green" if r['score'] > 70 else "yellow" if r['score'] > 40 else "red"
+
+                details = []
+                if r['reasons']:
+                    details.append(f"[green]✓ {', '.join(r['reasons'])}[/green]")
+                if r['warnings']:
+                    details.append(f"[red]! {', '.join(r['warnings'])}[/red]")
+
+                details_str = "\n".join(details)
+
+                table.add_row(
+                    f"[{score_color}]{r['score']}[/{score_color}]",
+                    r['profile'],
+                    r['tier'],
+                    details_str
+                )
+            console.print(table)
+            console.print("\n[dim]Run 'autoconfigoscli install <profile>' to apply.[/dim]")
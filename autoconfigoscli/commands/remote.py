@@ -0,0 +1,47 @@
+import os
+from rich.panel import Panel
+from ..core.remote.manager import RemoteManager
+from ..core.profiles.loader import ProfileLoader
+
+def run(args, console):
+    console.print(f"[cyan]Connecting to {args.target}...[/cyan]")
+    rman = RemoteManager(port=args.port, key_path=args.key)
+
+    if args.remote_command == "install":
+         local_prof_path = None
+         if args.copy_user_profile:
+             # Resolve local path
+             ploader = ProfileLoader()
+             # Check if exists
+             full_path = os.path.join(ploader.user_profiles_dir, f"{args.copy_user_profile}.yaml")
+             if os.path.exists(full_path):
+                 local_prof_path = full_path
+             else:
+                 console.print(f"[red]Local profile {args.copy_user_profile} not found.[/red]")
+                 return
+
+         with console.status("Running Remote Install (Bootstrap -> Deploy -> Install)..."):
+             res = rman.install_profile(args.target, args.profile, local_prof_path, args.dry_run)
+
+         if res["success"]:
+             console.print(Panel(res["stdout"], title="Remote Output", border_style="green"))
+             console.print("[bold green]Remote Install Successful (or Dry-Run completed)[/bold green]")
+         else:
+             error_msg = res.get("stderr") or res.get("error") or "Unknown error"
+             console.print(Panel(error_msg, title="Remote Error", border_style="red"))
+
+    elif args.remote_command in ["status", "audit", "doctor"]:
+         with console.status(f"Running Remote {args.remote_command}..."):
+             res = rman.run_generic(args.target, args.remote_command, "--json" if args.remote_command == "audit" else "")
+
+         if res["success"]:
+             if args.remote_command == "audit":
+                 # Pretty print JSON if we can
+                 try:
+                     console.print_json(res["stdout"])
+                 except:
+                     console.print(res["stdout"])
+             else:
+                 console.print(res["stdout"])
+         else:
+             console.print(f"[red]Remote Command Failed:[/red]\n{res['stderr']}")
@@ -0,0 +1,18 @@
+from ..core.warm_server import WarmServer
+
+def run(args, console):
+    try:
+        server = WarmServer(args.socket or None, idle_timeout=args.idle_timeout)
+    except (OSError, RuntimeError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+
+    console.print("Warming caches...")
+    server.warm()
+    console.print(f"[green]Serving query commands on {server.socket_path}[/green] "
+                  f"(exits after {args.idle_timeout:g}s idle)")
+    try:
+        server.serve_until_idle()
+    except KeyboardInterrupt:
+        pass
+    console.print("Server stopped.")
@@ -0,0 +1,49 @@
+import os
+from rich.prompt import Confirm
+from rich.table import Table
+from ..core.retention import RetentionManager, RetentionPolicy
+from ..core.state import StateManager
+from ..core.context.history import HistoryManager
+
+def run(args, console):
+    if args.state_command == "compact":
+        manager = RetentionManager()
+        policy = RetentionPolicy(keep_audits=args.keep_audits, history_days=args.history_days, vacuum=args.vacuum)
+        manager.print_report(manager.compact(policy))
+    elif args.state_command == "backup":
+        path = StateManager().create_backup(keep=args.keep)
+        if path:
+            console.print(f"[green]Backup created at: {path}[/green]")
+        else:
+            console.print("[red]Could not create backup (no database yet?).[/red]")
+    elif args.state_command == "backups":
+        table = Table(title="State Backups")
+        table.add_column("File")
+        table.add_column("Size", justify="right")
+        for path in StateManager().list_backups():
+            table.add_row(path, f"{os.path.getsize(path) / 1024:.1f} KiB")
+        console.print(table)
+    elif args.state_command == "restore":
+        state = StateManager()
+        backups = state.list_backups()
+        path = args.backup or (backups[0] if backups else None)
+        if not path:
+            console.print("[red]Error: No backups found.[/red]")
+        elif not os.path.exists(path):
+            console.print(f"[red]Error: Backup not found: {path}[/red]")
+        elif args.yes or Confirm.ask(f"Replace the current state with {path}?"):
+            # The current state is kept as a backup of its own
+            restored = state.restore_backup(path, keep_current=True)
+            if restored:
+                console.print(f"[green]State restored from {path}[/green]")
+            elif not os.path.exists(path):
+                console.print(f"[red]Restore failed: backup not found: {path}[/red]")
+            else:
+                console.print(f"[red]Restore failed: {path} is not a valid backup.[/red]")
+            HistoryManager(state).record_action(
+                action_type="restore_state",
+                actor="user",
+                source="manual",
+                target=path,
+                result="success" if restored else "failed"
+            )
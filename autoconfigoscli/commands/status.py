@@ -0,0 +1,13 @@
+from ..core.os_detect import get_os_info
+from ..core.state import StateManager
+
+def run(args, console):
+    os_info = get_os_info()
+    console.print(f"[bold]OS Info:[/bold] {os_info}")
+    state = StateManager()
+    try:
+         pkgs = state.execute_query("SELECT count(*) as c FROM installed_packages")
+         count = pkgs[0]['c']
+         console.print(f"[bold]Installed Packages:[/bold] {count}")
+    except Exception:
+        pass
@@ -0,0 +1,4 @@
+from ..core.updater import Updater
+
+def run(args, console):
+    Updater().perform_update()
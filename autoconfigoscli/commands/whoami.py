@@ -0,0 +1,25 @@
+import json
+from rich.panel import Panel
+from ..core.identity import IdentityManager
+
+def run(args, console):
+    im = IdentityManager()
+    
+    if args.action == "edit":
+        im.interactive_edit()
+    else:
+        ident = im.get_identity()
+        
+        content = f"""
+[bold]Role:[/bold] {ident['role']}
+[bold]Level:[/bold] {ident['level']}
+[bold]Machine:[/bold] {ident['machine_type']}
+[bold]Last Updated:[/bold] {ident.get('updated_at', 'Never')}
+
+[bold]Preferences:[/bold]
+{json.dumps(ident['preferences'], indent=2)}
+
+[bold]Notes:[/bold]
+{ident['notes']}
+"""
+        console.print(Panel(content.strip(), title="User Identity", border_style="blue"))
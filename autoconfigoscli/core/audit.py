@@ -20,14 +20,13 @@ except ImportError:
 
 from .os_detect import get_os_info
 from .state import StateManager
-from .catalog.loader import CatalogLoader
-from .catalog.resolver import PackageResolver
+from .registry import get_catalog, get_resolver
 
 class SystemAuditor:
     def __init__(self):
         self.state = StateManager()
-        self.catalog = CatalogLoader()
-        self.resolver = PackageResolver(self.catalog)
+        self.catalog = get_catalog()
+        self.resolver = get_resolver()
 
     def run_audit(self) -> Dict[str, Any]:
         """Collects system data, persists it, and returns the report."""
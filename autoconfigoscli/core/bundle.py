@@ -0,0 +1,164 @@
+import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+import tempfile
+import time
+from typing import Dict, Any, Optional
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from .catalog.graph import DependencyCycleError
+from .os_detect import get_os_info
+
+console = Console()
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BundleManager:
+    """
+    Offline bundles: a tar archive holding manifest.json and content-addressed blobs/<sha256>.
+    Artifacts shared by several packages (common .deb dependencies, for example) are stored once.
+    """
+    def __init__(self, installer=None):
+        if installer is None:
+            from .installer import Installer
+            installer = Installer()
+        self.installer = installer
+
+    def create(self, profile_name: str, output_path: str = None) -> Optional[str]:
+        """Resolves a profile and downloads every artifact it needs into a bundle. Returns the bundle path."""
+        profile = self.installer.loader.load_profile(profile_name)
+        if not profile:
+            console.print(f"[red]Error: Profile '{profile_name}' not found.[/red]")
+            return None
+
+        try:
+            plan = self.installer._create_install_plan(profile)
+        except DependencyCycleError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return None
+
+        os_info = get_os_info()
+        output_path = output_path or f"{profile.name}.bundle.tar"
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "profile": profile.name,
+            "created_at": time.time(),
+            "os": {"system": os_info.system, "distro": os_info.distro_id, "version": os_info.distro_version},
+            "items": []
+        }
+        blobs = set()
+
+        # Installed packages are bundled too: the target machine is a different machine
+        items = plan['installable'] + plan['skipped']
+
+        with tempfile.TemporaryDirectory(prefix="autoconfigoscli-bundle-") as work, \
+             tarfile.open(output_path, "w") as tar, \
+             Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
+            task = progress.add_task("Downloading...", total=len(items))
+
+            for item in items:
+                progress.update(task, description=f"Downloading {item['name']} via {item['provider_name']}...")
+                provider = self.installer.provider_manager.get_provider(item['provider_name'])
+                item_dir = os.path.join(work, item['id'])
+                os.makedirs(item_dir, exist_ok=True)
+
+                entry = {key: item[key] for key in ("id", "name", "provider_name", "target_pkg", "risk", "deps")}
+                paths = provider.download([item['target_pkg']], item_dir)
+                if paths is None:
+                    console.print(f"[yellow]! {item['name']} can't be bundled via {provider.name}; it will need network access.[/yellow]")
+                    entry['artifacts'] = None
+                else:
+                    entry['artifacts'] = []
+                    for path in paths:
+                        digest = _sha256_file(path)
+                        if digest not in blobs:
+                            tar.add(path, arcname=f"blobs/{digest}")
+                            blobs.add(digest)
+                        entry['artifacts'].append({"sha256": digest, "filename": os.path.basename(path)})
+                    console.print(f"[green]✔ Bundled {item['name']} ({len(paths)} files)[/green]")
+                manifest['items'].append(entry)
+                progress.advance(task)
+
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+
+        bundled = sum(1 for entry in manifest['items'] if entry['artifacts'] is not None)
+        console.print(f"[bold green]Bundle written to {output_path}[/bold green] "
+                      f"({bundled}/{len(manifest['items'])} packages, {len(blobs)} unique files)")
+        return output_path
+
+    def extract(self, bundle_path: str, dest_dir: str) -> Optional[Dict[str, Any]]:
+        """Unpacks a bundle into dest_dir, verifying every blob against its digest.
+        Returns the manifest with each item's local 'paths' (None for items that weren't bundled)."""
+        try:
+            with tarfile.open(bundle_path) as tar:
+                manifest = json.load(tar.extractfile(MANIFEST_NAME))
+                if manifest.get("format") != BUNDLE_FORMAT:
+                    console.print(f"[red]Error: Unsupported bundle format {manifest.get('format')}.[/red]")
+                    return None
+
+                for entry in manifest['items']:
+                    if entry['artifacts'] is None:
+                        entry['paths'] = None
+                        continue
+                    entry['paths'] = []
+                    for artifact in entry['artifacts']:
+                        path = self._artifact_path(dest_dir, artifact)
+                        if not os.path.exists(path):
+                            os.makedirs(os.path.dirname(path), exist_ok=True)
+                            self._extract_blob(tar, artifact['sha256'], path)
+                        entry['paths'].append(path)
+        except (OSError, KeyError, tarfile.TarError, json.JSONDecodeError) as e:
+            console.print(f"[red]Error: Invalid bundle {bundle_path}: {e}[/red]")
+            return None
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return None
+
+        return manifest
+
+    @staticmethod
+    def _artifact_path(dest_dir: str, artifact: Dict[str, Any]) -> str:
+        # Manifest fields end up in paths: anything that could leave dest_dir is refused
+        sha256, filename = artifact['sha256'], artifact['filename']
+        if not isinstance(sha256, str) or not SHA256_RE.match(sha256):
+            raise ValueError(f"Bundle manifest has an invalid digest: {sha256!r}")
+        if (not isinstance(filename, str) or filename in ("", ".", "..")
+                or "/" in filename or "\\" in filename or "\0" in filename):
+            raise ValueError(f"Bundle manifest has an invalid file name: {filename!r}")
+        return os.path.join(dest_dir, sha256[:16], filename)
+
+    def _extract_blob(self, tar: tarfile.TarFile, sha256: str, path: str):
+        source = tar.extractfile(f"blobs/{sha256}")
+        if source is None:
+            raise ValueError(f"Bundle blob {sha256} is not a regular file.")
+        # Streamed into a temp file next to the target and moved into place only once it matches
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+            if digest.hexdigest() != sha256:
+                raise ValueError(f"Bundle blob {sha256} is corrupt (digest mismatch).")
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
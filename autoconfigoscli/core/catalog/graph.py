@@ -0,0 +1,43 @@
+from typing import Dict, List
+
+class DependencyCycleError(Exception):
+    """Raised when catalog dependencies form a cycle."""
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("Dependency cycle: " + " -> ".join(cycle))
+
+def topological_waves(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Orders a dependency graph into waves.
+    `graph` maps each node to its prerequisites; prerequisites that are not nodes are ignored.
+    Every node in a wave only depends on nodes from earlier waves, so a wave can run in parallel.
+    Inside a wave, nodes keep the insertion order of `graph`.
+    """
+    pending = {
+        node: {dep for dep in deps if dep in graph and dep != node}
+        for node, deps in graph.items()
+    }
+    waves = []
+    done = set()
+
+    while pending:
+        wave = [node for node, deps in pending.items() if deps <= done]
+        if not wave:
+            raise DependencyCycleError(_find_cycle(pending))
+        for node in wave:
+            del pending[node]
+        done.update(wave)
+        waves.append(wave)
+
+    return waves
+
+def _find_cycle(pending: Dict[str, set]) -> List[str]:
+    """Walks unresolved nodes until one repeats. Every pending node has a pending prerequisite."""
+    node = next(iter(pending))
+    path = []
+    seen = {}
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = sorted(dep for dep in pending[node] if dep in pending)[0]
+    return path[seen[node]:] + [node]
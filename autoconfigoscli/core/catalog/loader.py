@@ -1,8 +1,20 @@
 import yaml
+import hashlib
 import os
+import pickle
+import shlex
 from pathlib import Path
 from typing import Dict, List, Optional
-from .models import PackageDefinition, Transformation
+from .models import PackageDefinition, Transformation, InstallCheck
+from ...version import __version__
+
+# libyaml's parser when PyYAML was built with it; an order of magnitude faster than the pure-Python one
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Bump when the pickled dataclasses change shape. The cache next to packages.yaml
+# survives `pip install -U`, so the package version is part of the key as well.
+COMPILED_FORMAT = 1
+USER_CACHE_DIR = os.path.expanduser("~/.autoconfigoscli/cache")
 
 class CatalogLoader:
     def __init__(self, catalog_path: str = None):
@@ -21,26 +33,105 @@ class CatalogLoader:
         if not os.path.exists(self.catalog_path):
             return
 
+        compiled = self._load_compiled()
+        if compiled is not None:
+            self.packages = compiled
+            return
+
+        self.packages = self._parse_yaml()
+        self.compile(packages=self.packages)
+
+    def compile(self, packages: Dict[str, PackageDefinition] = None) -> Optional[str]:
+        """
+        Writes the parsed catalog as a pickle keyed by the package version and the
+        YAML's mtime, size and sha256.
+        It goes next to the YAML, or under ~/.autoconfigoscli/cache when that isn't writable.
+        Returns the path written, or None.
+        """
+        if packages is None:
+            packages = self._parse_yaml()
+        stat = os.stat(self.catalog_path)
+        payload = pickle.dumps({
+            "format": COMPILED_FORMAT,
+            "version": __version__,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": self._hash_catalog(),
+            "packages": packages
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+
+        for path in self._compiled_paths():
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+                return path
+            except OSError:
+                continue
+        return None
+
+    def _compiled_paths(self) -> List[str]:
+        # Catalogs outside the package (tests, custom paths) get their own name in the user cache
+        key = hashlib.sha1(os.path.abspath(self.catalog_path).encode()).hexdigest()[:12]
+        return [self.catalog_path + ".pickle", os.path.join(USER_CACHE_DIR, f"catalog-{key}.pickle")]
+
+    def _hash_catalog(self) -> str:
+        with open(self.catalog_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _load_compiled(self) -> Optional[Dict[str, PackageDefinition]]:
+        """
+        Returns the compiled packages if a cache matches the YAML. mtime and size are checked
+        first; when only they differ (a checkout or touch), the content hash decides.
+        """
+        stat = os.stat(self.catalog_path)
+        digest = None
+        for path in self._compiled_paths():
+            try:
+                with open(path, "rb") as f:
+                    compiled = pickle.load(f)
+            except Exception:
+                continue
+            if not isinstance(compiled, dict) or compiled.get("format") != COMPILED_FORMAT:
+                continue
+            if compiled.get("version") != __version__:
+                continue
+            if compiled["mtime_ns"] == stat.st_mtime_ns and compiled["size"] == stat.st_size:
+                return compiled["packages"]
+            digest = digest or self._hash_catalog()
+            if compiled["sha256"] == digest:
+                # Same content with new metadata: refresh the key so the next load takes the fast path
+                self.compile(packages=compiled["packages"])
+                return compiled["packages"]
+        return None
+
+    def _parse_yaml(self) -> Dict[str, PackageDefinition]:
         with open(self.catalog_path, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
 
+        packages = {}
         if not data or "packages" not in data:
-            return
+            return packages
 
         for pkg_data in data["packages"]:
             pkg_id = pkg_data.get("id")
             if not pkg_id: continue
 
             targets = {}
+            pkg_check = self._parse_check(pkg_data.get("check"))
             for os_key, target_data in pkg_data.get("targets", {}).items():
                 targets[os_key] = Transformation(
                     provider=target_data.get("provider", "system"),
                     package_name=target_data.get("package", pkg_id),
                     bootstrap_deps=target_data.get("deps", []),
-                    repo_url=target_data.get("repo")
+                    repo_url=target_data.get("repo"),
+                    sha256=target_data.get("sha256"),
+                    check=self._parse_check(target_data.get("check")) or pkg_check
                 )
 
-            self.packages[pkg_id] = PackageDefinition(
+            packages[pkg_id] = PackageDefinition(
                 id=pkg_id,
                 display_name=pkg_data.get("display_name", pkg_id),
                 description=pkg_data.get("description", ""),
@@ -49,6 +140,16 @@ class CatalogLoader:
                 targets=targets,
                 supported_os=pkg_data.get("supported_os", ["linux", "macos"])
             )
+        return packages
+
+    def _parse_check(self, data) -> Optional[InstallCheck]:
+        """Parses a `check:` block: {binary: x}, {path: ~/x} or {version: "x --version"}."""
+        if not data:
+            return None
+        version = data.get("version") or []
+        if isinstance(version, str):
+            version = shlex.split(version)
+        return InstallCheck(binary=data.get("binary"), path=data.get("path"), version_cmd=version)
 
     def get_package(self, pkg_id: str) -> Optional[PackageDefinition]:
         return self.packages.get(pkg_id)
@@ -6,6 +6,20 @@ class PackageStartCmd:
     cmd: str
     args: List[str] = field(default_factory=list)
 
+@dataclass
+class InstallCheck:
+    """Cheap probe telling whether a package is already present, without spawning a shell."""
+    binary: Optional[str] = None # executable looked up on PATH and common user bin dirs
+    path: Optional[str] = None # file that exists once installed (~ is expanded)
+    version_cmd: List[str] = field(default_factory=list) # command that exits 0 when installed
+
+    def describe(self) -> str:
+        if self.binary:
+            return f"binary {self.binary}"
+        if self.path:
+            return f"path {self.path}"
+        return f"run {' '.join(self.version_cmd)}"
+
 @dataclass
 class Transformation:
     """Represents how to install a package on a specific system."""
@@ -13,6 +27,8 @@ class Transformation:
     package_name: str  # The actual name in that provider, e.g., 'python3' vs 'python'
     bootstrap_deps: List[str] = field(default_factory=list) # e.g., ['flatpak']
     repo_url: Optional[str] = None # For scripts or custom repos
+    sha256: Optional[str] = None # Pinned digest of a remote script payload
+    check: Optional[InstallCheck] = None # Installed-state probe for providers that can't list packages
 
 @dataclass
 class PackageDefinition:
@@ -1,4 +1,4 @@
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from .loader import CatalogLoader
 from .models import PackageDefinition, Transformation
 from ..os_detect import get_os_info
@@ -8,40 +8,44 @@ class PackageResolver:
         self.loader = loader or CatalogLoader()
         self.os_info = get_os_info()
 
-    def resolve(self, pkg_id: str) -> Optional[Transformation]:
+    def resolve(self, pkg_id: str, distro: str = None) -> Optional[Transformation]:
         """
         Resolves a generic package ID to a specific Transformation (provider + package name)
-        for the current OS/Distro.
+        for the current OS/Distro, or for `distro` (a distro id such as 'fedora', or 'macos').
         """
         pkg = self.loader.get_package(pkg_id)
         if not pkg:
             return None
+        return self.resolve_definition(pkg, distro)
+
+    def resolve_definition(self, pkg: PackageDefinition, distro: str = None) -> Optional[Transformation]:
+        """Same as resolve() for an already loaded definition; batch callers skip the catalog lookup."""
+        if distro is None:
+            if self.os_info.is_macos:
+                distro = "macos"
+            elif self.os_info.is_linux:
+                distro = self.os_info.distro_id.lower()
+            else:
+                return None
 
         # Check supported OS
-        current_os_key = "macos" if self.os_info.is_macos else "linux"
-        if current_os_key not in pkg.supported_os:
+        os_key = "macos" if distro == "macos" else "linux"
+        if os_key not in pkg.supported_os:
             return None # Not supported
 
-        # 1. Access OS targets
-        # Prioritize distro-specific key if on linux? (e.g. 'ubuntu')
-        # os_info.distro contains full string, maybe partial match or key map?
-        # For now, simplistic 'linux' or 'macos' fallback.
-        
-        target = None
-        
-        if self.os_info.is_linux:
-             # Try specific distro keys if we added them in models/yaml
-             # Example: if os_info.distro is 'ubuntu', look for 'ubuntu' in targets
-             distro_key = self.os_info.distro_id.lower()
-             if distro_key in pkg.targets:
-                 target = pkg.targets[distro_key]
-             elif "linux" in pkg.targets:
-                 target = pkg.targets["linux"]
-        elif self.os_info.is_macos:
-             if "macos" in pkg.targets:
-                 target = pkg.targets["macos"]
-
-        return target
+        if os_key == "macos":
+            return pkg.targets.get("macos")
+
+        # Distro-specific key first (e.g. 'ubuntu'), then the generic 'linux' target
+        if distro in pkg.targets:
+            return pkg.targets[distro]
+        return pkg.targets.get("linux")
+
+    def known_distros(self) -> List[str]:
+        """Every distro the catalog has a specific target for, plus generic 'linux' and 'macos'."""
+        distros = {key for pkg in self.loader.packages.values() for key in pkg.targets}
+        distros.update(("linux", "macos"))
+        return sorted(distros)
 
     def get_package_details(self, pkg_id: str) -> Optional[PackageDefinition]:
          return self.loader.get_package(pkg_id)
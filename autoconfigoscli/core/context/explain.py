@@ -3,8 +3,7 @@ from ..audit import SystemAuditor
 from ..identity import IdentityManager
 from .machine import MachineManager
 from ..profiles.loader import ProfileLoader
-from ..catalog.loader import CatalogLoader
-from ..catalog.resolver import PackageResolver
+from ..registry import get_catalog, get_resolver
 
 class Explainer:
     def __init__(self):
@@ -12,8 +11,10 @@ class Explainer:
         self.identity = IdentityManager()
         self.machine = MachineManager()
         self.profile_loader = ProfileLoader()
-        self.catalog_loader = CatalogLoader()
-        self.resolver = PackageResolver(self.catalog_loader)
+        self.catalog_loader = get_catalog()
+        self.resolver = get_resolver()
+        # package_table() results per distro (None = this machine)
+        self._tables: Dict[Any, Dict[str, Dict[str, Any]]] = {}
 
     def explain_system(self) -> Dict[str, Any]:
         """Aggregates all context context data."""
@@ -23,58 +24,93 @@ class Explainer:
             "machine": self.machine.get_profile()
         }
 
-    def explain_profile(self, profile_name: str) -> Dict[str, Any]:
-        """Analyzes a profile's packages regarding the current system."""
-        profile = self.profile_loader.load_profile(profile_name)
-        if not profile:
-            return {"error": "Profile not found"}
+    def explain_profile(self, profile_name: str, distro: str = None) -> Dict[str, Any]:
+        """Analyzes a profile's packages regarding the current system (or `distro`)."""
+        return self.explain_profiles([profile_name], distro)[0]
 
-        analysis = {
-            "profile": {
-                "name": profile.name,
-                "tier": profile.tier,
-                "description": profile.description,
-            },
-            "packages_analysis": [],
-            "summary": {
-                "total": 0,
-                "supported": 0,
-                "unsupported": 0,
-                "risky": 0
+    def explain_profiles(self, profile_names: List[str], distro: str = None) -> List[Dict[str, Any]]:
+        """
+        Analyzes several profiles at once. Every package is resolved a single time into
+        a shared support table, so the profiles' summaries are just lookups into it.
+        """
+        table = self.package_table(distro)
+        results = []
+        for name in profile_names:
+            profile = self.profile_loader.load_profile(name)
+            if not profile:
+                results.append({"error": "Profile not found", "profile": {"name": name}})
+                continue
+
+            packages = self._lookup(table, profile.packages)
+            results.append({
+                "profile": {
+                    "name": profile.name,
+                    "tier": profile.tier,
+                    "description": profile.description,
+                },
+                "packages_analysis": packages,
+                "summary": self._summarize(packages)
+            })
+        return results
+
+    def compatibility_matrix(self, profile_names: List[str], distros: List[str]) -> Dict[str, Dict[str, Any]]:
+        """{profile: {distro: summary}} for every profile against every distro; a missing profile maps to None."""
+        profiles = {name: self.profile_loader.load_profile(name) for name in profile_names}
+        tables = {distro: self.package_table(distro) for distro in distros}
+        return {
+            name: {
+                distro: self._summarize(self._lookup(table, profile.packages)) if profile else None
+                for distro, table in tables.items()
             }
+            for name, profile in profiles.items()
         }
-        
-        for pkg_id in profile.packages:
-            pkg_info = self.explain_package(pkg_id)
-            analysis["packages_analysis"].append(pkg_info)
-            
-            analysis["summary"]["total"] += 1
-            if pkg_info["supported"]:
-                analysis["summary"]["supported"] += 1
-            else:
-                analysis["summary"]["unsupported"] += 1
-            
-            if pkg_info["risk_level"] in ["high", "medium"]:
-                analysis["summary"]["risky"] += 1
-                
-        return analysis
 
-    def explain_package(self, pkg_id: str) -> Dict[str, Any]:
-        pkg = self.catalog_loader.get_package(pkg_id)
-        if not pkg:
-            return {"id": pkg_id, "found": False}
-        
-        target = self.resolver.resolve(pkg_id)
-        supported = target is not None
-        
+    def explain_package(self, pkg_id: str, distro: str = None) -> Dict[str, Any]:
+        return self._lookup(self.package_table(distro), [pkg_id])[0]
+
+    def explain_packages(self, pkg_ids: List[str] = None, distro: str = None) -> List[Dict[str, Any]]:
+        """Explains the given packages, or the whole catalog when `pkg_ids` is None."""
+        table = self.package_table(distro)
+        if pkg_ids is None:
+            return list(table.values())
+        return self._lookup(table, pkg_ids)
+
+    def package_table(self, distro: str = None) -> Dict[str, Dict[str, Any]]:
+        """Support and risk of every catalog package, resolved once per distro and kept for this Explainer."""
+        if distro not in self._tables:
+            self._tables[distro] = {
+                pkg.id: self._describe(pkg, self.resolver.resolve_definition(pkg, distro))
+                for pkg in self.catalog_loader.packages.values()
+            }
+        return self._tables[distro]
+
+    def _lookup(self, table: Dict[str, Dict[str, Any]], pkg_ids: List[str]) -> List[Dict[str, Any]]:
+        return [table.get(pkg_id) or self._unknown_package(pkg_id) for pkg_id in pkg_ids]
+
+    def _describe(self, pkg, target) -> Dict[str, Any]:
         return {
             "id": pkg.id,
             "found": True,
             "display_name": pkg.display_name,
             "description": pkg.description,
             "risk_level": pkg.risk_level,
-            "supported": supported,
+            "supported": target is not None,
             "provider": target.provider if target else None,
             "package_name": target.package_name if target else None,
-            "check": None # check_cmd not currently in Transformation model
+            "check": target.check.describe() if target and target.check else None
+        }
+
+    def _unknown_package(self, pkg_id: str) -> Dict[str, Any]:
+        return {
+            "id": pkg_id, "found": False, "display_name": pkg_id, "description": "",
+            "risk_level": None, "supported": False, "provider": None, "package_name": None, "check": None
+        }
+
+    def _summarize(self, packages: List[Dict[str, Any]]) -> Dict[str, int]:
+        supported = sum(1 for pkg in packages if pkg["supported"])
+        return {
+            "total": len(packages),
+            "supported": supported,
+            "unsupported": len(packages) - supported,
+            "risky": sum(1 for pkg in packages if pkg["risk_level"] in ["high", "medium"])
         }
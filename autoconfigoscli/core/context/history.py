@@ -1,10 +1,103 @@
+import atexit
 import json
-from typing import List, Dict, Any, Optional
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Iterator
 from ..state import StateManager
 
+# Destructive actions are written straight away even when other records are buffered
+SYNC_ACTIONS = {"delete_profile", "import_state", "restore_state"}
+
+INSERT_HISTORY = """
+    INSERT INTO decision_history (
+        action_type, actor, source, target, result, details_json, risks_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+class HistorySink:
+    """
+    Write-behind buffer for decision_history rows.
+    Records are kept in memory and written in one executemany transaction once max_records
+    are pending, once the oldest is max_delay seconds old (a timer covers processes that
+    go quiet), on flush(), or at process exit.
+    """
+    def __init__(self, state: StateManager, max_records: int = 50, max_delay: float = 30.0):
+        self.state = state
+        self.max_records = max_records
+        self.max_delay = max_delay
+        self._pending = []
+        self._oldest = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def add(self, row: tuple, sync: bool = False):
+        """Queues a row. sync=True writes it (and everything queued before it) immediately."""
+        with self._lock:
+            self._pending.append(row)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                # Daemon, so a pending timer never holds the process open; atexit flushes the rest
+                self._timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+            due = (sync or len(self._pending) >= self.max_records
+                   or time.monotonic() - self._oldest >= self.max_delay)
+        if due:
+            self.flush()
+
+    def _flush_on_timer(self):
+        self.flush()
+        # The timer thread is done with the database; don't leave its connection open
+        self.state.close()
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending, self._oldest = self._pending, [], None
+            if self._timer and self._timer is not threading.current_thread():
+                self._timer.cancel()
+            self._timer = None
+            if not rows:
+                return
+            try:
+                self.state.init_db()
+                with self.state.session() as conn:
+                    conn.executemany(INSERT_HISTORY, rows)
+            except Exception:
+                pass
+
+# One sink per database so every HistoryManager in the process shares the same buffer
+_sinks: Dict[str, HistorySink] = {}
+_sinks_lock = threading.Lock()
+
+def get_sink(state: StateManager) -> HistorySink:
+    with _sinks_lock:
+        if state.db_path not in _sinks:
+            _sinks[state.db_path] = HistorySink(state)
+        return _sinks[state.db_path]
+
+@atexit.register
+def flush_all():
+    for sink in list(_sinks.values()):
+        sink.flush()
+
+RELATIVE_AGE_RE = re.compile(r"^(\d+)([dhm])$")
+
+def parse_since(value: str) -> str:
+    """Turns '7d'/'12h'/'30m' into a UTC timestamp comparable with CURRENT_TIMESTAMP; other values pass through."""
+    match = RELATIVE_AGE_RE.match(value.strip())
+    if not match:
+        return value.strip()
+    amount, unit = int(match.group(1)), match.group(2)
+    delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount), "m": timedelta(minutes=amount)}[unit]
+    # Same UTC "YYYY-MM-DD HH:MM:SS" form SQLite uses for CURRENT_TIMESTAMP
+    return (datetime.now(timezone.utc) - delta).strftime("%Y-%m-%d %H:%M:%S")
+
 class HistoryManager:
-    def __init__(self):
-        self.state = StateManager()
+    def __init__(self, state: StateManager = None):
+        self.state = state or StateManager()
+        self.sink = get_sink(self.state)
 
     def record_action(self, 
                       action_type: str, 
@@ -14,32 +107,63 @@ class HistoryManager:
                       result: str, 
                       details: Dict[str, Any] = None, 
                       risks: List[str] = None):
-        """Records a decision/action in the rich history log."""
-        self.state.init_db()
-        try:
-            self.state.execute_query("""
-                INSERT INTO decision_history (
-                    action_type, actor, source, target, result, details_json, risks_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                action_type, actor, source, target, result,
-                json.dumps(details or {}),
-                json.dumps(risks or [])
-            ))
-        except Exception:
-            pass
+        """
+        Records a decision/action in the rich history log.
+        Writes are buffered (see HistorySink); actions with risks or in SYNC_ACTIONS are written immediately.
+        """
+        self.sink.add((
+            action_type, actor, source, target, result,
+            json.dumps(details or {}),
+            json.dumps(risks or [])
+        ), sync=bool(risks) or action_type in SYNC_ACTIONS)
+
+    def flush(self):
+        """Writes any buffered records."""
+        self.sink.flush()
 
     def get_recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.iter_entries(limit=limit)]
+
+    def iter_entries(self,
+                     action_type: str = None,
+                     target: str = None,
+                     result: str = None,
+                     since: str = None,
+                     before: int = None,
+                     limit: int = 20) -> Iterator[Any]:
+        """
+        Streams history rows newest first, optionally filtered.
+        `before` is a keyset cursor: the id of the last row of the previous page.
+        `since` accepts a timestamp/date or a relative age such as 7d, 12h or 30m.
+        """
+        self.flush()
         self.state.init_db()
+
+        clauses, params = [], []
+        for column, value in (("action_type", action_type), ("target", target), ("result", result)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(parse_since(since))
+        if before:
+            clauses.append("(timestamp, id) < (SELECT timestamp, id FROM decision_history WHERE id = ?)")
+            params.append(int(before))
+
+        query = "SELECT * FROM decision_history"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(int(limit))
+
         try:
-            rows = self.state.execute_query(
-                f"SELECT * FROM decision_history ORDER BY id DESC LIMIT {limit}"
-            )
-            return [dict(row) for row in rows]
+            yield from self.state.get_connection().execute(query, params)
         except Exception:
-            return []
+            return
 
     def get_details(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        self.flush()
         self.state.init_db()
         try:
             rows = self.state.execute_query(
@@ -1,27 +1,144 @@
+import gzip
+import io
 import json
+import re
+import uuid
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from rich.console import Console
 from .state import StateManager
+from .context.history import get_sink, parse_since
 import time
 
+console = Console()
+
+NDJSON_VERSION = 2
+
+# Bookkeeping tables that never travel between machines
+INTERNAL_TABLES = {"schema_version", "state_exports"}
+
+# Columns that tell when a row last changed, most specific first
+TIME_COLUMNS = ("updated_at", "timestamp", "installed_at", "applied_at", "created_at", "started_at")
+
+def is_ndjson(path: str) -> bool:
+    """Legacy .json files hold one JSON document; everything else (.ndjson, .jsonl, .gz, .zst) is streamed."""
+    return not path.endswith(".json")
+
+def open_state_file(path: str, mode: str):
+    """Opens an export file as text, compressed according to its extension (.gz, or .zst if zstandard is installed)."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstandard is required for .zst files (pip install zstandard)")
+        return io.TextIOWrapper(zstandard.open(path, mode + "b"), encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def list_tables(conn) -> List[str]:
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    ).fetchall()
+    return [row[0] for row in rows if row[0] not in INTERNAL_TABLES]
+
 class Exporter:
     def __init__(self):
         self.state = StateManager()
 
-    def export_data(self, output_path: str):
+    def export_data(self, output_path: str, since: str = None) -> Optional[str]:
+        """
+        Exports every table of state.db. With `since` (an earlier export id, a timestamp or an
+        age like 7d) only rows added or changed after it are written, as a delta to merge on import.
+        Returns the new export id, or None if `since` can't be resolved.
+        """
         self.state.init_db()
-        data = {
-            "metadata": {
+        get_sink(self.state).flush()
+        conn = self.state.get_connection()
+
+        with self.state.session():
+            # Rows are bounded by these high-water marks, so rows written during the export go to the next one
+            delta = self._resolve_since(conn, since) if since else None
+            if since and delta is None:
+                return None
+            high_water = {
+                table: conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+                for table in list_tables(conn)
+            }
+            export_id = uuid.uuid4().hex[:12]
+            metadata = {
                 "timestamp": time.time(),
-                "version": 1
-            },
-            "tables": {}
-        }
-        
-        tables = ["installed_packages", "applied_profiles", "history", "settings"]
-        for table in tables:
-            rows = self.state.execute_query(f"SELECT * FROM {table}")
-            data["tables"][table] = [dict(row) for row in rows]
-            
+                "version": NDJSON_VERSION if is_ndjson(output_path) else 1,
+                "export_id": export_id,
+                "schema_version": conn.execute("PRAGMA user_version").fetchone()[0],
+                "since": since,
+                "incremental": bool(since)
+            }
+            tables = self._iter_tables(conn, high_water, delta)
+            if is_ndjson(output_path):
+                self._write_ndjson(output_path, metadata, tables)
+            else:
+                self._write_json(output_path, metadata, tables)
+
+            conn.execute(
+                "INSERT INTO state_exports (export_id, since, high_water_json) VALUES (?, ?, ?)",
+                (export_id, since, json.dumps(high_water))
+            )
+        return export_id
+
+    def _resolve_since(self, conn, since: str) -> Optional[Dict[str, Any]]:
+        """Turns --since into {"rowids": {table: rowid} or None, "changed_at": timestamp}."""
+        row = conn.execute(
+            "SELECT created_at, high_water_json FROM state_exports WHERE export_id = ?", (since,)
+        ).fetchone()
+        if row:
+            return {"rowids": json.loads(row["high_water_json"]), "changed_at": row["created_at"]}
+        changed_at = parse_since(since)
+        if not re.match(r"^\d{4}-\d{2}-\d{2}", changed_at):
+            console.print(f"[red]Error: '{since}' is neither a known export id nor a timestamp.[/red]")
+            return None
+        return {"rowids": None, "changed_at": changed_at}
+
+    def _iter_tables(self, conn, high_water: Dict[str, int], delta: Optional[Dict[str, Any]]) -> Iterator[Tuple[str, List[str], Any]]:
+        """Yields (table, columns, cursor) for each table, restricted to the delta if one is given."""
+        for table, max_rowid in high_water.items():
+            columns = [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+            clauses, params = ["rowid <= ?"], [max_rowid]
+            if delta:
+                changed = []
+                if delta["rowids"] is not None:
+                    # New rows by rowid (tables created after the base export are sent in full);
+                    # rows updated in place only show up through updated_at
+                    changed.append("rowid > ?")
+                    params.append(delta["rowids"].get(table, 0))
+                    time_column = "updated_at" if "updated_at" in columns else None
+                else:
+                    time_column = next((c for c in TIME_COLUMNS if c in columns), None)
+                if time_column:
+                    changed.append(f"{time_column} >= ?")
+                    params.append(delta["changed_at"])
+                if changed:
+                    clauses.append("(" + " OR ".join(changed) + ")")
+            cursor = conn.execute(f"SELECT * FROM {table} WHERE {' AND '.join(clauses)}", params)
+            yield table, [col[0] for col in cursor.description], cursor
+
+    def _write_json(self, output_path: str, metadata: Dict[str, Any], tables):
+        data = {"metadata": metadata, "tables": {}}
+        for table, columns, cursor in tables:
+            data["tables"][table] = [dict(row) for row in cursor]
+
         with open(output_path, 'w') as f:
             json.dump(data, f, indent=2)
+
+    def _write_ndjson(self, output_path: str, metadata: Dict[str, Any], tables):
+        """
+        One JSON value per line: a metadata header, then for each table a
+        {"table": ..., "columns": [...]} line followed by one array per row.
+        Rows go straight from the cursor to the file, so memory stays flat.
+        """
+        with open_state_file(output_path, "w") as f:
+            f.write(json.dumps({"metadata": metadata}) + "\n")
+            for table, columns, cursor in tables:
+                f.write(json.dumps({"table": table, "columns": columns}) + "\n")
+                for row in cursor:
+                    f.write(json.dumps(tuple(row)) + "\n")
@@ -5,26 +5,39 @@ from typing import Dict, Any
 from rich.console import Console
 
 from .state import StateManager, DB_PATH
-from .migration_manager import MigrationManager
+from .migration_manager import MigrationManager, latest_version
+from .exporter import is_ndjson, open_state_file, INTERNAL_TABLES
+from .context.history import HistoryManager
 
 console = Console()
 
+# Rows per executemany call when restoring
+CHUNK_SIZE = 1000
+
 class Importer:
     def __init__(self):
         self.state = StateManager()
 
     def import_data(self, input_path: str):
         # 1. Validation
+        streamed = is_ndjson(input_path)
         try:
-            with open(input_path, 'r') as f:
-                data = json.load(f)
-        except json.JSONDecodeError:
-            console.print("[red]Error: Invalid JSON file.[/red]")
+            with open_state_file(input_path, 'r') as f:
+                # NDJSON exports are only checked for their header here and streamed during the restore
+                data = json.loads(f.readline()) if streamed else json.load(f)
+        except (json.JSONDecodeError, OSError, RuntimeError) as e:
+            console.print(f"[red]Error: Invalid export file: {e}[/red]")
             return
 
-        if "metadata" not in data or "tables" not in data:
+        if "metadata" not in data or (not streamed and "tables" not in data):
             console.print("[red]Error: Backup structure likely invalid. Missing 'metadata' or 'tables'.[/red]")
             return
+
+        if data["metadata"].get("schema_version", 0) > latest_version():
+            console.print("[red]Error: This export comes from a newer schema. Update autoconfigoscli first.[/red]")
+            return
+        # Deltas (export --since) are merged into the existing rows instead of replacing the tables
+        merge = bool(data["metadata"].get("incremental"))
         
         # 2. Safety Backup
         console.print("[blue]Creating safety backup before import...[/blue]")
@@ -34,32 +47,103 @@ class Importer:
         
         # 3. Restore
         try:
-            with self.state.get_connection() as conn:
-                for table, rows in data["tables"].items():
-                    # Handle schema differences if needed, for now exact match or skip
-                    try:
-                        conn.execute(f"DELETE FROM {table}")
-                    except Exception:
-                        console.print(f"[yellow]Table {table} not found, skipping clean.[/yellow]")
-
-                    if not rows:
-                        continue
-                    
-                    columns = list(rows[0].keys())
-                    placeholders = ",".join(["?"] * len(columns))
-                    col_names = ",".join(columns)
-                    
-                    for row in rows:
-                        values = [row[c] for c in columns]
-                        conn.execute(
-                            f"INSERT INTO {table} ({col_names}) VALUES ({placeholders})",
-                            values
-                        )
+            # A fresh machine has no tables yet
+            self.state.init_db()
+            with self.state.session() as conn:
+                if streamed:
+                    self._restore_ndjson(conn, input_path, merge)
+                else:
+                    for table, rows in data["tables"].items():
+                        columns = list(rows[0].keys()) if rows else []
+                        target = self._begin_table(conn, table, columns, merge)
+                        if target:
+                            insert, params = target
+                            conn.executemany(insert, [params([row[c] for c in columns]) for row in rows])
             
             # 4. Post-Import: Run Migrations to ensure schema is up to date with new code
             self.state.init_db()
             console.print("[green]Import Successful![/green]")
+            result, error = "success", None
 
         except Exception as e:
             console.print(f"[bold red]Import Failed: {e}[/bold red]")
             console.print(f"[yellow]You may need to restore manually from {backup_path}[/yellow]")
+            result, error = "failed", str(e)
+
+        # Recorded after the restore, which would otherwise wipe it
+        HistoryManager(self.state).record_action(
+            action_type="import_state",
+            actor="user",
+            source="manual",
+            target=input_path,
+            result=result,
+            details={"merge": merge, "backup": backup_path, "error": error}
+        )
+
+    def _restore_ndjson(self, conn, input_path: str, merge: bool = False):
+        """Replays an NDJSON export line by line, inserting rows in chunks of CHUNK_SIZE."""
+        with open_state_file(input_path, 'r') as f:
+            f.readline()  # metadata header
+            target, chunk = None, []
+            for line in f:
+                if not line.strip():
+                    continue
+                value = json.loads(line)
+                if isinstance(value, dict):
+                    if chunk:
+                        conn.executemany(target[0], chunk)
+                    target, chunk = self._begin_table(conn, value["table"], value["columns"], merge), []
+                elif target:
+                    chunk.append(target[1](value))
+                    if len(chunk) >= CHUNK_SIZE:
+                        conn.executemany(target[0], chunk)
+                        chunk = []
+            if chunk:
+                conn.executemany(target[0], chunk)
+
+    def _begin_table(self, conn, table: str, columns, merge: bool = False):
+        """
+        Prepares a table for its rows. Returns (INSERT statement, row -> parameters), or None to skip the table.
+        A full import empties the table first and keeps every column as exported.
+        A merge upserts by primary key, except in tables keyed by an AUTOINCREMENT id: those ids
+        are local to the exporting machine and collide across machines, so the id is dropped,
+        SQLite assigns a new one, and a row identical in every other column is skipped, which
+        keeps merging the same delta twice harmless.
+        """
+        if table in INTERNAL_TABLES:
+            return None
+        # Handle schema differences if needed, for now exact match or skip
+        try:
+            conn.execute(f"SELECT 1 FROM {table} LIMIT 1" if merge else f"DELETE FROM {table}")
+        except Exception:
+            console.print(f"[yellow]Table {table} not found, skipping.[/yellow]")
+            return None
+        if not columns:
+            return None
+
+        surrogate = self._surrogate_key(conn, table) if merge else None
+        if surrogate not in columns:
+            placeholders = ",".join(["?"] * len(columns))
+            verb = "INSERT OR REPLACE" if merge else "INSERT"
+            return f"{verb} INTO {table} ({','.join(columns)}) VALUES ({placeholders})", list
+
+        keep = [i for i, c in enumerate(columns) if c != surrogate]
+        names = [columns[i] for i in keep]
+        same_row = " AND ".join(f"{c} IS ?" for c in names)
+        # OR REPLACE still resolves UNIQUE natural keys, e.g. installed_packages(name, manager)
+        insert = (f"INSERT OR REPLACE INTO {table} ({','.join(names)}) "
+                  f"SELECT {','.join(['?'] * len(names))} "
+                  f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {same_row})")
+
+        def params(row):
+            values = [row[i] for i in keep]
+            return values + values
+        return insert, params
+
+    def _surrogate_key(self, conn, table: str):
+        """The AUTOINCREMENT primary key column of `table`, or None."""
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if not row or "AUTOINCREMENT" not in (row[0] or "").upper():
+            return None
+        pk = [col[1] for col in conn.execute(f"PRAGMA table_info({table})") if col[5]]
+        return pk[0] if len(pk) == 1 else None
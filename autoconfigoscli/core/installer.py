@@ -1,5 +1,7 @@
 import subprocess
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from rich.console import Console
 from rich.table import Table
@@ -7,24 +9,34 @@ from rich.prompt import Confirm
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from .packages import ProviderManager
 from .profiles.loader import ProfileLoader, Profile
-from .catalog.resolver import PackageResolver, Transformation, PackageDefinition
-from .state import StateManager
+from .catalog.resolver import Transformation, PackageDefinition
+from .registry import get_provider_manager, get_resolver
+from .catalog.graph import DependencyCycleError, topological_waves
+from .state import StateManager, close_thread_connections
+from .journal import InstallJournal
+from .bundle import BundleManager
 
 console = Console()
 
 from .context.history import HistoryManager
 
+# Upper bound on concurrent provider checks; providers are few, so this rarely binds.
+DEFAULT_WORKERS = 4
+
 class Installer:
-    def __init__(self):
+    def __init__(self, max_workers: int = DEFAULT_WORKERS):
+        self.max_workers = max(1, max_workers)
         self.state = StateManager()
         self.loader = ProfileLoader()
-        self.provider_manager = ProviderManager()
-        self.resolver = PackageResolver()
+        self.provider_manager = get_provider_manager()
+        self.resolver = get_resolver()
         self.history = HistoryManager()
+        self.journal = InstallJournal(self.state)
+        self.run_id = None
 
-    def install_profile(self, profile_name: str, dry_run: bool = False, auto_yes: bool = False) -> bool:
+    def install_profile(self, profile_name: str, dry_run: bool = False, auto_yes: bool = False,
+                        prefetch: bool = True, prefetch_only: bool = False) -> bool:
         if not dry_run:
             self.state.init_db()
         
@@ -36,7 +48,11 @@ class Installer:
         console.print(Panel.fit(f"[bold cyan]Profile: {profile.name}[/bold cyan]\n{profile.description}", title="Installation Plan"))
 
         # 1. Resolve Plan
-        plan = self._create_install_plan(profile)
+        try:
+            plan = self._create_install_plan(profile)
+        except DependencyCycleError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return False
         
         # 2. Show Summary
         self._print_plan_summary(plan)
@@ -46,6 +62,7 @@ class Installer:
             return True
 
         if dry_run:
+            self._print_waves(plan)
             console.print("[dim]Dry run complete. No changes made.[/dim]")
             return True
 
@@ -54,12 +71,22 @@ class Installer:
             if plan['risky_count'] > 0:
                 console.print(f"[bold red]WARNING: This plan includes {plan['risky_count']} high-risk components (scripts).[/bold red]")
             
-            if not Confirm.ask("Proceed with installation?"):
+            if not Confirm.ask("Download packages now?" if prefetch_only else "Proceed with installation?"):
                  console.print("[red]Aborted.[/red]")
                  return False
 
-        # 4. Execute
+        # 4. Prefetch
+        if prefetch or prefetch_only:
+            self._prefetch(plan['installable'])
+        if prefetch_only:
+            console.print("[green]Prefetch complete. Packages are cached for a later install.[/green]")
+            return True
+
+        # 5. Execute
+        self.run_id = self.journal.start_run(profile.name, plan)
+        console.print(f"[dim]Run ID: {self.run_id} (resume with 'install --resume {self.run_id}')[/dim]")
         success = self._execute_plan(plan)
+        self.journal.finish_run(self.run_id, success)
         
         self.history.record_action(
             action_type="install_profile",
@@ -67,11 +94,170 @@ class Installer:
             source="manual" if not auto_yes else "system", # approximating
             target=profile_name,
             result="success" if success else "failed",
-            details={"risky_count": plan['risky_count'], "dry_run": dry_run}
+            details={"risky_count": plan['risky_count'], "dry_run": dry_run, "run_id": self.run_id},
+            risks=self._high_risk_items(plan)
+        )
+        
+        return success
+
+    def resume_run(self, run_id: str, auto_yes: bool = False, prefetch: bool = True) -> bool:
+        """Re-executes an interrupted run from its journal. Completed items are skipped
+        without asking providers again."""
+        self.state.init_db()
+        run = self.journal.load_run(run_id)
+        if not run:
+            console.print(f"[red]Error: Install run '{run_id}' not found or its plan is corrupt.[/red]")
+            return False
+
+        plan = run['plan']
+        done = {pkg_id for pkg_id, status in run['items'].items() if status == "done"}
+        plan['installable'] = [item for item in plan['installable'] if item['id'] not in done]
+        plan['waves'] = [
+            [pkg_id for pkg_id in wave if pkg_id not in done]
+            for wave in plan.get('waves', [])
+        ]
+        plan['waves'] = [wave for wave in plan['waves'] if wave]
+
+        console.print(Panel.fit(
+            f"[bold cyan]Resuming run {run_id}[/bold cyan] ({run['profile_name']})\n"
+            f"{len(done)} completed, {len(plan['installable'])} remaining",
+            title="Installation Plan"
+        ))
+        
+        if not plan['installable']:
+            console.print("[green]Nothing left to install.[/green]")
+            self.journal.finish_run(run_id, True)
+            return True
+
+        if not auto_yes and not Confirm.ask("Resume installation?"):
+            console.print("[red]Aborted.[/red]")
+            return False
+
+        self._register_targets(plan['installable'])
+        if prefetch:
+            self._prefetch(plan['installable'])
+
+        self.run_id = run_id
+        success = self._execute_plan(plan)
+        self.journal.finish_run(run_id, success)
+        
+        self.history.record_action(
+            action_type="resume_install",
+            actor="user",
+            source="manual" if not auto_yes else "system",
+            target=run['profile_name'],
+            result="success" if success else "failed",
+            details={"run_id": run_id, "resumed_items": len(plan['installable'])},
+            risks=self._high_risk_items(plan)
+        )
+        
+        return success
+
+    def install_from_bundle(self, bundle_path: str, dry_run: bool = False, auto_yes: bool = False) -> bool:
+        """Installs a profile from an offline bundle, using only the files it carries."""
+        if not dry_run:
+            self.state.init_db()
+
+        with tempfile.TemporaryDirectory(prefix="autoconfigoscli-bundle-") as work:
+            manifest = BundleManager(self).extract(bundle_path, work)
+            if not manifest:
+                return False
+
+            console.print(Panel.fit(
+                f"[bold cyan]Bundle: {manifest['profile']}[/bold cyan]\n"
+                f"Built on {manifest['os']['distro']} {manifest['os']['version']}",
+                title="Installation Plan"
+            ))
+            
+            try:
+                plan = self._create_bundle_plan(manifest)
+            except DependencyCycleError as e:
+                console.print(f"[red]Error: {e}[/red]")
+                return False
+            self._print_plan_summary(plan)
+            
+            if not plan['installable']:
+                console.print("[yellow]Nothing to install.[/yellow]")
+                return True
+
+            if dry_run:
+                self._print_waves(plan)
+                console.print("[dim]Dry run complete. No changes made.[/dim]")
+                return True
+
+            if not auto_yes:
+                if plan['risky_count'] > 0:
+                    console.print(f"[bold red]WARNING: This plan includes {plan['risky_count']} high-risk components (scripts).[/bold red]")
+                if not Confirm.ask("Proceed with installation?"):
+                    console.print("[red]Aborted.[/red]")
+                    return False
+
+            # Bundle paths live in a temporary directory, so these runs are not journaled for --resume
+            success = self._execute_plan(plan)
+        
+        self.history.record_action(
+            action_type="install_bundle",
+            actor="user",
+            source="manual" if not auto_yes else "system",
+            target=manifest['profile'],
+            result="success" if success else "failed",
+            details={"bundle": os.path.abspath(bundle_path), "risky_count": plan['risky_count']},
+            risks=self._high_risk_items(plan)
         )
         
         return success
 
+    def _create_bundle_plan(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Builds a plan from a bundle manifest; items carry local 'artifacts' instead of remote names."""
+        installable = []
+        skipped = []
+        unsupported = []
+        risky_count = 0
+        
+        resolved = []
+        for entry in manifest['items']:
+            provider = self.provider_manager.get_provider(entry['provider_name'])
+            if not provider:
+                unsupported.append(f"{entry['id']} (missing provider: {entry['provider_name']})")
+            elif entry['paths'] is None:
+                unsupported.append(f"{entry['id']} (not in bundle)")
+            else:
+                resolved.append((entry, provider))
+
+        # Same catalog pins and probes as an online plan, before anything is checked or installed
+        self._register_targets([entry for entry, provider in resolved])
+        
+        installed = self._check_installed_parallel(
+            [(provider, entry['target_pkg']) for entry, provider in resolved]
+        )
+        
+        for entry, provider in resolved:
+            item = {
+                "id": entry['id'],
+                "name": entry['name'],
+                "provider_name": provider.name,
+                "target_pkg": entry['target_pkg'],
+                "risk": entry['risk'],
+                "deps": entry['deps'],
+                "dependency": False,
+                "artifacts": entry['paths']
+            }
+            if installed[(provider.name, entry['target_pkg'])]:
+                skipped.append(item)
+            else:
+                installable.append(item)
+                if entry['risk'] == "high":
+                    risky_count += 1
+        
+        return {
+            "installable": installable,
+            "skipped": skipped,
+            "unsupported": unsupported,
+            "risky_count": risky_count,
+            "bootstraps": [],
+            "waves": topological_waves({item['id']: item['deps'] for item in installable})
+        }
+
     def _create_install_plan(self, profile: Profile) -> Dict[str, Any]:
         installable = []
         skipped = []
@@ -79,7 +265,8 @@ class Installer:
         risky_count = 0
         bootstraps = set()
         
-        for pkg_id in profile.packages:
+        resolved = []
+        for pkg_id in self._expand_dependencies(profile.packages):
             trans = self.resolver.resolve(pkg_id)
             pkg_def = self.resolver.get_package_details(pkg_id)
             
@@ -92,36 +279,107 @@ class Installer:
                 unsupported.append(f"{pkg_id} (missing provider: {trans.provider})")
                 continue
             
-            # Check existing
-            is_installed = provider.is_installed(trans.package_name)
-            
+            provider.register_target(trans.package_name, trans)
+            resolved.append((pkg_id, trans, pkg_def, provider))
+        
+        # Check existing, one task per provider so independent managers don't wait on each other
+        installed = self._check_installed_parallel(
+            [(provider, trans.package_name) for _, trans, _, provider in resolved]
+        )
+        
+        for pkg_id, trans, pkg_def, provider in resolved:
             item = {
                 "id": pkg_id,
                 "name": pkg_def.display_name if pkg_def else pkg_id,
                 "provider_name": provider.name,
                 "target_pkg": trans.package_name,
-                "risk": pkg_def.risk_level if pkg_def else "low"
+                "risk": pkg_def.risk_level if pkg_def else "low",
+                "deps": [],
+                "dependency": pkg_id not in profile.packages
             }
             
             if trans.bootstrap_deps:
                 for dep in trans.bootstrap_deps:
-                    bootstraps.add(dep)
+                    # Catalog packages are ordered by the DAG; anything else is left to the provider
+                    if self.resolver.get_package_details(dep):
+                        item["deps"].append(dep)
+                    else:
+                        bootstraps.add(dep)
             
-            if is_installed:
+            if installed[(provider.name, trans.package_name)]:
                 skipped.append(item)
             else:
                 installable.append(item)
                 if getattr(pkg_def, "is_high_risk", False):
                     risky_count += 1
         
+        # Installed or unsupported prerequisites are not nodes, so they don't hold anything back
+        waves = topological_waves({item['id']: item['deps'] for item in installable})
+        
         return {
             "installable": installable,
             "skipped": skipped,
             "unsupported": unsupported,
             "risky_count": risky_count,
-            "bootstraps": list(bootstraps)
+            "bootstraps": list(bootstraps),
+            "waves": waves
         }
 
+    def _expand_dependencies(self, pkg_ids: List[str]) -> List[str]:
+        """Appends catalog prerequisites (transitively) that the profile doesn't list itself."""
+        ordered = list(dict.fromkeys(pkg_ids))
+        i = 0
+        while i < len(ordered):
+            trans = self.resolver.resolve(ordered[i])
+            for dep in (trans.bootstrap_deps if trans else []):
+                if dep not in ordered and self.resolver.get_package_details(dep):
+                    ordered.append(dep)
+            i += 1
+        return ordered
+
+    def _high_risk_items(self, plan: Dict[str, Any]) -> List[str]:
+        """IDs of the high-risk items a plan installs; a non-empty list makes the history write synchronous."""
+        return [item['id'] for item in plan['installable'] if item.get('risk') == "high"]
+
+    def _register_targets(self, items: List[Dict[str, Any]]):
+        """Hands journaled items their catalog targets again (pins, probes) without any provider queries."""
+        for item in items:
+            trans = self.resolver.resolve(item['id'])
+            provider = self.provider_manager.get_provider(item['provider_name'])
+            if trans and provider and trans.package_name == item['target_pkg']:
+                provider.register_target(trans.package_name, trans)
+
+    def _check_installed_parallel(self, targets: List[tuple]) -> Dict[tuple, bool]:
+        """Runs is_installed checks with one pool task per provider.
+        Returns {(provider_name, package_name): installed}."""
+        by_provider: Dict[str, tuple] = {}
+        for provider, package_name in targets:
+            _, names = by_provider.setdefault(provider.name, (provider, []))
+            if package_name not in names:
+                names.append(package_name)
+        
+        results: Dict[tuple, bool] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(self._in_worker, self._check_installed, provider, names)
+                for provider, names in by_provider.values()
+            ]
+            for future in futures:
+                results.update(future.result())
+        return results
+
+    @staticmethod
+    def _in_worker(fn, *args):
+        """Runs a pool task, then closes the SQLite connections it opened (journal marks,
+        installed_packages rows): each wave's pool threads would otherwise keep theirs until exit."""
+        try:
+            return fn(*args)
+        finally:
+            close_thread_connections()
+
+    def _check_installed(self, provider, names: List[str]) -> Dict[tuple, bool]:
+        return {(provider.name, name): provider.is_installed(name) for name in names}
+
     def _print_plan_summary(self, plan: Dict[str, Any]):
         table = Table(title="Execution Summary")
         table.add_column("Package", style="cyan")
@@ -135,6 +393,8 @@ class Installer:
                 details = "[bold red]HIGH RISK[/bold red]"
             elif item['risk'] == 'medium':
                 details = "[yellow]Medium Risk[/yellow]"
+            if item.get('dependency'):
+                details = " ".join(filter(None, [details, "[blue]Dependency[/blue]"]))
             
             table.add_row(item['name'], "Install", item['provider_name'], details)
             
@@ -149,34 +409,187 @@ class Installer:
         if plan['bootstraps']:
             console.print(f"[blue]Bootstraps required:[/blue] {', '.join(plan['bootstraps'])}")
 
-    def _execute_plan(self, plan: Dict[str, Any]) -> bool:
-        # TODO: Handle bootstraps explicitly if needed, but provider might do it.
-        # FlatpakProvider handles its own bootstrap.
+    def _print_waves(self, plan: Dict[str, Any]):
+        names = {item['id']: item['name'] for item in plan['installable']}
+        deps = {item['id']: item['deps'] for item in plan['installable']}
         
-        success = True
+        console.print("[bold]Install order:[/bold]")
+        for index, wave in enumerate(plan['waves'], start=1):
+            entries = []
+            for pkg_id in wave:
+                after = [d for d in deps[pkg_id] if d in names]
+                entries.append(f"{names[pkg_id]} [dim](after {', '.join(after)})[/dim]" if after else names[pkg_id])
+            console.print(f"  Wave {index}: {', '.join(entries)}")
+
+    def _prefetch(self, items: List[Dict[str, Any]]) -> bool:
+        """Downloads every package archive before installing, one pool task per lock chain.
+        A failed prefetch is not fatal: the install phase downloads whatever is missing."""
+        lanes = self._group_by_provider(items)
+        providers = {name: self.provider_manager.get_provider(name) for name in lanes}
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             transient=True
         ) as progress:
-            task = progress.add_task("Installing...", total=len(plan['installable']))
+            tasks = {name: progress.add_task(f"Prefetching via {name}...", total=1) for name in lanes}
             
-            for item in plan['installable']:
-                provider = self.provider_manager.get_provider(item['provider_name'])
-                progress.update(task, description=f"Installing {item['name']} via {provider.name}...")
-                
-                if provider.install(item['target_pkg']):
-                     console.print(f"[green]✔ Installed {item['name']}[/green]")
-                     self._record_package(item['name'], provider.name)
-                else:
-                     console.print(f"[red]✘ Failed to install {item['name']}[/red]")
-                     success = False
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [
+                    pool.submit(
+                        self._in_worker,
+                        self._prefetch_chain,
+                        [(providers[name], lanes[name], tasks[name]) for name in chain],
+                        progress
+                    )
+                    for chain in self._build_chains(providers)
+                ]
+                results = [future.result() for future in futures]
+        
+        return all(results)
+
+    def _prefetch_chain(self, lanes: List[tuple], progress: Progress) -> bool:
+        success = True
+        for provider, items, task in lanes:
+            if not provider.prefetch([item['target_pkg'] for item in items]):
+                console.print(f"[yellow]Prefetch via {provider.name} failed; packages will be downloaded during install.[/yellow]")
+                success = False
+            progress.update(task, completed=1, description=f"[dim]{provider.name}: prefetched[/dim]")
+        return success
+
+    def _execute_plan(self, plan: Dict[str, Any]) -> bool:
+        by_id = {item['id']: item for item in plan['installable']}
+        waves = plan.get('waves') or [list(by_id)]
+        failed = set()
+        success = True
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            transient=True
+        ) as progress:
+            for wave in waves:
+                items = []
+                for pkg_id in wave:
+                    item = by_id[pkg_id]
+                    blocked = [dep for dep in item['deps'] if dep in failed]
+                    if blocked:
+                        console.print(f"[red]✘ Skipped {item['name']}: prerequisite failed ({', '.join(blocked)})[/red]")
+                        self._set_status(item, "failed")
+                        failed.add(pkg_id)
+                        success = False
+                        continue
+                    items.append(item)
                 
-                progress.advance(task)
+                if not self._run_wave(items, progress):
+                    success = False
+                failed.update(item['id'] for item in items if item.get('status') == "failed")
         
         return success
 
+    def _run_wave(self, items: List[Dict[str, Any]], progress: Progress) -> bool:
+        """Installs one wave of independent items, running provider lanes concurrently."""
+        lanes = self._group_by_provider(items)
+        providers = {name: self.provider_manager.get_provider(name) for name in lanes}
+        
+        # One task line per lane; each lane is one provider's group
+        tasks = {
+            name: progress.add_task(f"[dim]{name}: waiting...[/dim]", total=len(lane))
+            for name, lane in lanes.items()
+        }
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [
+                pool.submit(
+                    self._in_worker,
+                    self._run_chain,
+                    [(providers[name], lanes[name], tasks[name]) for name in chain],
+                    progress
+                )
+                for chain in self._build_chains(providers)
+            ]
+            results = [future.result() for future in futures]
+        
+        return all(results)
+
+    def _build_chains(self, providers: Dict[str, Any]) -> List[List[str]]:
+        """Splits lanes into chains that can run concurrently.
+        Lanes whose providers share a lock_key (dpkg, rpm...) end up in the same chain and run in order."""
+        chains: Dict[str, List[str]] = {}
+        for name, provider in providers.items():
+            chains.setdefault(provider.lock_key, []).append(name)
+        return list(chains.values())
+
+    def _run_chain(self, lanes: List[tuple], progress: Progress) -> bool:
+        success = True
+        for provider, items, task in lanes:
+            if not self._install_group(provider, items, progress, task):
+                success = False
+            progress.update(task, description=f"[dim]{provider.name}: done[/dim]")
+        return success
+
+    def _group_by_provider(self, items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Groups plan items by provider, keeping the profile order inside each group."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            groups.setdefault(item['provider_name'], []).append(item)
+        return groups
+
+    def _install_group(self, provider, items: List[Dict[str, Any]], progress: Progress, task) -> bool:
+        """Installs a provider group as one transaction, falling back to per-package installs."""
+        if provider.supports_batch_install and len(items) > 1:
+            progress.update(task, description=f"Installing {len(items)} packages via {provider.name}...")
+            for item in items:
+                self._set_status(item, "running")
+            if self._install_batch(provider, items):
+                for item in items:
+                    console.print(f"[green]✔ Installed {item['name']}[/green]")
+                    self._set_status(item, "done")
+                    self._record_package(item['name'], provider.name)
+                    progress.advance(task)
+                return True
+            console.print(f"[yellow]Batch install via {provider.name} failed, retrying package by package...[/yellow]")
+
+        success = True
+        for item in items:
+            progress.update(task, description=f"Installing {item['name']} via {provider.name}...")
+            self._set_status(item, "running")
+            
+            if self._install_one(provider, item):
+                 console.print(f"[green]✔ Installed {item['name']}[/green]")
+                 self._set_status(item, "done")
+                 self._record_package(item['name'], provider.name)
+            else:
+                 console.print(f"[red]✘ Failed to install {item['name']}[/red]")
+                 self._set_status(item, "failed")
+                 success = False
+            
+            progress.advance(task)
+        
+        return success
+
+    def _install_batch(self, provider, items: List[Dict[str, Any]]) -> bool:
+        if items[0].get('artifacts') is not None:
+            return provider.install_local(
+                [item['target_pkg'] for item in items],
+                [path for item in items for path in item['artifacts']]
+            )
+        return provider.install_many([item['target_pkg'] for item in items])
+
+    def _install_one(self, provider, item: Dict[str, Any]) -> bool:
+        if item.get('artifacts') is not None:
+            return provider.install_local([item['target_pkg']], item['artifacts'])
+        return provider.install(item['target_pkg'])
+
+    def _set_status(self, item: Dict[str, Any], status: str):
+        """Tracks item progress on the plan and checkpoints it in the run journal."""
+        item['status'] = status
+        if self.run_id:
+            try:
+                self.journal.mark(self.run_id, item['id'], status)
+            except Exception:
+                pass
+
     def _record_package(self, name: str, manager: str):
         try:
             self.state.execute_query(
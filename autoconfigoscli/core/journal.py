@@ -0,0 +1,55 @@
+import json
+import hashlib
+import uuid
+from typing import Dict, Any, Optional
+from .state import StateManager
+
+class InstallJournal:
+    """Checkpoints install runs in state.db so an interrupted run can be resumed."""
+    def __init__(self, state: StateManager = None):
+        self.state = state or StateManager()
+
+    def start_run(self, profile_name: str, plan: Dict[str, Any]) -> str:
+        run_id = uuid.uuid4().hex[:12]
+        plan_json = json.dumps(plan, sort_keys=True)
+        with self.state.session() as conn:
+            conn.execute(
+                "INSERT INTO install_runs (run_id, profile_name, plan_hash, plan_json, status) VALUES (?, ?, ?, ?, 'running')",
+                (run_id, profile_name, self._hash(plan_json), plan_json)
+            )
+            conn.executemany(
+                "INSERT INTO install_journal (run_id, item_id, status) VALUES (?, ?, 'pending')",
+                [(run_id, item['id']) for item in plan['installable']]
+            )
+        return run_id
+
+    def mark(self, run_id: str, item_id: str, status: str):
+        self.state.execute_query(
+            "UPDATE install_journal SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE run_id = ? AND item_id = ?",
+            (status, run_id, item_id)
+        )
+
+    def finish_run(self, run_id: str, success: bool):
+        self.state.execute_query(
+            "UPDATE install_runs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE run_id = ?",
+            ("success" if success else "failed", run_id)
+        )
+
+    def load_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored run with its plan and per-item statuses, or None if unknown/corrupt."""
+        rows = self.state.execute_query("SELECT * FROM install_runs WHERE run_id = ?", (run_id,))
+        if not rows:
+            return None
+        run = dict(rows[0])
+        if self._hash(run['plan_json']) != run['plan_hash']:
+            return None
+
+        statuses = self.state.execute_query(
+            "SELECT item_id, status FROM install_journal WHERE run_id = ?", (run_id,)
+        )
+        run['plan'] = json.loads(run['plan_json'])
+        run['items'] = {row['item_id']: row['status'] for row in statuses}
+        return run
+
+    def _hash(self, plan_json: str) -> str:
+        return hashlib.sha256(plan_json.encode()).hexdigest()
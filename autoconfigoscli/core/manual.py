@@ -3,19 +3,17 @@ import subprocess
 from typing import List, Optional
 from rich.console import Console
 from rich.prompt import Confirm
-from .packages import ProviderManager
-from .catalog.loader import CatalogLoader
-from .catalog.resolver import PackageResolver
+from .registry import get_catalog, get_provider_manager, get_resolver
 from .context.history import HistoryManager
 
 console = Console()
 
 class ManualMode:
     def __init__(self):
-        self.provider_manager = ProviderManager()
-        self.loader = CatalogLoader()
+        self.provider_manager = get_provider_manager()
+        self.loader = get_catalog()
         self.history = HistoryManager()
-        self.resolver = PackageResolver(self.loader)
+        self.resolver = get_resolver()
 
     def run(self):
         if not self._check_fzf():
@@ -97,25 +95,30 @@ class ManualMode:
     def _install_selected(self, pkg_ids: List[str]):
         if not pkg_ids: return
         
-        for pkg_id in pkg_ids:
-             trans = self.resolver.resolve(pkg_id)
-             if not trans:
-                 console.print(f"[red]Could not resolve {pkg_id}[/red]")
-                 continue
-             
-             provider = self.provider_manager.get_provider(trans.provider)
-             if not provider:
-                 console.print(f"[red]Provider {trans.provider} not found for {pkg_id}[/red]")
-                 continue
+        try:
+            for pkg_id in pkg_ids:
+                 trans = self.resolver.resolve(pkg_id)
+                 if not trans:
+                     console.print(f"[red]Could not resolve {pkg_id}[/red]")
+                     continue
                  
-             console.print(f"Installing {pkg_id} via {provider.name}...")
-             success = provider.install(trans.package_name)
-             
-             self.history.record_action(
-                 action_type="install_package",
-                 actor="user",
-                 source="manual_mode",
-                 target=pkg_id,
-                 result="success" if success else "failed",
-                 details={"provider": provider.name}
-             )
+                 provider = self.provider_manager.get_provider(trans.provider)
+                 if not provider:
+                     console.print(f"[red]Provider {trans.provider} not found for {pkg_id}[/red]")
+                     continue
+                     
+                 provider.register_target(trans.package_name, trans)
+                 console.print(f"Installing {pkg_id} via {provider.name}...")
+                 success = provider.install(trans.package_name)
+                 
+                 self.history.record_action(
+                     action_type="install_package",
+                     actor="user",
+                     source="manual_mode",
+                     target=pkg_id,
+                     result="success" if success else "failed",
+                     details={"provider": provider.name}
+                 )
+        finally:
+            # One transaction for the whole selection
+            self.history.flush()
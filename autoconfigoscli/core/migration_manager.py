@@ -1,5 +1,6 @@
 import sqlite3
 import importlib.util
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 from rich.console import Console
@@ -7,6 +8,22 @@ from rich.console import Console
 MIGRATIONS_PATH = Path(__file__).parent.parent / "migrations"
 console = Console()
 
+@lru_cache(maxsize=None)
+def migration_files() -> tuple:
+    """(version, path) of every migration shipped with the package, scanned once per process."""
+    files = []
+    for mig_file in sorted(MIGRATIONS_PATH.glob("*.py")):
+        try:
+            # 001_initial.py -> 1
+            files.append((int(mig_file.name.split('_')[0]), mig_file))
+        except ValueError:
+            continue
+    return tuple(files)
+
+def latest_version() -> int:
+    files = migration_files()
+    return files[-1][0] if files else 0
+
 class MigrationManager:
     def __init__(self, db_connection: sqlite3.Connection):
         self.conn = db_connection
@@ -34,25 +51,24 @@ class MigrationManager:
 
     def set_version(self, version: int):
         self.conn.execute("UPDATE schema_version SET version = ?", (version,))
+        # Mirrored in the file header so StateManager.init_db() can check it without scanning migrations
+        self.conn.execute(f"PRAGMA user_version = {int(version)}")
         self.conn.commit()
 
     def run_migrations(self):
         """Discovers and runs pending migrations."""
         current_ver = self.get_current_version()
-        migration_files = sorted(MIGRATIONS_PATH.glob("*.py"))
-        
-        migrated = False
-        for mig_file in migration_files:
-            try:
-                # 001_initial.py -> 1
-                version_num = int(mig_file.name.split('_')[0])
-            except ValueError:
-                continue
 
+        migrated = False
+        for version_num, mig_file in migration_files():
             if version_num > current_ver:
                 self._apply_migration(mig_file, version_num)
                 migrated = True
 
+        if not migrated:
+            # Databases created before user_version was kept in sync
+            self.conn.execute(f"PRAGMA user_version = {int(current_ver)}")
+            self.conn.commit()
         return migrated
 
     def _apply_migration(self, mig_file: Path, version: int):
@@ -39,5 +39,15 @@ class OSInfo:
         return (f"OSInfo(system={self.system}, distro={self.distro_id}, "
                 f"version={self.distro_version}, arch={self.machine})")
 
+_os_info = None
+
 def get_os_info() -> OSInfo:
-    return OSInfo()
+    """The OSInfo of this process; detected once, see invalidate_os_info()."""
+    global _os_info
+    if _os_info is None:
+        _os_info = OSInfo()
+    return _os_info
+
+def invalidate_os_info():
+    global _os_info
+    _os_info = None
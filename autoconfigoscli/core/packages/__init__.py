@@ -1,66 +1,114 @@
+import importlib
+import inspect
 from typing import Dict, List, Optional
 from ..providers.base import PackageProvider
-from ..providers.apt import AptProvider
-from ..providers.brew import BrewProvider
-from ..providers.dnf import DnfProvider
-from ..providers.pacman import PacmanProvider
-from ..providers.flatpak import FlatpakProvider
-from ..providers.script import ScriptProvider
-from ..providers.winget import WingetProvider
 from ..os_detect import get_os_info
 
+# Built-in providers by name, as "module:Class" relative to autoconfigoscli.core.providers.
+# Modules are imported the first time a provider is asked for.
+BUILTIN_PROVIDERS = {
+    "apt": "apt:AptProvider",
+    "dnf": "dnf:DnfProvider",
+    "pacman": "pacman:PacmanProvider",
+    "brew": "brew:BrewProvider",
+    "winget": "winget:WingetProvider",
+    "flatpak": "flatpak:FlatpakProvider",
+    "script": "script:ScriptProvider",
+}
+
+# Native package managers; only the one detected as the system provider is ever used
+SYSTEM_PROVIDERS = {"apt", "dnf", "pacman", "brew", "winget"}
+
+# Extra providers (snap, nix, pipx...) shipped by other distributions:
+#   [project.entry-points."autoconfigoscli.providers"]
+#   snap = "mypkg.snap:SnapProvider"
+ENTRY_POINT_GROUP = "autoconfigoscli.providers"
+
 class ProviderManager:
+    """
+    Hands out package providers by name. Nothing is imported or probed up front:
+    a provider is built on its first lookup, and the system package manager is
+    detected the first time it is needed.
+    """
     def __init__(self):
         self.providers: Dict[str, PackageProvider] = {}
-        self.system_provider: Optional[PackageProvider] = None
-        self._detect_system_provider()
-        self._init_providers()
+        self._system_provider: Optional[PackageProvider] = None
+        self._system_detected = False
+        self._entry_points = None
 
-    def _detect_system_provider(self):
-        os_info = get_os_info()
-        
+    def _system_candidates(self) -> List[str]:
         # Priority Logic
-        potential_providers = []
+        os_info = get_os_info()
         if os_info.is_macos:
-            potential_providers = [BrewProvider()]
-        elif os_info.is_windows:
-            potential_providers = [WingetProvider()]
-        else:
-            potential_providers = [
-                AptProvider(),
-                DnfProvider(),
-                PacmanProvider(),
-                BrewProvider()
-            ]
+            return ["brew"]
+        if os_info.is_windows:
+            return ["winget"]
+        return ["apt", "dnf", "pacman", "brew"]
 
-        for p in potential_providers:
-            if p.is_available():
-                self.system_provider = p
-                self.providers[p.name] = p
-                # If we found a system provider on Linux (non-brew), we prioritize it.
-                # If it's brew on linux, it's also fine.
-                if p.name != "brew" or os_info.is_macos:
+    @property
+    def system_provider(self) -> Optional[PackageProvider]:
+        if not self._system_detected:
+            self._system_detected = True
+            for name in self._system_candidates():
+                provider = self._load(name)
+                if provider and provider.is_available():
+                    self._system_provider = provider
+                    self.providers[name] = provider
                     break
-
-    def _init_providers(self):
-        # Register extensions
-        # These might depend on system provider for bootstrapping
-        os_info = get_os_info()
-        if not os_info.is_windows:
-            flatpak = FlatpakProvider(system_provider=self.system_provider)
-            self.providers[flatpak.name] = flatpak
-
-        script = ScriptProvider()
-        self.providers[script.name] = script
-        
-        # Ensure common aliases or fallbacks?
-        # For now, just explicit names.
+        return self._system_provider
 
     def get_provider(self, name: str) -> Optional[PackageProvider]:
         if name == "common" or name == "system":
              # "common" usually maps to system provider
              return self.system_provider
-        return self.providers.get(name)
+        if name in self.providers:
+            return self.providers[name]
+
+        if name in SYSTEM_PROVIDERS:
+            system = self.system_provider
+            return system if system and system.name == name else None
+        if name == "flatpak" and get_os_info().is_windows:
+            return None
+
+        provider = self._load(name)
+        if provider:
+            self.providers[name] = provider
+        return provider
 
     def get_all_providers(self) -> List[PackageProvider]:
+        """Every provider usable here; unlike get_provider() this loads them all."""
+        self.system_provider
+        for name in list(BUILTIN_PROVIDERS) + list(self._plugin_entry_points()):
+            self.get_provider(name)
         return list(self.providers.values())
+
+    def _load(self, name: str) -> Optional[PackageProvider]:
+        """Imports and instantiates a built-in or plugin provider, or returns None if unknown."""
+        spec = BUILTIN_PROVIDERS.get(name)
+        try:
+            if spec:
+                module_name, class_name = spec.split(":")
+                cls = getattr(importlib.import_module(f"..providers.{module_name}", __package__), class_name)
+            elif name in self._plugin_entry_points():
+                cls = self._plugin_entry_points()[name].load()
+            else:
+                return None
+        except Exception:
+            return None
+
+        # Providers that bootstrap themselves (flatpak) receive the system package manager
+        if "system_provider" in inspect.signature(cls).parameters:
+            return cls(system_provider=self.system_provider)
+        return cls()
+
+    def _plugin_entry_points(self) -> Dict:
+        if self._entry_points is None:
+            self._entry_points = {}
+            try:
+                from importlib.metadata import entry_points
+                eps = entry_points()
+                group = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+                self._entry_points = {ep.name: ep for ep in group if ep.name not in BUILTIN_PROVIDERS}
+            except Exception:
+                pass
+        return self._entry_points
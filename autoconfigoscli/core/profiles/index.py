@@ -0,0 +1,120 @@
+import atexit
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+import yaml
+
+# libyaml's parser when PyYAML was built with it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+INDEX_PATH = os.path.expanduser("~/.autoconfigoscli/cache/profiles-index.json")
+# Bump when the entry layout changes
+INDEX_FORMAT = 1
+
+def parse_profile_file(path: str) -> Optional[Dict[str, Any]]:
+    """The profile YAML as a dict, or None if it can't be read or isn't a mapping."""
+    try:
+        with open(path, "rb") as f:
+            data = yaml.load(f, Loader=SafeLoader)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+class ProfileIndex:
+    """
+    Summary of every profile file seen (tier, tags, description, package count),
+    keyed by path and stored as JSON. A file is parsed again only when its mtime or
+    size changed and its sha256 no longer matches, so listing and scoring profiles
+    doesn't parse the YAML.
+    """
+    def __init__(self, index_path: str = None):
+        self.index_path = index_path or INDEX_PATH
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.index_path, "r") as f:
+                    data = json.load(f)
+                if data.get("format") == INDEX_FORMAT:
+                    self._entries = data["profiles"]
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+        return self._entries
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """The up-to-date entry for a profile file, or None if it's missing or invalid."""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._drop(path)
+            return None
+
+        entry = self.entries.get(path)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry
+
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            self._drop(path)
+            return None
+
+        if not entry or entry["sha256"] != digest:
+            data = parse_profile_file(path)
+            if data is None:
+                self._drop(path)
+                return None
+            entry = {
+                "sha256": digest,
+                "tier": data.get("tier", "mid"),
+                "tags": data.get("tags", []),
+                "description": data.get("description", ""),
+                "package_count": len(data.get("packages") or []),
+            }
+        entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        self.entries[path] = entry
+        self._mark_dirty()
+        return entry
+
+    def _drop(self, path: str):
+        if self.entries.pop(path, None) is not None:
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        # Written once at exit rather than after every changed file
+        if not self._dirty:
+            self._dirty = True
+            atexit.register(self.save)
+
+    def save(self):
+        """Writes the index if anything changed, forgetting files that no longer exist."""
+        if not self._dirty:
+            return
+        profiles = {path: entry for path, entry in self.entries.items() if os.path.exists(path)}
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"format": INDEX_FORMAT, "profiles": profiles}, f)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            atexit.unregister(self.save)
+        except OSError:
+            # A read-only home only costs the speed-up
+            pass
+
+_indexes: Dict[str, ProfileIndex] = {}
+
+def get_index(index_path: str = None) -> ProfileIndex:
+    """One ProfileIndex per index file for the whole process, so it's read and written once."""
+    index_path = index_path or INDEX_PATH
+    if index_path not in _indexes:
+        _indexes[index_path] = ProfileIndex(index_path)
+    return _indexes[index_path]
@@ -1,7 +1,7 @@
 from typing import Dict, List, Any, Optional
-import yaml
 import os
 from pathlib import Path
+from .index import get_index, parse_profile_file
 
 class Profile:
     def __init__(self, name: str, data: Dict[str, Any]):
@@ -15,8 +15,48 @@ class Profile:
         # New Schema: packages is a list of IDs
         self.packages: List[str] = data.get("packages", [])
 
+    @property
+    def package_count(self) -> int:
+        return len(self.packages or [])
+
+class LazyProfile(Profile):
+    """
+    A Profile built from its index entry. Name, tier, tags, description and the package
+    count are known without reading the file; the YAML is parsed on first access to
+    the packages, env vars or scripts.
+    """
+    def __init__(self, name: str, entry: Dict[str, Any], path: str):
+        self.name = name
+        self.description = entry["description"]
+        self.tier = entry["tier"]
+        self.tags = entry["tags"]
+        self._package_count = entry["package_count"]
+        self._path = path
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = parse_profile_file(self._path) or {}
+        return self._data
+
+    @property
+    def packages(self) -> List[str]:
+        return self._load().get("packages", [])
+
+    @property
+    def env_vars(self) -> Dict[str, Any]:
+        return self._load().get("env", {})
+
+    @property
+    def scripts(self) -> Dict[str, Any]:
+        return self._load().get("scripts", {})
+
+    @property
+    def package_count(self) -> int:
+        return self._package_count
+
 class ProfileLoader:
-    def __init__(self, profiles_dir: str = None):
+    def __init__(self, profiles_dir: str = None, index_path: str = None):
         if profiles_dir:
             self.profiles_dir = profiles_dir
         else:
@@ -25,6 +65,7 @@ class ProfileLoader:
                 "profiles"
             )
         
+        self.index = get_index(index_path)
         self.user_profiles_dir = os.path.expanduser("~/.autoconfigoscli/profiles/user")
         if not os.path.exists(self.user_profiles_dir):
             try:
@@ -59,14 +100,7 @@ class ProfileLoader:
             path = os.path.join(self.profiles_dir, f"{name}.yaml")
             source = "built-in"
             
-        if not os.path.exists(path):
-            return None
-        
-        try:
-            with open(path, 'r') as f:
-                data = yaml.safe_load(f)
-                p = Profile(name, data)
-                # We could add source metadata here if Profile class supported it
-                return p
-        except Exception:
+        entry = self.index.get(path)
+        if entry is None:
             return None
+        return LazyProfile(name, entry, path)
@@ -1,13 +1,24 @@
+import glob
+import hashlib
+import os
 import shutil
 import subprocess
-from typing import List
+import tempfile
+from typing import List, Optional, Set
 from .base import PackageProvider
 
 class AptProvider(PackageProvider):
+    supports_batch_install = True
+
     @property
     def name(self) -> str:
         return "apt"
 
+    @property
+    def lock_key(self) -> str:
+        # apt transactions take the dpkg frontend lock
+        return "dpkg"
+
     def is_available(self) -> bool:
         return shutil.which("apt-get") is not None
 
@@ -18,7 +29,21 @@ class AptProvider(PackageProvider):
         except subprocess.CalledProcessError:
             return False
 
+    def _list_installed(self) -> Optional[Set[str]]:
+        try:
+            res = self._run_cmd(["dpkg-query", "-W", "-f=${db:Status-Abbrev} ${Package}\n"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        # Only "ii" rows are installed; "rc" rows are removed packages with leftover config
+        return {
+            line.split()[-1] for line in res.stdout.splitlines()
+            if line.startswith("ii")
+        }
+
     def is_installed(self, package_name: str) -> bool:
+        snapshot = self.get_installed_snapshot()
+        if snapshot is not None:
+            return package_name in snapshot
         try:
             # dpkg -s returns 0 if installed
             res = self._run_cmd(["dpkg", "-s", package_name])
@@ -33,6 +58,100 @@ class AptProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
+
+    def install_many(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["apt-get", "install", "-y"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["apt-get", "install", "-y", "--download-only"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def download(self, package_names: List[str], dest_dir: str) -> Optional[List[str]]:
+        # Every package in the dependency closure, not just what this machine lacks:
+        # the air-gapped target may have none of them
+        os.makedirs(dest_dir, exist_ok=True)
+        try:
+            closure = self._dependency_closure(package_names)
+            self._run_cmd(["apt-get", "download"] + closure, cwd=dest_dir)
+        except subprocess.CalledProcessError:
+            return None
+        return sorted(glob.glob(os.path.join(dest_dir, "*.deb")))
+
+    def _dependency_closure(self, package_names: List[str]) -> List[str]:
+        res = self._run_cmd(
+            ["apt-cache", "depends", "--recurse", "--no-recommends", "--no-suggests",
+             "--no-conflicts", "--no-breaks", "--no-replaces", "--no-enhances"] + list(package_names)
+        )
+        # Package names start their line; dependency lines are indented and
+        # virtual packages (<name>) have nothing to download
+        closure = []
+        for line in res.stdout.splitlines():
+            name = line.strip()
+            if name and not line[0].isspace() and not name.startswith("<") and name not in closure:
+                closure.append(name)
+        return closure
+
+    def install_local(self, package_names: List[str], paths: List[str]) -> bool:
+        # The bundle holds the whole dependency closure, base packages included. Installing
+        # every .deb would downgrade anything the target has newer, so the debs are served
+        # as a throwaway local repository instead and only the requested names are installed:
+        # apt then picks versions itself and leaves newer installed packages alone.
+        try:
+            with tempfile.TemporaryDirectory(prefix="autoconfigoscli-apt-") as work:
+                options = self._local_repo_options(paths, work)
+                self._run_cmd(["apt-get", "update"] + options, sudo=True)
+                # The local repository is the only source, so nothing is fetched from the network
+                self._run_cmd(["apt-get", "install", "-y"] + options + list(package_names), sudo=True)
+            return True
+        except (subprocess.CalledProcessError, OSError):
+            return False
+        finally:
+            self.invalidate_snapshot()
+
+    def _local_repo_options(self, paths: List[str], work: str) -> List[str]:
+        """Writes a flat repository index over `paths` and returns apt options that use it as
+        the only source, with package lists kept in `work` so the system's lists stay untouched."""
+        paths = [os.path.abspath(p) for p in paths]
+        root = os.path.commonpath([os.path.dirname(p) for p in paths])
+        entries = []
+        for path in paths:
+            control = self._run_cmd(["dpkg-deb", "-f", path]).stdout.rstrip("\n")
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            entries.append(
+                f"{control}\nFilename: ./{os.path.relpath(path, root)}\n"
+                f"Size: {os.path.getsize(path)}\nSHA256: {digest}\n"
+            )
+        with open(os.path.join(root, "Packages"), "w") as f:
+            f.write("\n".join(entries))
+
+        source_list = os.path.join(work, "sources.list")
+        with open(source_list, "w") as f:
+            f.write(f"deb [trusted=yes] file:{root} ./\n")
+        lists = os.path.join(work, "lists")
+        os.makedirs(os.path.join(lists, "partial"))
+        return [
+            "-o", f"Dir::Etc::SourceList={source_list}",
+            "-o", "Dir::Etc::SourceParts=/dev/null",
+            "-o", f"Dir::State::Lists={lists}",
+            # Don't replace the system's package cache with one built from these lists
+            "-o", "Dir::Cache::pkgcache=", "-o", "Dir::Cache::srcpkgcache=",
+        ]
 
     def remove(self, package_name: str) -> bool:
         try:
@@ -40,3 +159,5 @@ class AptProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
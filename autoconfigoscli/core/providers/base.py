@@ -1,15 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Set
 import subprocess
 import shutil
+import threading
+
+# Serialises interactive prompts when providers install concurrently.
+PROMPT_LOCK = threading.RLock()
 
 class PackageProvider(ABC):
+    # Whether install_many() runs a single native transaction.
+    supports_batch_install: bool = False
+
+    # Installed package names, built once by get_installed_snapshot().
+    _installed_snapshot: Optional[Set[str]] = None
+
     @property
     @abstractmethod
     def name(self) -> str:
         """Name of the package manager (e.g., 'brew', 'apt')."""
         pass
 
+    @property
+    def lock_key(self) -> str:
+        """Resource this provider's installs hold. Providers sharing a key never run concurrently."""
+        return self.name
+
     @abstractmethod
     def is_available(self) -> bool:
         """Checks if the package manager is installed on the system."""
@@ -30,12 +45,50 @@ class PackageProvider(ABC):
         """Installs a package."""
         pass
 
+    def register_target(self, package_name: str, transformation) -> None:
+        """Receives the catalog Transformation a package name was resolved from, so providers
+        can use per-target metadata (pinned digests, probes). Most providers ignore it."""
+        pass
+
+    def _list_installed(self) -> Optional[Set[str]]:
+        """Lists every installed package in one call. None means the manager can't be listed."""
+        return None
+
+    def get_installed_snapshot(self) -> Optional[Set[str]]:
+        """Returns the cached set of installed packages, building it on first use."""
+        if self._installed_snapshot is None:
+            self._installed_snapshot = self._list_installed()
+        return self._installed_snapshot
+
+    def invalidate_snapshot(self):
+        """Drops the installed snapshot. Called after anything that installs or removes."""
+        self._installed_snapshot = None
+
+    def install_many(self, package_names: List[str]) -> bool:
+        """Installs several packages, in one transaction where the manager supports it."""
+        results = [self.install(name) for name in package_names]
+        return all(results)
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        """Downloads package archives into the manager's cache without installing them.
+        Providers with nothing to download up front keep this no-op."""
+        return True
+
+    def download(self, package_names: List[str], dest_dir: str) -> Optional[List[str]]:
+        """Downloads installable artifacts (with dependencies when the manager resolves them)
+        into dest_dir and returns their paths. None means this provider can't bundle."""
+        return None
+
+    def install_local(self, package_names: List[str], paths: List[str]) -> bool:
+        """Installs package_names from artifacts previously produced by download(), without network access."""
+        return False
+
     @abstractmethod
     def remove(self, package_name: str) -> bool:
         """Removes a package."""
         pass
 
-    def _run_cmd(self, cmd: List[str], sudo: bool = False) -> subprocess.CompletedProcess:
+    def _run_cmd(self, cmd: List[str], sudo: bool = False, cwd: str = None) -> subprocess.CompletedProcess:
         """Helper to run commands safely."""
         if sudo:
             # Check if we are already root to avoid redundant sudo
@@ -43,7 +96,7 @@ class PackageProvider(ABC):
             cmd = ["sudo"] + cmd
         
         try:
-            return subprocess.run(cmd, capture_output=True, text=True, check=True)
+            return subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=cwd)
         except subprocess.CalledProcessError as e:
             # Log error separately if needed
             raise e
@@ -1,9 +1,11 @@
 import shutil
 import subprocess
-from typing import List
+from typing import List, Optional, Set
 from .base import PackageProvider
 
 class BrewProvider(PackageProvider):
+    supports_batch_install = True
+
     @property
     def name(self) -> str:
         return "brew"
@@ -18,7 +20,18 @@ class BrewProvider(PackageProvider):
         except subprocess.CalledProcessError:
             return False
 
+    def _list_installed(self) -> Optional[Set[str]]:
+        try:
+            res = self._run_cmd(["brew", "list", "-1"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        # Formulae and casks, one per line
+        return set(res.stdout.split())
+
     def is_installed(self, package_name: str) -> bool:
+        snapshot = self.get_installed_snapshot()
+        if snapshot is not None:
+            return package_name.split("/")[-1] in snapshot
         try:
             # brew list --formula shows installed formulae
             # Check if package is in the output of brew list
@@ -33,6 +46,28 @@ class BrewProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
+
+    def install_many(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["brew", "install"] + list(package_names))
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["brew", "fetch"] + list(package_names))
+            return True
+        except subprocess.CalledProcessError:
+            return False
 
     def remove(self, package_name: str) -> bool:
         try:
@@ -40,3 +75,5 @@ class BrewProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
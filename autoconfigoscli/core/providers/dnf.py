@@ -1,13 +1,22 @@
+import glob
+import os
 import shutil
 import subprocess
-from typing import List
+from typing import List, Optional, Set
 from .base import PackageProvider
 
 class DnfProvider(PackageProvider):
+    supports_batch_install = True
+
     @property
     def name(self) -> str:
         return "dnf"
 
+    @property
+    def lock_key(self) -> str:
+        # dnf transactions take the rpm database lock
+        return "rpm"
+
     def is_available(self) -> bool:
         return shutil.which("dnf") is not None
 
@@ -21,7 +30,17 @@ class DnfProvider(PackageProvider):
         except subprocess.CalledProcessError:
             return False
 
+    def _list_installed(self) -> Optional[Set[str]]:
+        try:
+            res = self._run_cmd(["rpm", "-qa", "--qf", "%{NAME}\n"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        return set(res.stdout.split())
+
     def is_installed(self, package_name: str) -> bool:
+        snapshot = self.get_installed_snapshot()
+        if snapshot is not None:
+            return package_name in snapshot
         try:
             res = self._run_cmd(["dnf", "list", "installed", package_name])
             return res.returncode == 0
@@ -34,6 +53,45 @@ class DnfProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
+
+    def install_many(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["dnf", "install", "-y"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["dnf", "install", "-y", "--downloadonly"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def download(self, package_names: List[str], dest_dir: str) -> Optional[List[str]]:
+        try:
+            # --alldeps: also the dependencies already installed here, which the target may lack
+            self._run_cmd(["dnf", "download", "--resolve", "--alldeps", "--destdir", dest_dir] + list(package_names))
+        except subprocess.CalledProcessError:
+            return None
+        return sorted(glob.glob(os.path.join(dest_dir, "*.rpm")))
+
+    def install_local(self, package_names: List[str], paths: List[str]) -> bool:
+        try:
+            self._run_cmd(["dnf", "install", "-y", "--disablerepo=*"] + [os.path.abspath(p) for p in paths], sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
 
     def remove(self, package_name: str) -> bool:
         try:
@@ -41,3 +99,5 @@ class DnfProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
@@ -1,12 +1,17 @@
+import os
 import shutil
 import subprocess
-from typing import List, Optional
+from typing import List, Optional, Set
 from rich.console import Console
 from rich.prompt import Confirm
-from .base import PackageProvider
+from .base import PackageProvider, PROMPT_LOCK
 
 console = Console()
 
+SYSTEM_REPO = "/var/lib/flatpak/repo"
+# Runtime bundles are named after their ref, "/" -> "+": org.freedesktop.Platform+x86_64+23.08.runtime.flatpak
+RUNTIME_BUNDLE_SUFFIX = ".runtime.flatpak"
+
 class FlatpakProvider(PackageProvider):
     def __init__(self, system_provider: Optional[PackageProvider] = None):
         self.system_provider = system_provider
@@ -15,6 +20,13 @@ class FlatpakProvider(PackageProvider):
     def name(self) -> str:
         return "flatpak"
 
+    @property
+    def lock_key(self) -> str:
+        # A missing flatpak gets bootstrapped through the system package manager
+        if not self.is_available() and self.system_provider:
+            return self.system_provider.lock_key
+        return self.name
+
     def is_available(self) -> bool:
         return shutil.which("flatpak") is not None
 
@@ -27,9 +39,10 @@ class FlatpakProvider(PackageProvider):
             console.print("[red]Cannot bootstrap flatpak: No system provider available.[/red]")
             return False
 
-        console.print("[yellow]Flatpak is missing.[/yellow]")
-        if not Confirm.ask("Do you want to install flatpak via system packages?"):
-            return False
+        with PROMPT_LOCK:
+            console.print("[yellow]Flatpak is missing.[/yellow]")
+            if not Confirm.ask("Do you want to install flatpak via system packages?"):
+                return False
 
         console.print(f"Installing flatpak using {self.system_provider.name}...")
         if not self.system_provider.install("flatpak"):
@@ -51,9 +64,10 @@ class FlatpakProvider(PackageProvider):
             if "flathub" in res.stdout:
                 return True
                 
-            console.print("[yellow]Flathub remote missing.[/yellow]")
-            if not Confirm.ask("Add flathub remote?"):
-                return False
+            with PROMPT_LOCK:
+                console.print("[yellow]Flathub remote missing.[/yellow]")
+                if not Confirm.ask("Add flathub remote?"):
+                    return False
                 
             # flatpak remote-add --if-not-exists flathub https://dl.flathub.org/repo/flathub.flatpakrepo
             self._run_cmd(
@@ -74,8 +88,19 @@ class FlatpakProvider(PackageProvider):
         except subprocess.CalledProcessError:
             return False
 
+    def _list_installed(self) -> Optional[Set[str]]:
+        if not self.is_available(): return None
+        try:
+            res = self._run_cmd(["flatpak", "list", "--columns=application"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        return set(res.stdout.split())
+
     def is_installed(self, package_name: str) -> bool:
         if not self.is_available(): return False
+        snapshot = self.get_installed_snapshot()
+        if snapshot is not None:
+            return package_name in snapshot
         try:
             # flatpak list --app --columns=application
             res = self._run_cmd(["flatpak", "list", "--app", "--columns=application"])
@@ -94,6 +119,82 @@ class FlatpakProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        # Nothing to pull yet if flatpak still has to be bootstrapped
+        if not package_names or not self.is_available():
+            return True
+        try:
+            # --no-deploy pulls into the local repo; the install later deploys from it
+            self._run_cmd(["flatpak", "install", "flathub", "-y", "--no-deploy"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def download(self, package_names: List[str], dest_dir: str) -> Optional[List[str]]:
+        if not self.is_available():
+            return None
+        paths = []
+        try:
+            for app_id in package_names:
+                # Pull into the system repo, then export single-file bundles from it: one for
+                # the app and one for its runtime, which an app bundle doesn't carry
+                runtime = self._runtime_ref(app_id)
+                if runtime is None:
+                    return None
+                self._run_cmd(["flatpak", "install", "flathub", "-y", "--no-deploy", app_id], sudo=True)
+                if not self._is_ref_installed(runtime):
+                    self._run_cmd(["flatpak", "install", "flathub", "-y", "--no-deploy", runtime], sudo=True)
+
+                name, arch, branch = runtime.split("/")
+                path = os.path.join(dest_dir, runtime.replace("/", "+") + RUNTIME_BUNDLE_SUFFIX)
+                self._run_cmd(["flatpak", "build-bundle", "--runtime", f"--arch={arch}", SYSTEM_REPO, path, name, branch])
+                paths.append(path)
+                path = os.path.join(dest_dir, f"{app_id}.flatpak")
+                self._run_cmd(["flatpak", "build-bundle", SYSTEM_REPO, path, app_id, "stable"])
+                paths.append(path)
+        except subprocess.CalledProcessError:
+            return None
+        return paths
+
+    def _runtime_ref(self, app_id: str) -> Optional[str]:
+        """The runtime an app runs on, as name/arch/branch, or None if flathub doesn't say."""
+        res = self._run_cmd(["flatpak", "remote-info", "flathub", app_id])
+        for line in res.stdout.splitlines():
+            key, _, value = line.strip().partition(":")
+            if key == "Runtime" and value.strip().count("/") == 2:
+                return value.strip()
+        return None
+
+    def _is_ref_installed(self, ref: str) -> bool:
+        try:
+            self._run_cmd(["flatpak", "info", ref])
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def install_local(self, package_names: List[str], paths: List[str]) -> bool:
+        if not self.is_available():
+            if not self.bootstrap():
+                return False
+        runtimes = sorted({p for p in paths if p.endswith(RUNTIME_BUNDLE_SUFFIX)})
+        apps = [p for p in paths if not p.endswith(RUNTIME_BUNDLE_SUFFIX)]
+        try:
+            # Runtimes first so the apps install without contacting their remote; a runtime the
+            # target already has is kept as is. --bundle takes one file per call.
+            for path in runtimes:
+                ref = os.path.basename(path)[:-len(RUNTIME_BUNDLE_SUFFIX)].replace("+", "/")
+                if not self._is_ref_installed(ref):
+                    self._run_cmd(["flatpak", "install", "-y", "--bundle", os.path.abspath(path)], sudo=True)
+            for path in apps:
+                self._run_cmd(["flatpak", "install", "-y", "--bundle", os.path.abspath(path)], sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
 
     def remove(self, package_name: str) -> bool:
         try:
@@ -101,3 +202,5 @@ class FlatpakProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
@@ -1,9 +1,13 @@
+import glob
+import os
 import shutil
 import subprocess
-from typing import List
+from typing import List, Optional, Set
 from .base import PackageProvider
 
 class PacmanProvider(PackageProvider):
+    supports_batch_install = True
+
     @property
     def name(self) -> str:
         return "pacman"
@@ -19,7 +23,17 @@ class PacmanProvider(PackageProvider):
         except subprocess.CalledProcessError:
             return False
 
+    def _list_installed(self) -> Optional[Set[str]]:
+        try:
+            res = self._run_cmd(["pacman", "-Qq"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        return set(res.stdout.split())
+
     def is_installed(self, package_name: str) -> bool:
+        snapshot = self.get_installed_snapshot()
+        if snapshot is not None:
+            return package_name in snapshot
         try:
             # -Qi checks if installed
             res = self._run_cmd(["pacman", "-Qi", package_name])
@@ -34,6 +48,58 @@ class PacmanProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
+
+    def install_many(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["pacman", "-S", "--noconfirm"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        if not package_names:
+            return True
+        try:
+            self._run_cmd(["pacman", "-Sw", "--noconfirm"] + list(package_names), sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def download(self, package_names: List[str], dest_dir: str) -> Optional[List[str]]:
+        # -Sw skips dependencies this machine already has; the air-gapped target may have
+        # none of them, so every package in the closure is named explicitly
+        try:
+            closure = self._dependency_closure(package_names)
+            self._run_cmd(["pacman", "-Sw", "--noconfirm", "--cachedir", dest_dir] + closure, sudo=True)
+        except (subprocess.CalledProcessError, OSError):
+            # OSError: pactree (pacman-contrib) isn't installed
+            return None
+        return sorted(glob.glob(os.path.join(dest_dir, "*.pkg.tar.*")))
+
+    def _dependency_closure(self, package_names: List[str]) -> List[str]:
+        closure = []
+        for package_name in package_names:
+            # -s: sync databases, -l: one name per line, -u: each package once
+            res = self._run_cmd(["pactree", "-s", "-l", "-u", package_name])
+            for name in res.stdout.split():
+                if name not in closure:
+                    closure.append(name)
+        return closure
+
+    def install_local(self, package_names: List[str], paths: List[str]) -> bool:
+        try:
+            self._run_cmd(["pacman", "-U", "--noconfirm"] + [os.path.abspath(p) for p in paths], sudo=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+        finally:
+            self.invalidate_snapshot()
 
     def remove(self, package_name: str) -> bool:
         try:
@@ -42,3 +108,5 @@ class PacmanProvider(PackageProvider):
             return True
         except subprocess.CalledProcessError:
             return False
+        finally:
+            self.invalidate_snapshot()
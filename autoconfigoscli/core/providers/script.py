@@ -1,15 +1,51 @@
+import hashlib
 import subprocess
 import os
+import re
 import shlex
 import shutil
-import requests
+from typing import Dict, List, Optional, Set, Tuple
 from rich.console import Console
 from rich.prompt import Confirm
-from .base import PackageProvider
+from .base import PackageProvider, PROMPT_LOCK
+from .script_cache import ScriptCache
+from ..catalog.models import InstallCheck
 
 console = Console()
 
+# "curl -fsSL https://host/install.sh | sh -s -- -y" -> URL + the interpreter it is piped into.
+# Only a trailing shell/python interpreter counts; anything chained after it stays a plain command.
+REMOTE_SCRIPT_RE = re.compile(
+    r"^\s*(?:curl|wget)\b[^|]*?(https?://[^\s'\"|]+)[^|]*\|\s*((?:sh|bash|zsh|python3?)\b[^|&;]*?)\s*$"
+)
+
+# Where script installers usually drop binaries; often not on PATH until a new login shell
+USER_BIN_DIRS = [
+    os.path.expanduser("~/.local/bin"),
+    os.path.expanduser("~/.cargo/bin"),
+    os.path.expanduser("~/.local/share/pnpm"),
+]
+
+def parse_remote_script(command: str) -> Optional[Tuple[str, str]]:
+    """Splits a piped download command into (url, interpreter). None for anything else."""
+    if command.startswith("http"):
+        return command.strip(), "sh"
+    match = REMOTE_SCRIPT_RE.match(command)
+    if not match:
+        return None
+    return match.group(1), match.group(2)
+
+def _sha256_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
 class ScriptProvider(PackageProvider):
+    def __init__(self, cache: ScriptCache = None):
+        self.cache = cache or ScriptCache()
+        # Pinned payload digests and installed-state probes by catalog command, see register_target()
+        self.pins: Dict[str, str] = {}
+        self.checks: Dict[str, InstallCheck] = {}
+
     @property
     def name(self) -> str:
         return "script"
@@ -20,51 +56,145 @@ class ScriptProvider(PackageProvider):
     def update_indexes(self) -> bool:
         return True
 
+    def _search_path(self) -> List[str]:
+        dirs = os.environ.get("PATH", "").split(os.pathsep) + USER_BIN_DIRS
+        return [d for d in dict.fromkeys(dirs) if d]
+
+    def _list_installed(self) -> Optional[Set[str]]:
+        """Names of every executable on PATH and in the user bin dirs: one listdir per directory,
+        shared by all binary probes of a plan."""
+        names = set()
+        for directory in self._search_path():
+            try:
+                with os.scandir(directory) as entries:
+                    names.update(entry.name for entry in entries)
+            except OSError:
+                continue
+        return names
+
     def is_installed(self, package_name: str) -> bool:
-        # Scripts are hard to check if installed unless we track them manually.
-        # For this purpose, we assume 'False' to allow re-running, or we check state?
-        # The Installer logic checks state in DB. So we can return False and let Installer manage DB.
-        # Or, usually scripts install a binary. The "package_name" in profile could be "url|binary_check"
+        # Without a catalog probe there is no way to tell, so the script is offered again
+        check = self.checks.get(package_name)
+        if not check:
+            return False
+
+        if check.binary:
+            return check.binary in self.get_installed_snapshot()
+        if check.path:
+            return os.path.exists(os.path.expanduser(check.path))
+        if check.version_cmd:
+            try:
+                res = subprocess.run(check.version_cmd, capture_output=True, timeout=10, env=self._env())
+                return res.returncode == 0
+            except (OSError, subprocess.TimeoutExpired):
+                return False
         return False
 
+    def _env(self) -> Dict[str, str]:
+        """Environment for scripts and probes, with the user bin dirs on PATH so that freshly
+        installed toolchains (cargo after rustup, for example) are usable straight away."""
+        env = dict(os.environ)
+        env["PATH"] = os.pathsep.join(self._search_path())
+        return env
+
+    def _confirm(self, source: str) -> bool:
+        with PROMPT_LOCK:
+            console.print(f"[bold red]SECURITY WARNING:[/bold red] You are about to run a remote script.")
+            console.print(f"Source: {source}")
+            
+            if not Confirm.ask("Do you trust this source and want to execute it?"):
+                console.print("[red]Aborted.[/red]")
+                return False
+        return True
+
+    def register_target(self, package_name: str, transformation) -> None:
+        if transformation.sha256:
+            self.pins[package_name] = transformation.sha256
+        if transformation.check:
+            self.checks[package_name] = transformation.check
+
     def install(self, package_name: str) -> bool:
         """
-        Expects package_name to be a URL or a shell command.
+        Expects package_name to be a URL, a piped download command or a shell command.
+        Remote payloads run from the local script cache.
         Security: Must prompt user.
         """
-        console.print(f"[bold red]SECURITY WARNING:[/bold red] You are about to run a remote script.")
-        console.print(f"Source: {package_name}")
-        
-        if not Confirm.ask("Do you trust this source and want to execute it?"):
-            console.print("[red]Aborted.[/red]")
+        if not self._confirm(package_name):
+            return False
+
+        parsed = parse_remote_script(package_name)
+        if not parsed:
+            try:
+                subprocess.run(package_name, shell=True, check=True, env=self._env())
+                return True
+            except subprocess.CalledProcessError as e:
+                console.print(f"[red]Script execution failed: {e}[/red]")
+                return False
+            finally:
+                self.invalidate_snapshot()
+
+        if os.name == "nt":
+            console.print("[red]Remote POSIX shell scripts are not supported on Windows.[/red]")
+            return False
+        url, _ = parsed
+        path = self.cache.fetch(url, self.pins.get(package_name))
+        if not path:
             return False
+        return self._run_script(package_name, path)
 
+    def _run_script(self, command: str, path: str) -> bool:
+        """Runs a local payload through the interpreter its catalog command pipes into."""
+        interpreter = shlex.split(parse_remote_script(command)[1])
+        if not shutil.which(interpreter[0], path=self._env()["PATH"]):
+            console.print(f"[red]{interpreter[0]} is required to run this script.[/red]")
+            return False
         try:
-            # Check if it's a URL
-            if package_name.startswith("http"):
-                 if os.name == "nt":
-                     console.print("[red]Remote POSIX shell scripts are not supported on Windows.[/red]")
-                     return False
-                 # Download and inspect?
-                 # Professional: Ask to review?
-                 # For CLI speed, we stream to sh? That's dangerous.
-                 # We will run it, but we warned the user.
-                 
-                 # curl -fsSL url | sh
-                 shell = shutil.which("sh")
-                 curl = shutil.which("curl")
-                 if not shell or not curl:
-                     console.print("[red]curl and sh are required to run remote scripts.[/red]")
-                     return False
-                 cmd = f"{shlex.quote(curl)} -fsSL {shlex.quote(package_name)} | {shlex.quote(shell)}"
-            else:
-                 cmd = package_name
-
-            subprocess.run(cmd, shell=True, check=True)
+            with open(path, "rb") as script:
+                subprocess.run(interpreter, stdin=script, check=True, env=self._env())
             return True
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             console.print(f"[red]Script execution failed: {e}[/red]")
             return False
+        finally:
+            self.invalidate_snapshot()
+
+    def prefetch(self, package_names: List[str]) -> bool:
+        """Warms the script cache so the install phase runs without network access."""
+        success = True
+        for command in package_names:
+            parsed = parse_remote_script(command)
+            if parsed and not self.cache.fetch(parsed[0], self.pins.get(command)):
+                success = False
+        return success
+
+    def download(self, package_names: List[str], dest_dir: str) -> Optional[List[str]]:
+        """Copies cached payloads of piped remote scripts. Plain commands (cargo, npm, pip...) can't be bundled."""
+        paths = []
+        for index, command in enumerate(package_names):
+            parsed = parse_remote_script(command)
+            if not parsed:
+                return None
+            cached = self.cache.fetch(parsed[0], self.pins.get(command))
+            if not cached:
+                return None
+            path = os.path.join(dest_dir, f"script-{index}.sh")
+            shutil.copyfile(cached, path)
+            paths.append(path)
+        return paths
+
+    def install_local(self, package_names: List[str], paths: List[str]) -> bool:
+        for command, path in zip(package_names, paths):
+            if not parse_remote_script(command):
+                return False
+            pin = self.pins.get(command)
+            if pin and _sha256_file(path) != pin:
+                console.print(f"[red]Checksum mismatch for bundled {command}: expected {pin}.[/red]")
+                return False
+            if not self._confirm(f"{command} (bundled copy: {path})"):
+                return False
+            if not self._run_script(command, path):
+                return False
+        return True
 
     def remove(self, package_name: str) -> bool:
         console.print("[yellow]Cannot automatically remove script-installed software.[/yellow]")
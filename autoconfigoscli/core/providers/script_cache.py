@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+import requests
+from rich.console import Console
+
+console = Console()
+
+CACHE_DIR = os.path.expanduser("~/.autoconfigoscli/cache/scripts")
+
+# Cached payloads younger than this are used without asking the server again
+DEFAULT_MAX_AGE = 24 * 3600
+
+class ScriptCache:
+    """
+    Content-addressed store for remote install scripts.
+    Payloads live at <cache_dir>/<sha256>; index.json maps each URL to its digest
+    and the ETag/Last-Modified validators used to revalidate it.
+    """
+    def __init__(self, cache_dir: str = None, max_age: int = DEFAULT_MAX_AGE):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, sha256: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the local path of the script behind url, downloading it only when needed.
+        A pinned sha256 that is already cached never touches the network; a download
+        that doesn't match the pin is rejected.
+        """
+        with self._lock:
+            if sha256 and os.path.exists(self._blob_path(sha256)):
+                return self._blob_path(sha256)
+
+            index = self._load_index()
+            entry = index.get(url)
+            cached = entry and os.path.exists(self._blob_path(entry['sha256']))
+
+            if cached and not sha256 and time.time() - entry.get('checked_at', 0) < self.max_age:
+                return self._blob_path(entry['sha256'])
+
+            # A pinned fetch reaching this point needs the pinned bytes, which the cached
+            # entry doesn't hold: never let a 304 stand in for them
+            headers = {}
+            if cached and not sha256:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+
+            try:
+                res = requests.get(url, headers=headers, timeout=60)
+                if res.status_code == 304 and cached:
+                    digest = entry['sha256']
+                    content = None
+                else:
+                    res.raise_for_status()
+                    content = res.content
+                    digest = hashlib.sha256(content).hexdigest()
+            except requests.RequestException as e:
+                if cached and not sha256:
+                    console.print(f"[yellow]Could not revalidate {url} ({e}); using cached copy.[/yellow]")
+                    return self._blob_path(entry['sha256'])
+                console.print(f"[red]Failed to download {url}: {e}[/red]")
+                return None
+
+            if sha256 and digest != sha256:
+                console.print(f"[red]Checksum mismatch for {url}: expected {sha256}, got {digest}.[/red]")
+                return None
+            if content is not None:
+                self._write_blob(digest, content)
+
+            index[url] = {
+                "sha256": digest,
+                "etag": res.headers.get("ETag") or (entry or {}).get("etag"),
+                "last_modified": res.headers.get("Last-Modified") or (entry or {}).get("last_modified"),
+                "checked_at": time.time()
+            }
+            self._save_index(index)
+            return self._blob_path(digest)
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, sha256)
+
+    def _write_blob(self, sha256: str, content: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._blob_path(sha256) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, self._blob_path(sha256))
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self, index: Dict[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
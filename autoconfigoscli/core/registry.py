@@ -0,0 +1,49 @@
+"""
+Process-wide shared context objects.
+Building the catalog, the resolver and the provider manager means parsing packages.yaml,
+reading /etc/os-release and probing package managers, so each is built once per process
+and handed out to every command that needs it. invalidate() drops them, e.g. after the
+catalog or the set of installed package managers changes.
+"""
+import threading
+from typing import Any, Callable, Dict
+
+from .os_detect import invalidate_os_info
+from .catalog.loader import CatalogLoader
+from .catalog.resolver import PackageResolver
+
+_instances: Dict[str, Any] = {}
+_lock = threading.RLock()
+
+def _shared(key: str, factory: Callable[[], Any]) -> Any:
+    with _lock:
+        if key not in _instances:
+            _instances[key] = factory()
+        return _instances[key]
+
+def get_catalog() -> CatalogLoader:
+    return _shared("catalog", CatalogLoader)
+
+def get_resolver() -> PackageResolver:
+    return _shared("resolver", lambda: PackageResolver(get_catalog()))
+
+def get_provider_manager():
+    # Imported lazily: the providers pull in subprocess-heavy modules most commands never touch
+    from .packages import ProviderManager
+    return _shared("providers", ProviderManager)
+
+# What has to be rebuilt when a shared object goes away
+_DEPENDENTS = {"os": ("resolver", "providers"), "catalog": ("resolver",)}
+
+def invalidate(*keys: str):
+    """Drops the given shared objects ("os", "catalog", "resolver", "providers") and whatever
+    was built from them, or everything when called without arguments."""
+    keys = set(keys or ("os", "catalog", "resolver", "providers"))
+    for key in list(keys):
+        keys.update(_DEPENDENTS.get(key, ()))
+    with _lock:
+        for key in keys:
+            if key == "os":
+                invalidate_os_info()
+            else:
+                _instances.pop(key, None)
@@ -0,0 +1,97 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Any
+from rich.console import Console
+from rich.table import Table
+
+from .state import StateManager
+from .context.history import get_sink
+
+console = Console()
+
+@dataclass
+class RetentionPolicy:
+    """What `state compact` keeps."""
+    keep_audits: int = 30       # newest audits kept as-is; older ones are downsampled to one per day
+    history_days: int = 365     # decision_history and finished install runs older than this are dropped
+    vacuum: bool = False        # full VACUUM; also switches databases created before auto-vacuum to incremental
+
+class RetentionManager:
+    """Applies a RetentionPolicy to state.db."""
+    def __init__(self, state: StateManager = None):
+        self.state = state or StateManager()
+
+    def compact(self, policy: RetentionPolicy = None) -> Dict[str, Any]:
+        """Deletes rows outside the policy and reports per-table counts, sizes and timing."""
+        policy = policy or RetentionPolicy()
+        self.state.init_db()
+        # Buffered history must land before old rows are pruned
+        get_sink(self.state).flush()
+
+        started = time.monotonic()
+        size_before = self._db_size()
+        cutoff = f"-{int(policy.history_days)} days"
+        deleted = {}
+
+        with self.state.session() as conn:
+            deleted["system_audits"] = conn.execute("""
+                DELETE FROM system_audits
+                WHERE id NOT IN (SELECT id FROM system_audits ORDER BY timestamp DESC, id DESC LIMIT ?)
+                  AND id NOT IN (SELECT MAX(id) FROM system_audits GROUP BY date(timestamp))
+            """, (int(policy.keep_audits),)).rowcount
+
+            deleted["decision_history"] = conn.execute(
+                "DELETE FROM decision_history WHERE timestamp < datetime('now', ?)", (cutoff,)
+            ).rowcount
+
+            # Interrupted runs stay resumable whatever their age
+            old_runs = "SELECT run_id FROM install_runs WHERE status != 'running' AND updated_at < datetime('now', ?)"
+            deleted["install_journal"] = conn.execute(
+                f"DELETE FROM install_journal WHERE run_id IN ({old_runs})", (cutoff,)
+            ).rowcount
+            deleted["install_runs"] = conn.execute(
+                "DELETE FROM install_runs WHERE status != 'running' AND updated_at < datetime('now', ?)", (cutoff,)
+            ).rowcount
+
+        conn = self.state.get_connection()
+        self._vacuum(conn, full=policy.vacuum)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        return {
+            "deleted": deleted,
+            "size_before": size_before,
+            "size_after": self._db_size(),
+            "seconds": time.monotonic() - started
+        }
+
+    def _vacuum(self, conn, full: bool = False):
+        # auto_vacuum: 0 = none, 1 = full, 2 = incremental
+        if full:
+            # Older databases only switch mode with a full VACUUM; later compactions are incremental
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        elif conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            # execute() would step it once and free a single page; executescript() runs it to completion
+            conn.executescript("PRAGMA incremental_vacuum")
+
+    def _db_size(self) -> int:
+        total = 0
+        for suffix in ("", "-wal"):
+            try:
+                total += os.path.getsize(self.state.db_path + suffix)
+            except OSError:
+                pass
+        return total
+
+    def print_report(self, report: Dict[str, Any]):
+        table = Table(title="State Compaction")
+        table.add_column("Table")
+        table.add_column("Rows Removed", justify="right")
+        for name, count in report["deleted"].items():
+            table.add_row(name, str(count))
+        console.print(table)
+
+        before, after = report["size_before"], report["size_after"]
+        console.print(f"Size: {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB "
+                      f"({(before - after) / 1024:.1f} KiB reclaimed) in {report['seconds']:.2f}s")
@@ -1,8 +1,87 @@
+import atexit
+import gzip
+import shutil
 import sqlite3
 import os
-from .migration_manager import MigrationManager
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+from .migration_manager import MigrationManager, latest_version
 
 DB_PATH = os.path.expanduser("~/.autoconfigoscli/state.db")
+BACKUP_DIR = os.path.expanduser("~/.autoconfigoscli/backups/db")
+
+# Compressed backups kept by create_backup(); older ones are rotated out
+BACKUP_KEEP = 10
+# Pages copied per backup step; other connections can write between steps
+BACKUP_PAGES = 256
+
+# Prepared statements kept per connection; history/journal writes reuse a handful of queries
+STATEMENT_CACHE_SIZE = 256
+
+# One connection per (thread, db_path), shared by every StateManager in the process
+_local = threading.local()
+_all_connections = []
+_registry_lock = threading.Lock()
+
+# Database paths whose schema is known to be current for the rest of the process
+_migrated_paths = set()
+_migration_lock = threading.Lock()
+
+def _thread_connections() -> dict:
+    if not hasattr(_local, "connections"):
+        _local.connections = {}
+        _local.sessions = {}
+    return _local.connections
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so atexit can close it; each connection is used by its own thread
+    conn = sqlite3.connect(db_path, timeout=30, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # Only takes effect on a new, empty database (before WAL writes the header);
+    # `state compact` then gives freed pages back after each prune
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # WAL lets readers run alongside a writer and makes commits a single append + fsync.
+    # SQLite refuses WAL on some network filesystems; the default rollback journal is kept then.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _registry_lock:
+        _all_connections.append(conn)
+    return conn
+
+def close_thread_connections():
+    """
+    Closes the calling thread's connections. Pool workers call it when their task ends,
+    so threads that come and go don't keep connections open until exit.
+    """
+    connections = _thread_connections()
+    with _registry_lock:
+        for conn in connections.values():
+            if conn in _all_connections:
+                _all_connections.remove(conn)
+    for conn in connections.values():
+        try:
+            conn.close()
+        except Exception:
+            pass
+    connections.clear()
+    _local.sessions.clear()
+
+@atexit.register
+def close_all_connections():
+    """Closes every connection opened by this process (checkpoints the WAL)."""
+    with _registry_lock:
+        connections = list(_all_connections)
+        _all_connections.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    if hasattr(_local, "connections"):
+        _local.connections.clear()
+        _local.sessions.clear()
 
 class StateManager:
     def __init__(self, db_path: str = None):
@@ -12,21 +91,154 @@ class StateManager:
             base_dir = os.path.expanduser("~/.autoconfigoscli")
             os.makedirs(base_dir, exist_ok=True)
             self.db_path = os.path.join(base_dir, "state.db")
-    
+
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Returns this thread's long-lived connection to the database.
+        As a context manager it commits (or rolls back) but doesn't close, like any sqlite3 connection.
+        """
+        connections = _thread_connections()
+        conn = connections.get(self.db_path)
+        if conn is None:
+            conn = connections[self.db_path] = _open_connection(self.db_path)
         return conn
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self.get_connection()
+
+    @contextmanager
+    def session(self):
+        """
+        Groups statements into one transaction, committed when the outermost session exits.
+        execute_query() calls made inside a session don't commit on their own.
+        """
+        conn = self.get_connection()
+        sessions = _local.sessions
+        depth = sessions.get(self.db_path, 0)
+        sessions[self.db_path] = depth + 1
+        try:
+            if depth:
+                yield conn
+            else:
+                with conn:
+                    yield conn
+        finally:
+            sessions[self.db_path] = depth
+
+    def close(self):
+        """Closes this thread's connection; the next query reopens it and re-checks the schema."""
+        _migrated_paths.discard(self.db_path)
+        conn = _thread_connections().pop(self.db_path, None)
+        if conn is not None:
+            with _registry_lock:
+                if conn in _all_connections:
+                    _all_connections.remove(conn)
+            conn.close()
+
     def init_db(self):
-        # Run migrations
-        with self.get_connection() as conn:
-            manager = MigrationManager(conn)
-            manager.run_migrations()
+        """Brings the schema up to date. Only the first call per database path does any work."""
+        if self.db_path in _migrated_paths:
+            return
+        with _migration_lock:
+            if self.db_path in _migrated_paths:
+                return
+            conn = self.get_connection()
+            # Fast path: the header already records the latest shipped migration
+            if conn.execute("PRAGMA user_version").fetchone()[0] < latest_version():
+                with conn:
+                    MigrationManager(conn).run_migrations()
+            _migrated_paths.add(self.db_path)
 
     def execute_query(self, query: str, params: tuple = ()):
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
+        conn = self.get_connection()
+        try:
+            rows = conn.execute(query, params).fetchall()
+        except Exception:
+            if not _local.sessions.get(self.db_path):
+                conn.rollback()
+            raise
+        if not _local.sessions.get(self.db_path):
             conn.commit()
-            return cursor.fetchall()
+        return rows
+
+    def create_backup(self, backup_dir: str = None, keep: int = BACKUP_KEEP) -> Optional[str]:
+        """
+        Copies the database with SQLite's online backup API into a gzipped snapshot under
+        backup_dir and rotates out all but the newest `keep`. The copy runs in page steps on
+        its own connection, so other readers and writers are never blocked for long, and the
+        result is consistent. Returns the backup path, or None if there is no database yet.
+        """
+        if not os.path.exists(self.db_path):
+            return None
+        backup_dir = backup_dir or BACKUP_DIR
+        os.makedirs(backup_dir, exist_ok=True)
+        name = "state-" + datetime.now().strftime("%Y%m%d-%H%M%S-%f") + ".db"
+        raw_path = os.path.join(backup_dir, name + ".tmp")
+        backup_path = os.path.join(backup_dir, name + ".gz")
+
+        try:
+            source = sqlite3.connect(self.db_path, timeout=30)
+            target = sqlite3.connect(raw_path)
+            try:
+                source.backup(target, pages=BACKUP_PAGES, sleep=0.005)
+            finally:
+                target.close()
+                source.close()
+            with open(raw_path, "rb") as raw, gzip.open(backup_path + ".tmp", "wb") as out:
+                shutil.copyfileobj(raw, out, 1024 * 1024)
+            os.replace(backup_path + ".tmp", backup_path)
+        except (sqlite3.Error, OSError):
+            return None
+        finally:
+            for leftover in (raw_path, backup_path + ".tmp"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+        for old in self.list_backups(backup_dir)[keep:]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return backup_path
+
+    def list_backups(self, backup_dir: str = None) -> List[str]:
+        """Backup files, newest first."""
+        backup_dir = backup_dir or BACKUP_DIR
+        try:
+            names = [n for n in os.listdir(backup_dir) if n.startswith("state-") and n.endswith(".db.gz")]
+        except OSError:
+            return []
+        return [os.path.join(backup_dir, n) for n in sorted(names, reverse=True)]
+
+    def restore_backup(self, backup_path: str, keep_current: bool = False) -> bool:
+        """
+        Replaces the live database with a backup. The snapshot is checked with integrity_check
+        first and copied in through the backup API, so the WAL and open readers stay coherent.
+        With keep_current the live database is backed up first; that happens only once the
+        snapshot is decompressed and verified, since its rotation may delete the file being restored.
+        Migrations run afterwards in case the backup predates the current schema.
+        """
+        raw_path = self.db_path + ".restore"
+        try:
+            with gzip.open(backup_path, "rb") as src, open(raw_path, "wb") as out:
+                shutil.copyfileobj(src, out, 1024 * 1024)
+            source = sqlite3.connect(raw_path)
+            try:
+                if source.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+                    return False
+                if keep_current:
+                    self.create_backup()
+                source.backup(self.get_connection(), pages=BACKUP_PAGES)
+            finally:
+                source.close()
+        except (sqlite3.Error, OSError):
+            return False
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        # Forget the schema memo: the restored file may be behind
+        self.close()
+        self.init_db()
+        return True
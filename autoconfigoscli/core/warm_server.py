@@ -0,0 +1,207 @@
+"""
+Opt-in warm cache server (`autoconfigoscli serve --socket`).
+
+A foreground process that keeps the OS info, catalog, resolver and providers
+built and answers query commands (explain, recommend, status, profiles list/show)
+over a Unix socket, exiting after an idle timeout. The CLI forwards those
+commands to it when the socket is there and runs them itself otherwise, so
+nothing changes when no server is running.
+
+Query commands don't install, prompt or edit profiles, but they aren't strictly
+read-only: `explain system` and `recommend` record an audit in state.db, which
+the server does just as the command would locally.
+
+This module is imported by the CLI before any command runs: keep its
+top-level imports to the standard library.
+"""
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import List, Optional
+
+SOCKET_PATH = os.environ.get("AUTOCONFIGOSCLI_SOCKET", os.path.expanduser("~/.autoconfigoscli/serve.sock"))
+IDLE_TIMEOUT = 300  # seconds without a request before the server exits
+CONNECT_TIMEOUT = 0.2
+MAX_REQUEST = 64 * 1024
+
+# Commands that never install, prompt or edit profiles (audits aside, see above)
+SERVED_COMMANDS = {"explain", "recommend", "status"}
+SERVED_PROFILE_COMMANDS = {"list", "show"}
+
+def is_served(args) -> bool:
+    if args.command == "profiles":
+        return getattr(args, "subcommand", None) in SERVED_PROFILE_COMMANDS
+    return args.command in SERVED_COMMANDS
+
+def is_forwardable(args) -> bool:
+    """Whether the CLI should try the warm server; AUTOCONFIGOSCLI_NO_SERVER=1 always runs locally."""
+    return not os.environ.get("AUTOCONFIGOSCLI_NO_SERVER") and is_served(args)
+
+def forward(argv: List[str], socket_path: str = None) -> Optional[int]:
+    """
+    Runs argv on the warm server, writes its stdout and stderr to ours and
+    returns the command's exit status. Returns None, having written nothing,
+    when no server answers.
+    """
+    socket_path = socket_path or SOCKET_PATH
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+
+    try:
+        columns = os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        columns = None
+    request = {"argv": argv, "tty": sys.stdout.isatty(), "columns": columns}
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.settimeout(None)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as f:
+                reply = json.loads(f.read())
+    except (OSError, ValueError):
+        # Stale socket, or the server timed out mid-request: run locally
+        return None
+
+    if not reply.get("ok"):
+        return None
+    sys.stdout.write(reply["output"])
+    sys.stdout.flush()
+    if reply.get("stderr"):
+        sys.stderr.write(reply["stderr"])
+        sys.stderr.flush()
+    return reply.get("exit", 0)
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST)
+        if not line:
+            # Liveness probe from another `serve` (see _remove_stale_socket)
+            return
+        try:
+            reply = self.server.run(json.loads(line))
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        try:
+            self.wfile.write(json.dumps(reply).encode())
+        except OSError:
+            # The client gave up waiting and ran the command itself
+            pass
+
+# Python on Windows has no AF_UNIX; WarmServer refuses to start there
+_UnixServer = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+class WarmServer(_UnixServer):
+    """
+    Serves one request at a time: commands print through module-level consoles
+    bound to sys.stdout and sys.stderr, which are redirected into the reply
+    while each one runs.
+    """
+    def __init__(self, socket_path: str = None, idle_timeout: float = IDLE_TIMEOUT):
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("serve --socket needs Unix domain sockets, which this platform lacks")
+        self.socket_path = socket_path or SOCKET_PATH
+        self.timeout = idle_timeout
+        self.idle = False
+        self._catalog_stat = None
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        self._remove_stale_socket()
+        # Only the owner may connect
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+                return
+        raise RuntimeError(f"A server is already listening on {self.socket_path}")
+
+    def warm(self):
+        """Builds the shared objects every forwarded command starts from."""
+        from .registry import get_catalog, get_provider_manager, get_resolver
+        from .os_detect import get_os_info
+        get_os_info()
+        get_resolver()
+        get_provider_manager().system_provider
+        self._catalog_stat = self._stat(get_catalog().catalog_path)
+
+    def _refresh(self):
+        # packages.yaml edited since the last request: rebuild the catalog and what depends on it
+        from .registry import get_catalog, invalidate
+        path = get_catalog().catalog_path
+        if self._stat(path) != self._catalog_stat:
+            invalidate("catalog")
+            self._catalog_stat = self._stat(get_catalog().catalog_path)
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def run(self, request) -> dict:
+        from rich.console import Console
+        from ..cli import build_parser
+        from ..commands import run_command
+
+        try:
+            args = build_parser().parse_args(request["argv"])
+        except SystemExit:
+            return {"ok": False, "error": "invalid arguments"}
+        if not is_served(args):
+            return {"ok": False, "error": f"'{args.command}' is not served"}
+
+        self._refresh()
+        buffer, errors = io.StringIO(), io.StringIO()
+        console = Console(file=buffer, force_terminal=request.get("tty", False), width=request.get("columns"))
+        status = 0
+        with redirect_stdout(buffer), redirect_stderr(errors):
+            # Same exit status and stderr the command would have produced run locally
+            try:
+                run_command(args.command, args, console)
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    status = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    status = 1
+            except Exception:
+                traceback.print_exc()
+                status = 1
+        return {"ok": True, "output": buffer.getvalue(), "stderr": errors.getvalue(), "exit": status}
+
+    def handle_timeout(self):
+        self.idle = True
+
+    def serve_until_idle(self):
+        """Handles requests until none arrives for `timeout` seconds."""
+        try:
+            while not self.idle:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
@@ -0,0 +1,26 @@
+import sqlite3
+
+def up(conn: sqlite3.Connection) -> None:
+    # One row per install run, with the plan it executes
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS install_runs (
+            run_id TEXT PRIMARY KEY,
+            profile_name TEXT,
+            plan_hash TEXT,     -- sha256 of plan_json
+            plan_json TEXT,     -- the resolved plan, replayed by install --resume
+            status TEXT,        -- running, success, failed
+            started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Per-item checkpoint of a run
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS install_journal (
+            run_id TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            status TEXT CHECK(status IN ('pending', 'running', 'done', 'failed')),
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_id, item_id)
+        )
+    """)
@@ -0,0 +1,10 @@
+import sqlite3
+
+def up(conn: sqlite3.Connection) -> None:
+    # history list filters: --type, --target, and the default newest-first listing.
+    # SQLite appends the rowid (id) to every index, so (col, timestamp) also serves the keyset cursor.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_history_type_ts ON decision_history (action_type, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_history_target_ts ON decision_history (target, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_history_ts ON decision_history (timestamp)")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_audits_ts ON system_audits (timestamp)")
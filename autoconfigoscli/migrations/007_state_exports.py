@@ -0,0 +1,12 @@
+import sqlite3
+
+def up(conn: sqlite3.Connection) -> None:
+    # One row per state export; `export --since <export_id>` ships only what changed after it
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS state_exports (
+            export_id TEXT PRIMARY KEY,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            since TEXT,             -- export id or timestamp this export is a delta from, NULL for full
+            high_water_json TEXT    -- {table: max rowid} covered by this export
+        )
+    """)
@@ -0,0 +1,558 @@
+import unittest
+import hashlib
+import io
+import json
+import os
+import subprocess
+import tarfile
+import tempfile
+from unittest.mock import MagicMock, patch
+from autoconfigoscli.core.installer import Installer
+from autoconfigoscli.core.providers.apt import AptProvider
+from autoconfigoscli.core.providers.pacman import PacmanProvider
+from autoconfigoscli.core.providers.flatpak import FlatpakProvider
+from autoconfigoscli.core.journal import InstallJournal
+from autoconfigoscli.core.bundle import BundleManager
+from autoconfigoscli.core.providers.script_cache import ScriptCache
+from autoconfigoscli.core.providers.script import ScriptProvider, parse_remote_script
+from autoconfigoscli.core.catalog.models import InstallCheck, Transformation
+from autoconfigoscli.core.catalog.loader import CatalogLoader
+from autoconfigoscli.core import state as state_module
+from autoconfigoscli.core.state import StateManager
+from autoconfigoscli.core.catalog.graph import topological_waves, DependencyCycleError
+
+def make_item(pkg_id, provider_name="apt"):
+    return {
+        "id": pkg_id,
+        "name": pkg_id,
+        "provider_name": provider_name,
+        "target_pkg": pkg_id,
+        "risk": "low",
+        "deps": []
+    }
+
+def make_provider(name="apt", batch=True):
+    provider = MagicMock()
+    provider.name = name
+    provider.supports_batch_install = batch
+    return provider
+
+class TestInstallerBatching(unittest.TestCase):
+    def setUp(self):
+        self.installer = Installer()
+        self.installer._record_package = MagicMock()
+
+    def test_group_by_provider_keeps_order(self):
+        items = [make_item("git"), make_item("vscode", "flatpak"), make_item("curl")]
+        groups = self.installer._group_by_provider(items)
+
+        self.assertEqual(list(groups.keys()), ["apt", "flatpak"])
+        self.assertEqual([i["id"] for i in groups["apt"]], ["git", "curl"])
+
+    def test_shared_lock_lanes_are_chained(self):
+        apt, snap, flatpak = make_provider("apt"), make_provider("snap"), make_provider("flatpak")
+        apt.lock_key, snap.lock_key, flatpak.lock_key = "dpkg", "dpkg", "flatpak"
+
+        chains = self.installer._build_chains({"apt": apt, "flatpak": flatpak, "snap": snap})
+
+        self.assertEqual(chains, [["apt", "snap"], ["flatpak"]])
+
+    def test_execute_plan_runs_every_lane(self):
+        apt, flatpak = make_provider("apt"), make_provider("flatpak", batch=False)
+        apt.lock_key, flatpak.lock_key = "dpkg", "flatpak"
+        apt.install_many.return_value = True
+        flatpak.install.return_value = True
+        self.installer.provider_manager = MagicMock()
+        self.installer.provider_manager.get_provider.side_effect = {"apt": apt, "flatpak": flatpak}.get
+
+        plan = {"installable": [make_item("git"), make_item("vscode", "flatpak"), make_item("curl")]}
+
+        self.assertTrue(self.installer._execute_plan(plan))
+        apt.install_many.assert_called_once_with(["git", "curl"])
+        flatpak.install.assert_called_once_with("vscode")
+
+    def test_prefetch_one_call_per_provider(self):
+        apt, flatpak = make_provider("apt"), make_provider("flatpak")
+        apt.lock_key, flatpak.lock_key = "dpkg", "flatpak"
+        apt.prefetch.return_value = True
+        flatpak.prefetch.return_value = False
+        self.installer.provider_manager = MagicMock()
+        self.installer.provider_manager.get_provider.side_effect = {"apt": apt, "flatpak": flatpak}.get
+
+        ok = self.installer._prefetch([make_item("git"), make_item("vscode", "flatpak"), make_item("curl")])
+
+        self.assertFalse(ok)
+        apt.prefetch.assert_called_once_with(["git", "curl"])
+        flatpak.prefetch.assert_called_once_with(["vscode"])
+        apt.install_many.assert_not_called()
+
+    def test_batch_success_single_transaction(self):
+        provider = make_provider()
+        provider.install_many.return_value = True
+        items = [make_item("git"), make_item("curl"), make_item("wget")]
+
+        ok = self.installer._install_group(provider, items, MagicMock(), None)
+
+        self.assertTrue(ok)
+        provider.install_many.assert_called_once_with(["git", "curl", "wget"])
+        provider.install.assert_not_called()
+        self.assertEqual(self.installer._record_package.call_count, 3)
+
+    def test_batch_failure_falls_back_per_package(self):
+        provider = make_provider()
+        provider.install_many.return_value = False
+        provider.install.side_effect = lambda name: name != "curl"
+        items = [make_item("git"), make_item("curl"), make_item("wget")]
+
+        ok = self.installer._install_group(provider, items, MagicMock(), None)
+
+        self.assertFalse(ok)
+        self.assertEqual(provider.install.call_count, 3)
+        recorded = [c.args[0] for c in self.installer._record_package.call_args_list]
+        self.assertEqual(recorded, ["git", "wget"])
+
+    def test_non_batch_provider_installs_one_by_one(self):
+        provider = make_provider("script", batch=False)
+        provider.install.return_value = True
+        items = [make_item("uv", "script"), make_item("rustup", "script")]
+
+        self.assertTrue(self.installer._install_group(provider, items, MagicMock(), None))
+        provider.install_many.assert_not_called()
+        self.assertEqual(provider.install.call_count, 2)
+
+class TestInstalledSnapshot(unittest.TestCase):
+    @patch("autoconfigoscli.core.providers.base.subprocess.run")
+    def test_snapshot_single_subprocess(self, mock_run):
+        mock_run.return_value = MagicMock(stdout="ii  git\nrc  vim\nii  curl\n", returncode=0)
+        apt = AptProvider()
+
+        self.assertTrue(apt.is_installed("git"))
+        self.assertTrue(apt.is_installed("curl"))
+        self.assertFalse(apt.is_installed("vim"))
+        self.assertEqual(mock_run.call_count, 1)
+
+    @patch("autoconfigoscli.core.providers.base.subprocess.run")
+    def test_snapshot_invalidated_after_install(self, mock_run):
+        mock_run.return_value = MagicMock(stdout="ii  git\n", returncode=0)
+        apt = AptProvider()
+        apt.is_installed("git")
+
+        apt.install("curl")
+        self.assertIsNone(apt._installed_snapshot)
+
+class TestPlanResolution(unittest.TestCase):
+    def test_plan_keeps_profile_order(self):
+        installer = Installer(max_workers=2)
+        apt, flatpak = make_provider("apt"), make_provider("flatpak")
+        apt.is_installed.side_effect = lambda name: name == "curl"
+        flatpak.is_installed.return_value = False
+        providers = {"system": apt, "flatpak": flatpak}
+
+        def resolve(pkg_id):
+            trans = MagicMock(package_name=pkg_id, bootstrap_deps=[])
+            trans.provider = "flatpak" if pkg_id == "vscode" else "system"
+            return trans
+
+        installer.resolver = MagicMock()
+        installer.resolver.resolve.side_effect = resolve
+        installer.resolver.get_package_details.return_value = None
+        installer.provider_manager = MagicMock()
+        installer.provider_manager.get_provider.side_effect = providers.get
+
+        profile = MagicMock(packages=["git", "vscode", "curl", "wget"])
+        plan = installer._create_install_plan(profile)
+
+        self.assertEqual([i["id"] for i in plan["installable"]], ["git", "vscode", "wget"])
+        self.assertEqual([i["id"] for i in plan["skipped"]], ["curl"])
+
+class TestDependencyWaves(unittest.TestCase):
+    def test_prerequisites_come_first(self):
+        waves = topological_waves({
+            "zellij": ["rustup"],
+            "navi": ["rustup"],
+            "rustup": [],
+            "copilot": ["nodejs"],
+            "git": []
+        })
+        # nodejs is not a node (already installed), so copilot is not held back
+        self.assertEqual(waves, [["rustup", "copilot", "git"], ["zellij", "navi"]])
+
+    def test_cycle_detected(self):
+        with self.assertRaises(DependencyCycleError) as ctx:
+            topological_waves({"a": ["b"], "b": ["c"], "c": ["a"], "d": ["a"]})
+        self.assertEqual(ctx.exception.cycle[0], ctx.exception.cycle[-1])
+
+    def test_failed_prerequisite_skips_dependents(self):
+        installer = Installer()
+        installer._record_package = MagicMock()
+        script = make_provider("script", batch=False)
+        script.lock_key = "script"
+        script.install.side_effect = lambda name: name != "rustup"
+        installer.provider_manager = MagicMock()
+        installer.provider_manager.get_provider.return_value = script
+
+        zellij = make_item("zellij", "script")
+        zellij["deps"] = ["rustup"]
+        plan = {
+            "installable": [make_item("rustup", "script"), zellij],
+            "waves": [["rustup"], ["zellij"]]
+        }
+
+        self.assertFalse(installer._execute_plan(plan))
+        script.install.assert_called_once_with("rustup")
+        self.assertEqual(zellij["status"], "failed")
+
+class TestInstallJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = StateManager(db_path=os.path.join(self.tmp.name, "state.db"))
+        self.state.init_db()
+        self.journal = InstallJournal(self.state)
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        plan = {"installable": [make_item("git"), make_item("curl")], "waves": [["git", "curl"]]}
+        run_id = self.journal.start_run("demo", plan)
+        self.journal.mark(run_id, "git", "done")
+
+        run = self.journal.load_run(run_id)
+        self.assertEqual(run["items"], {"git": "done", "curl": "pending"})
+        self.assertEqual(run["plan"], plan)
+
+    def test_resume_skips_done_items(self):
+        plan = {"installable": [make_item("git"), make_item("curl")], "waves": [["git", "curl"]]}
+        run_id = self.journal.start_run("demo", plan)
+        self.journal.mark(run_id, "git", "done")
+        self.journal.mark(run_id, "curl", "running")
+
+        installer = Installer()
+        installer.state = self.state
+        installer.journal = self.journal
+        installer.history = MagicMock()
+        installer._execute_plan = MagicMock(return_value=True)
+        installer.provider_manager = MagicMock()
+
+        self.assertTrue(installer.resume_run(run_id, auto_yes=True))
+        resumed = installer._execute_plan.call_args.args[0]
+        self.assertEqual([i["id"] for i in resumed["installable"]], ["curl"])
+        self.assertEqual(resumed["waves"], [["curl"]])
+        installer.provider_manager.get_provider.return_value.is_installed.assert_not_called()
+
+    def test_wave_workers_close_their_connections(self):
+        apt = make_provider("apt")
+        apt.lock_key = "dpkg"
+        apt.install_many.return_value = True
+        installer = Installer()
+        installer.state = self.state
+        installer.journal = self.journal
+        installer.provider_manager = MagicMock()
+        installer.provider_manager.get_provider.return_value = apt
+        plan = {"installable": [make_item("git"), make_item("curl")], "waves": [["git"], ["curl"]]}
+        installer.run_id = self.journal.start_run("demo", plan)
+
+        open_before = len(state_module._all_connections)
+        self.assertTrue(installer._execute_plan(plan))
+        self.assertEqual(len(state_module._all_connections), open_before)
+        self.assertEqual(self.journal.load_run(installer.run_id)["items"], {"git": "done", "curl": "done"})
+
+class TestOfflineBundle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _fake_download(self, names, dest_dir):
+        files = {"shared.deb": b"libfoo", f"{names[0]}.deb": names[0].encode()}
+        paths = []
+        for filename, content in files.items():
+            path = os.path.join(dest_dir, filename)
+            with open(path, "wb") as f:
+                f.write(content)
+            paths.append(path)
+        return paths
+
+    def test_create_extract_install(self):
+        apt = make_provider("apt")
+        apt.lock_key = "dpkg"
+        apt.download.side_effect = self._fake_download
+        apt.is_installed.return_value = False
+        apt.install_local.return_value = True
+
+        installer = Installer()
+        installer._record_package = MagicMock()
+        installer.loader = MagicMock()
+        installer.loader.load_profile.return_value = MagicMock(packages=["git", "curl"])
+        installer.loader.load_profile.return_value.name = "demo"
+        installer.provider_manager = MagicMock()
+        installer.provider_manager.get_provider.return_value = apt
+        installer._create_install_plan = MagicMock(return_value={
+            "installable": [make_item("git")], "skipped": [make_item("curl")]
+        })
+
+        bundle_path = os.path.join(self.tmp.name, "demo.bundle.tar")
+        manager = BundleManager(installer)
+        self.assertEqual(manager.create("demo", bundle_path), bundle_path)
+
+        manifest = manager.extract(bundle_path, os.path.join(self.tmp.name, "out"))
+        self.assertEqual(len(manifest["items"]), 2)
+        # The shared dependency is stored once
+        digests = {a["sha256"] for entry in manifest["items"] for a in entry["artifacts"]}
+        self.assertEqual(len(digests), 3)
+
+        plan = installer._create_bundle_plan(manifest)
+        self.assertTrue(installer._execute_plan(plan))
+        names, paths = apt.install_local.call_args.args
+        self.assertEqual(names, ["git", "curl"])
+        self.assertEqual(len(paths), 4)
+        apt.install_many.assert_not_called()
+
+    def _write_bundle(self, artifact, blob_name, blob):
+        bundle_path = os.path.join(self.tmp.name, "crafted.bundle.tar")
+        manifest = {"format": 1, "items": [dict(make_item("git"), artifacts=[artifact])]}
+        with tarfile.open(bundle_path, "w") as tar:
+            for name, data in (("manifest.json", json.dumps(manifest).encode()), (f"blobs/{blob_name}", blob)):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return bundle_path
+
+    def test_extract_rejects_paths_outside_dest(self):
+        digest = hashlib.sha256(b"payload").hexdigest()
+        out = os.path.join(self.tmp.name, "out")
+        manager = BundleManager(MagicMock())
+        for artifact in ({"sha256": digest, "filename": "../escape.deb"},
+                         {"sha256": digest, "filename": ".."},
+                         {"sha256": "../../" + digest[6:], "filename": "git.deb"}):
+            bundle_path = self._write_bundle(artifact, artifact["sha256"], b"payload")
+            self.assertIsNone(manager.extract(bundle_path, out))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "escape.deb")))
+        self.assertFalse(os.path.exists(out))
+
+    def test_extract_leaves_nothing_for_corrupt_blob(self):
+        digest = hashlib.sha256(b"payload").hexdigest()
+        out = os.path.join(self.tmp.name, "out")
+        bundle_path = self._write_bundle({"sha256": digest, "filename": "git.deb"}, digest, b"tampered")
+        self.assertIsNone(BundleManager(MagicMock()).extract(bundle_path, out))
+        self.assertEqual(os.listdir(os.path.join(out, digest[:16])), [])
+
+    def test_bundle_plan_applies_catalog_pins_and_probes(self):
+        commands = {pkg_id: f"curl -fsSL https://example.com/{pkg_id}.sh | sh" for pkg_id in ("present", "missing")}
+        script_path = os.path.join(self.tmp.name, "install.sh")
+        with open(script_path, "wb") as f:
+            f.write(b"echo tampered")
+        script = ScriptProvider(cache=ScriptCache(cache_dir=self.tmp.name))
+        script.get_installed_snapshot = MagicMock(return_value={"present"})
+
+        installer = Installer()
+        installer.provider_manager = MagicMock()
+        installer.provider_manager.get_provider.return_value = script
+        installer.resolver = MagicMock()
+        installer.resolver.resolve.side_effect = lambda pkg_id: Transformation(
+            provider="script", package_name=commands[pkg_id], sha256="0" * 64, check=InstallCheck(binary=pkg_id))
+
+        manifest = {"items": [
+            dict(make_item(pkg_id, "script"), target_pkg=command, paths=[script_path])
+            for pkg_id, command in commands.items()
+        ]}
+        plan = installer._create_bundle_plan(manifest)
+        self.assertEqual([item["id"] for item in plan["skipped"]], ["present"])
+        self.assertEqual([item["id"] for item in plan["installable"]], ["missing"])
+        with patch.object(script, "_confirm") as confirm:
+            self.assertFalse(script.install_local([commands["missing"]], [script_path]))
+            confirm.assert_not_called()
+
+class TestBundleDownloads(unittest.TestCase):
+    def test_apt_downloads_full_dependency_closure(self):
+        apt = AptProvider()
+        depends = "git\n  Depends: libc6\n  Depends: <perlapi-5.36>\nlibc6\n  Depends: libgcc-s1\nlibgcc-s1\n<perlapi-5.36>\n"
+        with tempfile.TemporaryDirectory() as tmp, patch.object(apt, "_run_cmd") as run:
+            run.return_value = MagicMock(stdout=depends)
+            apt.download(["git"], tmp)
+        download = run.call_args_list[-1]
+        self.assertEqual(download.args[0], ["apt-get", "download", "git", "libc6", "libgcc-s1"])
+        self.assertEqual(download.kwargs["cwd"], tmp)
+
+    def test_pacman_downloads_full_dependency_closure(self):
+        pacman = PacmanProvider()
+        trees = {"git": "git\nglibc\ncurl\n", "curl": "curl\nglibc\n"}
+        with tempfile.TemporaryDirectory() as tmp, patch.object(pacman, "_run_cmd") as run:
+            run.side_effect = lambda cmd, sudo=False: MagicMock(stdout=trees.get(cmd[-1], ""))
+            pacman.download(["git", "curl"], tmp)
+        download = run.call_args_list[-1]
+        self.assertEqual(download.args[0], ["pacman", "-Sw", "--noconfirm", "--cachedir", tmp, "git", "glibc", "curl"])
+
+    def test_pacman_without_pactree_is_not_bundleable(self):
+        pacman = PacmanProvider()
+        with tempfile.TemporaryDirectory() as tmp, patch.object(pacman, "_run_cmd", side_effect=FileNotFoundError("pactree")):
+            self.assertIsNone(pacman.download(["git"], tmp))
+
+    def test_flatpak_bundles_app_with_its_runtime(self):
+        flatpak = FlatpakProvider()
+        def run(cmd, sudo=False):
+            if cmd[1] == "remote-info":
+                return MagicMock(stdout="        ID: org.gimp.GIMP\n   Runtime: org.gnome.Platform/x86_64/46\n")
+            if cmd[1] == "info":
+                raise subprocess.CalledProcessError(1, cmd)
+            return MagicMock(stdout="")
+
+        with patch.object(flatpak, "is_available", return_value=True), \
+             patch.object(flatpak, "_run_cmd", side_effect=run) as mock_run:
+            paths = flatpak.download(["org.gimp.GIMP"], "/bundle")
+        self.assertEqual(paths, ["/bundle/org.gnome.Platform+x86_64+46.runtime.flatpak", "/bundle/org.gimp.GIMP.flatpak"])
+        commands = [c.args[0] for c in mock_run.call_args_list]
+        self.assertIn(["flatpak", "install", "flathub", "-y", "--no-deploy", "org.gnome.Platform/x86_64/46"], commands)
+        self.assertIn(["flatpak", "build-bundle", "--runtime", "--arch=x86_64", "/var/lib/flatpak/repo",
+                       paths[0], "org.gnome.Platform", "46"], commands)
+
+    def test_flatpak_installs_missing_runtime_before_app(self):
+        flatpak = FlatpakProvider()
+        installed = {"org.kde.Platform/x86_64/6.7"}
+        def run(cmd, sudo=False):
+            if cmd[1] == "info" and cmd[2] not in installed:
+                raise subprocess.CalledProcessError(1, cmd)
+            return MagicMock(stdout="")
+
+        paths = ["/b/org.gimp.GIMP.flatpak", "/b/org.gnome.Platform+x86_64+46.runtime.flatpak",
+                 "/b/org.kde.Platform+x86_64+6.7.runtime.flatpak"]
+        with patch.object(flatpak, "is_available", return_value=True), \
+             patch.object(flatpak, "_run_cmd", side_effect=run) as mock_run:
+            self.assertTrue(flatpak.install_local(["org.gimp.GIMP"], paths))
+        installs = [c.args[0][-1] for c in mock_run.call_args_list if c.args[0][1] == "install"]
+        self.assertEqual(installs, ["/b/org.gnome.Platform+x86_64+46.runtime.flatpak", "/b/org.gimp.GIMP.flatpak"])
+
+    def test_apt_installs_only_targets_from_local_repository(self):
+        apt = AptProvider()
+        commands = []
+        def run(cmd, sudo=False, cwd=None):
+            commands.append(cmd)
+            if cmd[0] == "dpkg-deb":
+                return MagicMock(stdout=f"Package: {os.path.basename(cmd[-1])[:-4]}\nVersion: 1.0\n")
+            return MagicMock(stdout="")
+
+        with tempfile.TemporaryDirectory() as tmp, patch.object(apt, "_run_cmd", side_effect=run):
+            paths = []
+            for blob, name in (("aa", "git"), ("bb", "libc6")):
+                os.makedirs(os.path.join(tmp, blob))
+                paths.append(os.path.join(tmp, blob, f"{name}.deb"))
+                with open(paths[-1], "wb") as f:
+                    f.write(name.encode())
+            self.assertTrue(apt.install_local(["git"], paths))
+            with open(os.path.join(tmp, "Packages")) as f:
+                index = f.read()
+
+        self.assertIn("Package: libc6\nVersion: 1.0\nFilename: ./bb/libc6.deb\n", index)
+        install = commands[-1]
+        self.assertEqual(install[:3], ["apt-get", "install", "-y"])
+        self.assertEqual(install[-1], "git")
+        self.assertFalse([arg for arg in install if arg.endswith(".deb")])
+
+class TestScriptCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ScriptCache(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _response(self, status=200, content=b"echo hi", headers=None):
+        return MagicMock(status_code=status, content=content, headers=headers or {})
+
+    @patch("autoconfigoscli.core.providers.script_cache.requests.get")
+    def test_fresh_entry_served_without_network(self, mock_get):
+        mock_get.return_value = self._response(headers={"ETag": "v1"})
+        first = self.cache.fetch("https://example.com/install.sh")
+        second = self.cache.fetch("https://example.com/install.sh")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("autoconfigoscli.core.providers.script_cache.requests.get")
+    def test_stale_entry_revalidates_with_etag(self, mock_get):
+        mock_get.return_value = self._response(headers={"ETag": "v1"})
+        self.cache.fetch("https://example.com/install.sh")
+        self.cache.max_age = 0
+
+        mock_get.return_value = self._response(status=304)
+        path = self.cache.fetch("https://example.com/install.sh")
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], "v1")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"echo hi")
+
+    @patch("autoconfigoscli.core.providers.script_cache.requests.get")
+    def test_pin_mismatch_rejected(self, mock_get):
+        mock_get.return_value = self._response()
+        self.assertIsNone(self.cache.fetch("https://example.com/install.sh", sha256="0" * 64))
+
+    @patch("autoconfigoscli.core.providers.script_cache.requests.get")
+    def test_pinned_fetch_ignores_unpinned_entry(self, mock_get):
+        mock_get.return_value = self._response(content=b"echo unpinned", headers={"ETag": "v1"})
+        self.cache.fetch("https://example.com/install.sh")
+
+        # A server that answers 304 regardless must not get the unpinned blob through
+        mock_get.return_value = self._response(status=304)
+        pinned = hashlib.sha256(b"echo pinned").hexdigest()
+        self.assertIsNone(self.cache.fetch("https://example.com/install.sh", sha256=pinned))
+        self.assertNotIn("If-None-Match", mock_get.call_args.kwargs["headers"])
+
+        mock_get.return_value = self._response(content=b"echo pinned")
+        path = self.cache.fetch("https://example.com/install.sh", sha256=pinned)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"echo pinned")
+
+class TestRemoteScriptParsing(unittest.TestCase):
+    def test_only_shell_pipes_are_remote_scripts(self):
+        self.assertEqual(parse_remote_script("curl -sSf https://sh.rustup.rs | sh -s -- -y"),
+                         ("https://sh.rustup.rs", "sh -s -- -y"))
+        self.assertEqual(parse_remote_script("curl -fsSL https://example.com/get.py | python3 -"),
+                         ("https://example.com/get.py", "python3 -"))
+        self.assertIsNone(parse_remote_script("wget -qO- https://example.com/key.asc | sudo tee /etc/key.asc && sudo apt install x"))
+
+    def test_catalog_pipes_into_tee_are_not_remote_scripts(self):
+        # mongosh's target pipes a repository key into `sudo tee`; it must run as written
+        mongosh = CatalogLoader().get_package("mongosh").targets["linux"].package_name
+        self.assertIsNone(parse_remote_script(mongosh))
+
+class TestScriptProbes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.provider = ScriptProvider(cache=ScriptCache(cache_dir=self.tmp.name))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _register(self, command, check):
+        self.provider.register_target(command, Transformation(provider="script", package_name=command, check=check))
+
+    def test_no_check_is_never_installed(self):
+        self.assertFalse(self.provider.is_installed("cargo install sd"))
+
+    def test_binary_check_uses_path_snapshot(self):
+        self._register("cargo install sd", InstallCheck(binary="sd"))
+        with patch.object(self.provider, "_list_installed", return_value={"sd", "git"}) as listing:
+            self.assertTrue(self.provider.is_installed("cargo install sd"))
+            self.assertTrue(self.provider.is_installed("cargo install sd"))
+        listing.assert_called_once()
+
+    def test_path_check(self):
+        marker = os.path.join(self.tmp.name, "app")
+        self._register("install app", InstallCheck(path=marker))
+        self.assertFalse(self.provider.is_installed("install app"))
+        open(marker, "w").close()
+        self.assertTrue(self.provider.is_installed("install app"))
+
+    @patch("autoconfigoscli.core.providers.script.subprocess.run")
+    def test_version_check_runs_without_shell(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0)
+        self._register("xcode-select --install", InstallCheck(version_cmd=["xcode-select", "-p"]))
+
+        self.assertTrue(self.provider.is_installed("xcode-select --install"))
+        self.assertEqual(mock_run.call_args.args[0], ["xcode-select", "-p"])
+        self.assertNotIn("shell", mock_run.call_args.kwargs)
+
+if __name__ == '__main__':
+    unittest.main()
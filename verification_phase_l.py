@@ -0,0 +1,404 @@
+import unittest
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import warnings
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from autoconfigoscli.core.state import StateManager
+from autoconfigoscli.core.migration_manager import latest_version
+from autoconfigoscli.core.context.history import HistoryManager, parse_since
+from autoconfigoscli.core.retention import RetentionManager, RetentionPolicy
+from autoconfigoscli.core.exporter import Exporter
+from autoconfigoscli.core.importer import Importer
+from autoconfigoscli.core.installer import Installer
+
+class TestStateConnection(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "state.db")
+        self.state = StateManager(db_path=self.db_path)
+        self.state.init_db()
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_connection_shared_per_thread(self):
+        other = StateManager(db_path=self.db_path)
+        self.assertIs(self.state.get_connection(), other.get_connection())
+        self.assertIs(self.state.conn, self.state.get_connection())
+
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(StateManager(db_path=self.db_path).get_connection()))
+        worker.start()
+        worker.join()
+        self.assertIsNot(seen[0], self.state.get_connection())
+
+    def test_wal_enabled(self):
+        mode = self.state.execute_query("PRAGMA journal_mode")[0][0]
+        self.assertEqual(mode, "wal")
+
+    def test_session_commits_once(self):
+        with self.state.session():
+            self.state.execute_query("INSERT INTO settings (key, value) VALUES ('a', '1')")
+            self.assertTrue(self.state.conn.in_transaction)
+            self.state.execute_query("INSERT INTO settings (key, value) VALUES ('b', '2')")
+        self.assertFalse(self.state.conn.in_transaction)
+        self.assertEqual(len(self.state.execute_query("SELECT * FROM settings")), 2)
+
+    def test_session_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.state.session():
+                self.state.execute_query("INSERT INTO settings (key, value) VALUES ('a', '1')")
+                raise RuntimeError("boom")
+        self.assertEqual(self.state.execute_query("SELECT * FROM settings"), [])
+
+class TestMigrationMemo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "state.db")
+
+    def tearDown(self):
+        StateManager(db_path=self.db_path).close()
+        self.tmp.cleanup()
+
+    def test_migrations_run_once_per_process(self):
+        state = StateManager(db_path=self.db_path)
+        state.init_db()
+        self.assertEqual(state.execute_query("PRAGMA user_version")[0][0], latest_version())
+
+        with patch("autoconfigoscli.core.state.MigrationManager") as manager:
+            StateManager(db_path=self.db_path).init_db()
+            manager.assert_not_called()
+
+    def test_current_user_version_skips_migration_scan(self):
+        StateManager(db_path=self.db_path).init_db()
+        StateManager(db_path=self.db_path).close()  # forget the memo, keep the file
+
+        with patch("autoconfigoscli.core.state.MigrationManager") as manager:
+            StateManager(db_path=self.db_path).init_db()
+            manager.assert_not_called()
+
+class TestHistorySink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = StateManager(db_path=os.path.join(self.tmp.name, "state.db"))
+        self.history = HistoryManager(self.state)
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def _count(self):
+        self.state.init_db()
+        return self.state.execute_query("SELECT count(*) FROM decision_history")[0][0]
+
+    def test_records_buffered_until_flush(self):
+        for pkg in ("git", "curl", "jq"):
+            self.history.record_action("install_package", "user", "manual_mode", pkg, "success")
+        self.assertEqual(self._count(), 0)
+
+        self.history.flush()
+        self.assertEqual(self._count(), 3)
+
+    def test_size_threshold_flushes(self):
+        self.history.sink.max_records = 2
+        self.history.record_action("install_package", "user", "manual_mode", "git", "success")
+        self.history.record_action("install_package", "user", "manual_mode", "curl", "success")
+        self.assertEqual(self._count(), 2)
+
+    def test_risky_action_written_synchronously(self):
+        self.history.record_action("install_package", "user", "manual_mode", "git", "success")
+        self.history.record_action("delete_profile", "user", "cli", "mine", "success")
+        self.assertEqual(self._count(), 2)
+
+    def test_quiet_process_flushed_by_timer(self):
+        self.history.sink.max_delay = 0.05
+        self.history.record_action("install_package", "user", "manual_mode", "git", "success")
+        self.history.sink._timer.join(timeout=5)
+        self.assertEqual(self._count(), 1)
+
+    def test_risky_install_written_synchronously(self):
+        installer = Installer()
+        plan = {"installable": [{"id": "git", "risk": "low"}, {"id": "rustup", "risk": "high"}]}
+        risks = installer._high_risk_items(plan)
+        self.assertEqual(risks, ["rustup"])
+        self.history.record_action("install_profile", "user", "cli", "dev", "success", risks=risks)
+        self.assertEqual(self._count(), 1)
+
+    def test_reads_see_buffered_records(self):
+        self.history.record_action("install_package", "user", "manual_mode", "git", "success")
+        self.assertEqual([r["target"] for r in self.history.get_recent()], ["git"])
+
+class TestHistoryQueries(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = StateManager(db_path=os.path.join(self.tmp.name, "state.db"))
+        self.history = HistoryManager(self.state)
+        for i in range(5):
+            self.history.record_action("install_package", "user", "manual_mode", f"pkg{i}", "success")
+        self.history.record_action("install_profile", "user", "cli", "dev", "failed")
+        self.history.flush()
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_keyset_pagination(self):
+        first = list(self.history.iter_entries(action_type="install_package", limit=3))
+        self.assertEqual([r["target"] for r in first], ["pkg4", "pkg3", "pkg2"])
+
+        second = list(self.history.iter_entries(action_type="install_package", before=first[-1]["id"], limit=3))
+        self.assertEqual([r["target"] for r in second], ["pkg1", "pkg0"])
+
+    def test_filters(self):
+        self.assertEqual([r["target"] for r in self.history.iter_entries(result="failed")], ["dev"])
+        self.assertEqual(len(list(self.history.iter_entries(since="1d"))), 6)
+        self.assertEqual(list(self.history.iter_entries(since="2999-01-01")), [])
+
+    def test_relative_since_matches_sqlite_utc(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            since = parse_since("2h")
+        sqlite_since = self.state.execute_query("SELECT datetime('now', '-2 hours')")[0][0]
+        self.assertEqual(len(since), len(sqlite_since))
+        self.assertLessEqual(abs((datetime.fromisoformat(since) - datetime.fromisoformat(sqlite_since)).total_seconds()), 5)
+
+    def test_type_filter_uses_index(self):
+        plan = self.state.execute_query(
+            "EXPLAIN QUERY PLAN SELECT * FROM decision_history WHERE action_type = ? "
+            "ORDER BY timestamp DESC, id DESC LIMIT 20", ("install_package",)
+        )
+        self.assertIn("idx_history_type_ts", " ".join(row["detail"] for row in plan))
+
+class TestRetention(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = StateManager(db_path=os.path.join(self.tmp.name, "state.db"))
+        self.state.init_db()
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def _audit(self, timestamp):
+        self.state.execute_query("INSERT INTO system_audits (timestamp, os_system) VALUES (?, 'Linux')", (timestamp,))
+
+    def test_old_audits_downsampled_to_daily(self):
+        for hour in range(10, 14):
+            self._audit(f"2020-01-01 {hour}:00:00")
+            self._audit(f"2020-01-02 {hour}:00:00")
+        self._audit("2020-01-03 09:00:00")
+        self._audit("2020-01-03 10:00:00")
+
+        report = RetentionManager(self.state).compact(RetentionPolicy(keep_audits=2, history_days=100000))
+
+        kept = [r[0] for r in self.state.execute_query("SELECT timestamp FROM system_audits ORDER BY timestamp")]
+        self.assertEqual(kept, ["2020-01-01 13:00:00", "2020-01-02 13:00:00", "2020-01-03 09:00:00", "2020-01-03 10:00:00"])
+        self.assertEqual(report["deleted"]["system_audits"], 6)
+
+    def test_history_age_cap_keeps_running_installs(self):
+        self.state.execute_query("INSERT INTO decision_history (timestamp, action_type) VALUES ('2000-01-01 00:00:00', 'old')")
+        self.state.execute_query("INSERT INTO decision_history (action_type) VALUES ('new')")
+        for run_id, status in (("done", "success"), ("live", "running")):
+            self.state.execute_query(
+                "INSERT INTO install_runs (run_id, status, updated_at) VALUES (?, ?, '2000-01-01 00:00:00')", (run_id, status)
+            )
+
+        RetentionManager(self.state).compact(RetentionPolicy(history_days=30, vacuum=True))
+
+        self.assertEqual([r[0] for r in self.state.execute_query("SELECT action_type FROM decision_history")], ["new"])
+        self.assertEqual([r[0] for r in self.state.execute_query("SELECT run_id FROM install_runs")], ["live"])
+        self.assertEqual(self.state.execute_query("PRAGMA auto_vacuum")[0][0], 2)
+
+    def test_pruned_pages_reclaimed_without_vacuum_flag(self):
+        details = "x" * 2000
+        for day in range(1, 29):
+            for _ in range(20):
+                self.state.execute_query(
+                    "INSERT INTO system_audits (timestamp, os_system, detected_tools) VALUES (?, 'Linux', ?)",
+                    (f"2020-02-{day:02d} 12:00:00", details)
+                )
+        self.assertEqual(self.state.execute_query("PRAGMA auto_vacuum")[0][0], 2)
+
+        report = RetentionManager(self.state).compact(RetentionPolicy(keep_audits=1))
+
+        self.assertEqual(self.state.execute_query("PRAGMA freelist_count")[0][0], 0)
+        self.assertLess(report["size_after"], report["size_before"])
+
+    def test_full_vacuum_converts_older_database(self):
+        legacy_path = os.path.join(self.tmp.name, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("CREATE TABLE placeholder (id INTEGER)")
+        conn.close()
+        legacy = StateManager(db_path=legacy_path)
+        legacy.init_db()
+        try:
+            self.assertEqual(legacy.execute_query("PRAGMA auto_vacuum")[0][0], 0)
+            RetentionManager(legacy).compact(RetentionPolicy())
+            self.assertEqual(legacy.execute_query("PRAGMA auto_vacuum")[0][0], 0)
+            RetentionManager(legacy).compact(RetentionPolicy(vacuum=True))
+            self.assertEqual(legacy.execute_query("PRAGMA auto_vacuum")[0][0], 2)
+        finally:
+            legacy.close()
+
+class TestStateExportImport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = StateManager(db_path=os.path.join(self.tmp.name, "state.db"))
+        self.state.init_db()
+        self.state.execute_query("INSERT INTO installed_packages (name, manager) VALUES ('git', 'apt')")
+        for i in range(2500):
+            self.state.execute_query("INSERT INTO history (action, details) VALUES ('install', ?)", (f"pkg{i}",))
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def _roundtrip(self, filename):
+        path = os.path.join(self.tmp.name, filename)
+        exporter = Exporter()
+        exporter.state = self.state
+        exporter.export_data(path)
+
+        self.state.execute_query("DELETE FROM history")
+        self.state.execute_query("DELETE FROM installed_packages")
+
+        importer = Importer()
+        importer.state = self.state
+        importer.state.create_backup = MagicMock(return_value=None)
+        importer.import_data(path)
+
+        self.assertEqual(self.state.execute_query("SELECT count(*) FROM history")[0][0], 2500)
+        self.assertEqual(self.state.execute_query("SELECT name FROM installed_packages")[0][0], "git")
+
+    def test_ndjson_roundtrip(self):
+        self._roundtrip("state.ndjson")
+
+    def test_gzip_ndjson_roundtrip(self):
+        self._roundtrip("state.ndjson.gz")
+
+    def test_legacy_json_roundtrip(self):
+        self._roundtrip("state.json")
+
+    def test_all_tables_exported(self):
+        path = os.path.join(self.tmp.name, "state.json")
+        exporter = Exporter()
+        exporter.state = self.state
+        exporter.export_data(path)
+        with open(path) as f:
+            data = json.load(f)
+        self.assertTrue({"decision_history", "system_audits", "user_identity", "machine_profile"} <= set(data["tables"]))
+        self.assertNotIn("schema_version", data["tables"])
+        self.assertEqual(data["metadata"]["schema_version"], latest_version())
+
+    def test_delta_export_merges_on_import(self):
+        exporter = Exporter()
+        exporter.state = self.state
+        full_path = os.path.join(self.tmp.name, "full.ndjson")
+        base_id = exporter.export_data(full_path)
+
+        self.state.execute_query("INSERT INTO history (action, details) VALUES ('install', 'new')")
+        self.state.execute_query("INSERT OR REPLACE INTO settings (key, value) VALUES ('ai_provider', 'none')")
+        delta_path = os.path.join(self.tmp.name, "delta.ndjson")
+        self.assertIsNotNone(exporter.export_data(delta_path, since=base_id))
+        with open(delta_path) as f:
+            self.assertEqual(sum(1 for line in f if line.startswith("[")), 2)
+
+        target = StateManager(db_path=os.path.join(self.tmp.name, "target.db"))
+        importer = Importer()
+        importer.state = target
+        target.create_backup = MagicMock(return_value=None)
+        try:
+            importer.import_data(full_path)
+            importer.import_data(delta_path)
+            self.assertEqual(target.execute_query("SELECT count(*) FROM history")[0][0], 2501)
+            self.assertEqual(target.execute_query("SELECT value FROM settings")[0][0], "none")
+        finally:
+            target.close()
+
+    def test_merging_machines_with_overlapping_ids(self):
+        deltas = []
+        for machine in ("a", "b"):
+            state = StateManager(db_path=os.path.join(self.tmp.name, f"{machine}.db"))
+            state.init_db()
+            # Both machines number their rows from 1
+            state.execute_query("INSERT INTO history (action, details) VALUES ('install', ?)", (f"from-{machine}",))
+            state.execute_query("INSERT INTO installed_packages (name, manager, version) VALUES ('git', 'apt', ?)", (machine,))
+            state.execute_query("INSERT INTO installed_packages (name, manager) VALUES (?, 'apt')", (f"tool-{machine}",))
+            exporter = Exporter()
+            exporter.state = state
+            deltas.append(os.path.join(self.tmp.name, f"{machine}.ndjson"))
+            exporter.export_data(deltas[-1], since="2000-01-01")
+            state.close()
+
+        importer = Importer()
+        importer.state = self.state
+        self.state.create_backup = MagicMock(return_value=None)
+        for path in deltas + deltas:
+            importer.import_data(path)
+
+        details = [r[0] for r in self.state.execute_query("SELECT details FROM history WHERE details LIKE 'from-%'")]
+        self.assertEqual(sorted(details), ["from-a", "from-b"])
+        self.assertEqual(self.state.execute_query("SELECT count(*) FROM history")[0][0], 2502)
+        packages = {r[0]: r[1] for r in self.state.execute_query("SELECT name, version FROM installed_packages")}
+        self.assertEqual(packages, {"git": "b", "tool-a": None, "tool-b": None})
+
+    def test_unknown_since_rejected(self):
+        exporter = Exporter()
+        exporter.state = self.state
+        self.assertIsNone(exporter.export_data(os.path.join(self.tmp.name, "x.ndjson"), since="nope"))
+
+class TestStateBackup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backup_dir = os.path.join(self.tmp.name, "backups")
+        self.state = StateManager(db_path=os.path.join(self.tmp.name, "state.db"))
+        self.state.init_db()
+        self.state.execute_query("INSERT INTO settings (key, value) VALUES ('k', 'before')")
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_no_database_no_backup(self):
+        missing = StateManager(db_path=os.path.join(self.tmp.name, "missing.db"))
+        self.assertIsNone(missing.create_backup(self.backup_dir))
+
+    def test_backup_and_restore(self):
+        path = self.state.create_backup(self.backup_dir)
+        self.assertTrue(path.endswith(".db.gz"))
+
+        self.state.execute_query("UPDATE settings SET value = 'after'")
+        self.assertTrue(self.state.restore_backup(path))
+        self.assertEqual(self.state.execute_query("SELECT value FROM settings")[0][0], "before")
+
+    def test_backup_rotation(self):
+        for _ in range(4):
+            self.state.create_backup(self.backup_dir, keep=2)
+        self.assertEqual(len(self.state.list_backups(self.backup_dir)), 2)
+
+    def test_restore_oldest_backup_with_full_rotation(self):
+        oldest = self.state.create_backup(self.backup_dir, keep=2)
+        self.state.create_backup(self.backup_dir, keep=2)
+        self.state.execute_query("UPDATE settings SET value = 'after'")
+
+        # The safety backup rotates `oldest` out; it must already have been read
+        create_backup = self.state.create_backup
+        with patch.object(self.state, "create_backup", side_effect=lambda: create_backup(self.backup_dir, keep=2)):
+            self.assertTrue(self.state.restore_backup(oldest, keep_current=True))
+        self.assertFalse(os.path.exists(oldest))
+        self.assertEqual(self.state.execute_query("SELECT value FROM settings")[0][0], "before")
+
+    def test_corrupt_backup_rejected(self):
+        bad = os.path.join(self.tmp.name, "state-bad.db.gz")
+        with open(bad, "wb") as f:
+            f.write(b"not gzip")
+        self.assertFalse(self.state.restore_backup(bad))
+        self.assertEqual(self.state.execute_query("SELECT value FROM settings")[0][0], "before")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,392 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+import io
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import MagicMock, patch
+from autoconfigoscli.core.catalog import loader as catalog_loader
+from autoconfigoscli.core.catalog.loader import CatalogLoader
+from autoconfigoscli.core import registry
+from autoconfigoscli.core.packages import ProviderManager
+from autoconfigoscli.core.os_detect import get_os_info
+from autoconfigoscli.core.warm_server import WarmServer, forward, is_forwardable
+from autoconfigoscli.cli import build_parser, main
+from autoconfigoscli.core.catalog.resolver import PackageResolver
+from autoconfigoscli.core.context.explain import Explainer
+from autoconfigoscli.core.profiles.loader import ProfileLoader
+from autoconfigoscli.core.profiles.index import ProfileIndex, parse_profile_file
+
+CATALOG = """
+packages:
+  - id: git
+    display_name: Git
+    targets:
+      debian: { provider: apt, package: git }
+"""
+
+class TestCompiledCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "packages.yaml")
+        with open(self.path, "w") as f:
+            f.write(CATALOG)
+        self.user_cache = patch.object(catalog_loader, "USER_CACHE_DIR", os.path.join(self.tmp.name, "cache"))
+        self.user_cache.start()
+
+    def tearDown(self):
+        self.user_cache.stop()
+        self.tmp.cleanup()
+
+    def test_second_load_skips_yaml(self):
+        CatalogLoader(self.path)
+        self.assertTrue(os.path.exists(self.path + ".pickle"))
+
+        with patch.object(CatalogLoader, "_parse_yaml") as parse:
+            loader = CatalogLoader(self.path)
+            parse.assert_not_called()
+        self.assertEqual(loader.get_package("git").targets["debian"].package_name, "git")
+
+    def test_edit_invalidates_cache(self):
+        CatalogLoader(self.path)
+        with open(self.path, "a") as f:
+            f.write("  - id: curl\n")
+        self.assertIsNotNone(CatalogLoader(self.path).get_package("curl"))
+
+    def test_touch_revalidates_by_hash(self):
+        CatalogLoader(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch.object(CatalogLoader, "_parse_yaml") as parse:
+            CatalogLoader(self.path)
+            parse.assert_not_called()
+
+    def test_upgrade_invalidates_cache(self):
+        CatalogLoader(self.path)
+        with patch.object(catalog_loader, "__version__", "99.0.0"), \
+             patch.object(CatalogLoader, "_parse_yaml", return_value={}) as parse:
+            CatalogLoader(self.path)
+            parse.assert_called_once()
+
+    def test_falls_back_to_user_cache(self):
+        with patch.object(CatalogLoader, "_compiled_paths",
+                          return_value=[os.path.join(self.path, "not-a-dir", "x.pickle"),
+                                        os.path.join(self.tmp.name, "cache", "catalog.pickle")]):
+            path = CatalogLoader(self.path).compile()
+        self.assertEqual(path, os.path.join(self.tmp.name, "cache", "catalog.pickle"))
+
+class TestRegistry(unittest.TestCase):
+    def tearDown(self):
+        registry.invalidate()
+
+    def test_shared_instances(self):
+        self.assertIs(registry.get_catalog(), registry.get_catalog())
+        self.assertIs(registry.get_resolver().loader, registry.get_catalog())
+        self.assertIs(registry.get_provider_manager(), registry.get_provider_manager())
+        self.assertIs(get_os_info(), get_os_info())
+
+    def test_invalidate(self):
+        catalog, resolver, os_info = registry.get_catalog(), registry.get_resolver(), get_os_info()
+        registry.invalidate("catalog")
+        self.assertIsNot(registry.get_catalog(), catalog)
+        self.assertIsNot(registry.get_resolver(), resolver)
+        self.assertIs(get_os_info(), os_info)
+
+        registry.invalidate()
+        self.assertIsNot(get_os_info(), os_info)
+
+    @patch("autoconfigoscli.core.os_detect.distro")
+    def test_os_detected_once(self, mock_distro):
+        registry.invalidate("os")
+        for _ in range(3):
+            get_os_info()
+        self.assertLessEqual(mock_distro.id.call_count, 1)
+
+class TestLazyProviders(unittest.TestCase):
+    def setUp(self):
+        self.linux = patch("autoconfigoscli.core.packages.get_os_info",
+                           return_value=MagicMock(is_macos=False, is_windows=False))
+        self.linux.start()
+
+    def tearDown(self):
+        self.linux.stop()
+
+    def test_construction_probes_nothing(self):
+        with patch("shutil.which") as which, patch("subprocess.run") as run:
+            manager = ProviderManager()
+            which.assert_not_called()
+            run.assert_not_called()
+        self.assertEqual(manager.providers, {})
+
+    def test_script_lookup_skips_system_detection(self):
+        manager = ProviderManager()
+        with patch("autoconfigoscli.core.providers.apt.AptProvider.is_available") as apt_available:
+            self.assertEqual(manager.get_provider("script").name, "script")
+            apt_available.assert_not_called()
+
+    def test_only_detected_system_provider_is_used(self):
+        with patch("autoconfigoscli.core.providers.apt.AptProvider.is_available", return_value=False), \
+             patch("autoconfigoscli.core.providers.dnf.DnfProvider.is_available", return_value=True):
+            manager = ProviderManager()
+            self.assertIsNone(manager.get_provider("apt"))
+            self.assertEqual(manager.get_provider("system").name, "dnf")
+            self.assertIs(manager.get_provider("dnf"), manager.system_provider)
+            self.assertIs(manager.get_provider("flatpak").system_provider, manager.system_provider)
+
+    def test_entry_point_provider_loaded_on_demand(self):
+        plugin = MagicMock()
+        plugin.name = "snap"
+        plugin.load.return_value = lambda: MagicMock(name="snap-provider")
+        manager = ProviderManager()
+        with patch("importlib.metadata.entry_points") as entry_points:
+            entry_points.return_value.select.return_value = [plugin]
+            self.assertIsNone(manager.get_provider("nix"))
+            plugin.load.assert_not_called()
+            snap = manager.get_provider("snap")
+        plugin.load.assert_called_once()
+        self.assertIs(manager.get_provider("snap"), snap)
+
+BATCH_CATALOG = """
+packages:
+  - id: git
+    display_name: Git
+    targets:
+      linux: { provider: system, package: git }
+      macos: { provider: brew, package: git }
+  - id: htop
+    display_name: htop
+    risk_level: medium
+    targets:
+      fedora: { provider: dnf, package: htop }
+  - id: iterm
+    display_name: iTerm2
+    supported_os: [macos]
+    targets:
+      macos: { provider: brew, package: iterm2 }
+"""
+
+class TestBatchExplain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        catalog_path = os.path.join(self.tmp.name, "packages.yaml")
+        with open(catalog_path, "w") as f:
+            f.write(BATCH_CATALOG)
+        profiles_dir = os.path.join(self.tmp.name, "profiles")
+        os.makedirs(profiles_dir)
+        for name, packages in {"base": "[git]", "tools": "[git, htop, nope]", "mac": "[git, iterm]"}.items():
+            with open(os.path.join(profiles_dir, f"{name}.yaml"), "w") as f:
+                f.write(f"tier: lite\npackages: {packages}\n")
+
+        with patch.object(catalog_loader, "USER_CACHE_DIR", os.path.join(self.tmp.name, "cache")):
+            loader = CatalogLoader(catalog_path)
+        self.ex = Explainer()
+        self.ex.catalog_loader = loader
+        self.ex.resolver = PackageResolver(loader)
+        self.ex.profile_loader = ProfileLoader(profiles_dir, index_path=os.path.join(self.tmp.name, "index.json"))
+        self.ex.profile_loader.user_profiles_dir = os.path.join(self.tmp.name, "user")
+
+    def tearDown(self):
+        self.ex.profile_loader.index.save()
+        self.tmp.cleanup()
+
+    def test_packages_resolved_once_for_many_profiles(self):
+        with patch.object(self.ex.resolver, "resolve_definition", wraps=self.ex.resolver.resolve_definition) as resolve:
+            analyses = self.ex.explain_profiles(["base", "tools", "mac", "missing"], distro="debian")
+            self.ex.explain_packages(distro="debian")
+        self.assertEqual(resolve.call_count, 3)
+
+        base, tools, mac, missing = analyses
+        self.assertEqual(base["summary"], {"total": 1, "supported": 1, "unsupported": 0, "risky": 0})
+        self.assertEqual(tools["summary"], {"total": 3, "supported": 1, "unsupported": 2, "risky": 1})
+        self.assertFalse(tools["packages_analysis"][2]["found"])
+        self.assertEqual(mac["summary"]["unsupported"], 1)
+        self.assertIn("error", missing)
+
+    def test_compatibility_matrix(self):
+        distros = self.ex.resolver.known_distros()
+        self.assertEqual(distros, ["fedora", "linux", "macos"])
+
+        matrix = self.ex.compatibility_matrix(["tools", "mac", "missing"], distros)
+        self.assertEqual(matrix["tools"]["fedora"]["supported"], 2)
+        self.assertEqual(matrix["tools"]["linux"]["supported"], 1)
+        self.assertEqual(matrix["mac"]["macos"]["unsupported"], 0)
+        self.assertIsNone(matrix["missing"]["linux"])
+
+    def test_explain_package_per_distro(self):
+        self.assertEqual(self.ex.explain_package("htop", distro="fedora")["provider"], "dnf")
+        self.assertFalse(self.ex.explain_package("htop", distro="debian")["supported"])
+        self.assertEqual([p["id"] for p in self.ex.explain_packages(distro="macos")], ["git", "htop", "iterm"])
+
+class TestProfileIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.profiles_dir = os.path.join(self.tmp.name, "profiles")
+        self.index_path = os.path.join(self.tmp.name, "index.json")
+        os.makedirs(self.profiles_dir)
+        for name, tier in (("web", "lite"), ("data", "full")):
+            self._write(name, f"tier: {tier}\ntags: [{name}]\npackages: [git, curl]\n")
+        self.loader = self._loader()
+
+    def tearDown(self):
+        self.loader.index.save()
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        with open(os.path.join(self.profiles_dir, f"{name}.yaml"), "w") as f:
+            f.write(text)
+
+    def _loader(self):
+        loader = ProfileLoader(self.profiles_dir)
+        # A fresh index read back from disk, as in a new process
+        loader.index = ProfileIndex(self.index_path)
+        loader.user_profiles_dir = os.path.join(self.tmp.name, "user")
+        return loader
+
+    def _parsed(self, loader, name):
+        with patch("autoconfigoscli.core.profiles.index.parse_profile_file",
+                   wraps=parse_profile_file) as parse:
+            profile = loader.load_profile(name)
+        return profile, parse.call_count
+
+    def test_summaries_come_from_index(self):
+        self._parsed(self.loader, "web")
+        self.loader.index.save()
+
+        profile, parsed = self._parsed(self._loader(), "web")
+        self.assertEqual(parsed, 0)
+        self.assertEqual((profile.tier, profile.tags, profile.package_count), ("lite", ["web"], 2))
+
+        with patch("autoconfigoscli.core.profiles.loader.parse_profile_file", wraps=parse_profile_file) as parse:
+            self.assertEqual(profile.packages, ["git", "curl"])
+            self.assertEqual(profile.env_vars, {})
+        self.assertEqual(parse.call_count, 1)
+
+    def test_only_changed_files_are_parsed(self):
+        self._parsed(self.loader, "web")
+        self._parsed(self.loader, "data")
+        self._write("web", "tier: mid\npackages: [git]\n")
+        path = os.path.join(self.profiles_dir, "data.yaml")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        web, parsed = self._parsed(self.loader, "web")
+        self.assertEqual((parsed, web.tier, web.package_count), (1, "mid", 1))
+        self.assertEqual(self._parsed(self.loader, "data")[1], 0)
+
+    def test_removed_and_invalid_profiles(self):
+        self._write("broken", "- not a mapping\n")
+        self.assertIsNone(self.loader.load_profile("broken"))
+
+        self.loader.load_profile("data")
+        os.remove(os.path.join(self.profiles_dir, "data.yaml"))
+        self.assertIsNone(self.loader.load_profile("data"))
+        self.loader.index.save()
+        self.assertEqual(list(ProfileIndex(self.index_path).entries), [])
+
+class TestWarmServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "serve.sock")
+        self.server = WarmServer(self.socket_path, idle_timeout=5)
+        self.thread = threading.Thread(target=self.server.serve_until_idle, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.idle = True
+        # Wake the server up so it notices it should stop
+        self._forward(["status"])
+        self.thread.join(timeout=5)
+        self.tmp.cleanup()
+
+    def _forward(self, argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            status = forward(argv, self.socket_path)
+        return status, out.getvalue(), err.getvalue()
+
+    def test_forwards_query_command(self):
+        status, output, errors = self._forward(["explain", "package", "git"])
+        self.assertEqual(status, 0)
+        self.assertIn("Package Detail", output)
+        self.assertEqual(errors, "")
+
+    def test_forwards_exit_status_and_stderr(self):
+        def failing(name, args, console):
+            console.print("partial")
+            print("Error: catalog unreadable", file=sys.stderr)
+            raise SystemExit(3)
+
+        with patch("autoconfigoscli.commands.run_command", side_effect=failing):
+            status, output, errors = self._forward(["status"])
+        self.assertEqual(status, 3)
+        self.assertIn("partial", output)
+        self.assertEqual(errors, "Error: catalog unreadable\n")
+
+    def test_cli_exits_with_forwarded_status(self):
+        threads = []
+        def failing(name, args, console):
+            threads.append(threading.current_thread())
+            raise SystemExit(2)
+
+        with patch("autoconfigoscli.core.warm_server.SOCKET_PATH", self.socket_path), \
+             patch.dict(os.environ, {"AUTOCONFIGOSCLI_NO_SERVER": ""}), \
+             patch("autoconfigoscli.commands.run_command", side_effect=failing):
+            with redirect_stdout(io.StringIO()), self.assertRaises(SystemExit) as exited:
+                main(["status"])
+        self.assertEqual(exited.exception.code, 2)
+        self.assertEqual(threads, [self.thread])
+
+    def test_refuses_commands_that_change_state(self):
+        self.assertEqual(self._forward(["install", "web-dev", "--dry-run"]), (None, "", ""))
+
+    def test_second_server_on_same_socket_fails(self):
+        with self.assertRaises(RuntimeError):
+            WarmServer(self.socket_path)
+
+    def test_falls_back_without_server(self):
+        self.assertIsNone(forward(["status"], os.path.join(self.tmp.name, "missing.sock")))
+
+    def test_is_forwardable(self):
+        parser = build_parser()
+        self.assertTrue(is_forwardable(parser.parse_args(["profiles", "show", "web"])))
+        self.assertFalse(is_forwardable(parser.parse_args(["profiles", "user", "list"])))
+        self.assertFalse(is_forwardable(parser.parse_args(["history"])))
+        with patch.dict(os.environ, {"AUTOCONFIGOSCLI_NO_SERVER": "1"}):
+            self.assertFalse(is_forwardable(parser.parse_args(["status"])))
+
+# Import budget for `autoconfigoscli --version`, in microseconds (was ~100ms with eager imports)
+STARTUP_BUDGET_US = 50_000
+
+class TestStartupTime(unittest.TestCase):
+    def _importtime(self, *argv):
+        res = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "autoconfigoscli", *argv],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        modules = {}
+        for line in res.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = int(cumulative)
+        return modules
+
+    def test_version_within_budget(self):
+        modules = self._importtime("--version")
+        spent = modules["autoconfigoscli"] + modules["autoconfigoscli.cli"]
+        self.assertLess(spent, STARTUP_BUDGET_US, f"--version imports took {spent}us")
+
+    def test_version_skips_heavy_dependencies(self):
+        loaded = {name.split(".")[0] for name in self._importtime("--version")}
+        self.assertFalse(loaded & {"rich", "yaml", "requests", "distro", "sqlite3"})
+
+    def test_profiles_list_skips_catalog(self):
+        modules = self._importtime("profiles", "list")
+        self.assertIn("autoconfigoscli.core.profiles.user_manager", modules)
+        self.assertFalse({"autoconfigoscli.core.manual", "autoconfigoscli.core.registry"} & set(modules))
+
+if __name__ == '__main__':
+    unittest.main()